@@ -54,6 +54,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 
     # Third party apps
     'rest_framework',
@@ -100,6 +101,29 @@ CLOUDINARY_STORAGE_FOLDERS = {
     'AVATARS': 'admin/avatars',
 }
 
+# Local image preprocessing applied before uploading to Cloudinary
+IMAGE_PREPROCESSING = {
+    'ENABLED': True,
+    'FORMAT': 'WEBP',  # Falls back to JPEG when Pillow lacks WebP support
+    'QUALITY': 82,
+    # Longest edge (px) per Cloudinary folder, folders not listed keep their size
+    'MAX_DIMENSIONS': {
+        CLOUDINARY_STORAGE_FOLDERS['PRODUCT_IMAGES']: 800,
+        CLOUDINARY_STORAGE_FOLDERS['EDITOR_IMAGES']: 1200,
+        CLOUDINARY_STORAGE_FOLDERS['RETURN_IMAGES']: 1200,
+        CLOUDINARY_STORAGE_FOLDERS['EMAIL_ATTACHMENTS']: 1200,
+    },
+    # Folders where identical or near-identical images reuse an existing public_id.
+    # Catalog and editor images only: customer uploads (returns, email
+    # attachments) must never resolve to another customer's image
+    'DEDUPLICATE_FOLDERS': [
+        CLOUDINARY_STORAGE_FOLDERS['PRODUCT_IMAGES'],
+        CLOUDINARY_STORAGE_FOLDERS['EDITOR_IMAGES'],
+    ],
+    'NEAR_DUPLICATE_DISTANCE': 3,  # Max hamming distance between 64-bit hashes
+    'INDEX_TIMEOUT': 60 * 60 * 24 * 30,  # 30 days
+}
+
 # Paystack Configuration
 PAYSTACK_SECRET_KEY = os.getenv('PAYSTACK_SECRET_KEY')
 PAYSTACK_PUBLIC_KEY = os.getenv('PAYSTACK_PUBLIC_KEY')
@@ -257,6 +281,7 @@ CACHE_KEYS = {
     'CATEGORY_DETAIL': 'category_detail_{}',
     'CATEGORY_LIST': 'category_list_{}',
     'FEATURED_PRODUCTS': 'featured_products',
+    'ACTIVE_FLASH_SALE_PRICES': 'active_flash_sale_prices',
 }
 
 
@@ -268,6 +293,40 @@ CACHE_TIMEOUTS = {
 }
 
 
+# Process-local (L1) cache in front of the shared cache (see utils/cache.py)
+LOCAL_CACHE = {
+    'MAX_SIZE': 1024,       # Entries per namespace
+    'TTL': 60,              # Seconds an entry may be served from memory
+    'CHECK_INTERVAL': 1.0,  # Seconds between version checks against Redis
+}
+
+
+# Stampede protection for get_or_compute (see utils/cache.py)
+CACHE_STAMPEDE = {
+    'LEASE': 10,            # Seconds one worker may hold a recompute lock
+    'BETA': 1.0,            # Probabilistic early refresh (XFetch) factor
+    'STALE_TTL': 300,       # Seconds a stale value is served during a refresh
+    'POLL_INTERVAL': 0.05,  # Seconds between checks while waiting on a lease
+}
+
+
+# Review feed pagination (see reviews/pagination.py)
+REVIEW_FEED = {
+    'PAGE_SIZE': 10,
+    'MAX_PAGE_SIZE': 50,
+    'COUNT_CAP': 1000,      # Counts above this are reported as "1000+"; None for exact
+}
+
+
+# Return photo uploads (see returns/media.py)
+RETURN_MEDIA = {
+    'UPLOAD_WORKERS': 4,    # Concurrent Cloudinary uploads per process
+    'MAX_ATTEMPTS': 5,      # Uploads are retried until this many failures
+    'STALE_AFTER': 900,     # Seconds before an unfinished upload is retried
+    'ASYNC': True,          # Upload in background threads after commit
+}
+
+
 # Database Configuration
 if ENVIRONMENT == 'production':
     DATABASES = {
@@ -398,6 +457,11 @@ SUPPORTED_CURRENCIES = {
 }
 
 
+# Exchange rate ingestion (see currencies/providers.py)
+EXCHANGE_RATE_PROVIDER = os.getenv('EXCHANGE_RATE_PROVIDER', 'forex')
+EXCHANGE_RATE_FILE = os.getenv('EXCHANGE_RATE_FILE')
+
+
 # Payment Settings
 # Minimum amount in base currency (USD)
 MINIMUM_PAYMENT_AMOUNT = Decimal('100.00')
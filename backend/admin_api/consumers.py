@@ -24,6 +24,10 @@ class DashboardConsumer(AsyncJsonWebsocketConsumer):
 
         # Accept the connection first
         await self.accept()
+
+        # Broadcast updates (orders, stock, flash sales) go to this group
+        self.group_name = 'admin_dashboard'
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
         logger.info(f"WebSocket connected successfully for user: {user.email}")
         print(f"WebSocket connected for user: {user.email}")
 
@@ -126,6 +130,21 @@ class DashboardConsumer(AsyncJsonWebsocketConsumer):
             return {'error': 'Failed to get stats'}
 
 
+    async def order_update(self, event):
+        """Handle order updates"""
+        await self.send_json(event)
+
+
+    async def stock_update(self, event):
+        """Handle stock updates"""
+        await self.send_json(event)
+
+
+    async def flash_sale_update(self, event):
+        """Handle flash sales starting or ending"""
+        await self.send_json(event)
+
+
     async def notification_message(self, event):
         """Handle sending notifications to the client"""
         try:
@@ -0,0 +1,112 @@
+# admin_api/listings.py
+
+from django.db.models import Count, Subquery, OuterRef, Prefetch, F, Value, DecimalField
+from django.db.models.functions import Coalesce
+from decimal import Decimal
+from orders.models import Order, OrderItem
+from products.models import ProductImage
+from users.models import User
+
+
+def per_row(queryset, aggregate, key):
+    """
+        Correlated subquery aggregating queryset per outer row
+
+        Args:
+            queryset: Rows to aggregate, already filtered on OuterRef('pk')
+            aggregate: Aggregate expression (Count, Sum, Max...)
+            key: Field the rows are grouped by (the foreign key to the outer row)
+    """
+    return Subquery(
+        queryset.order_by().values(key).annotate(value=aggregate).values('value')
+    )
+
+
+class AdminOrderListing:
+    """
+        Querysets for the admin order list and detail views
+
+        A list page is one query (plus the paginator's count): the customer
+        is joined and the item count is a subquery. The detail view
+        prefetches items with their products and primary images.
+    """
+    LIST_FIELDS = [
+        'id', 'total_amount', 'shipping_fee', 'order_status', 'payment_status',
+        'tracking_number', 'refund_status', 'created_at', 'updated_at',
+        'user__first_name', 'user__last_name', 'user__email',
+    ]
+
+
+    @classmethod
+    def for_list(cls, queryset=None):
+        """ Orders shaped for AdminOrderListSerializer """
+        queryset = Order.objects.all() if queryset is None else queryset
+        return queryset.select_related('user').only(
+            *cls.LIST_FIELDS
+        ).annotate(
+            item_count=Coalesce(
+                per_row(OrderItem.objects.filter(order=OuterRef('pk')), Count('id'), 'order'),
+                0
+            )
+        )
+
+
+    @classmethod
+    def for_detail(cls, queryset=None):
+        """ Orders shaped for AdminOrderSerializer """
+        queryset = Order.objects.all() if queryset is None else queryset
+        return queryset.select_related('user').prefetch_related(
+            Prefetch('items', queryset=OrderItem.objects.select_related('product')),
+            Prefetch(
+                'items__product__images',
+                queryset=ProductImage.objects.filter(is_primary=True),
+                to_attr='primary_images'
+            )
+        )
+
+
+class AdminCustomerListing:
+    """
+        Customers annotated with their order metrics
+
+        Metrics are read from the CustomerStats rollup through a single
+        join, so a page of customers is one query however many orders they
+        have, and segment filters use the rollup's indexes.
+    """
+    MONEY = DecimalField(max_digits=12, decimal_places=2)
+
+
+    @classmethod
+    def with_metrics(cls, queryset=None):
+        """ Annotate order_count, paid_total, average_value and last_order_at """
+        queryset = User.objects.all() if queryset is None else queryset
+        return queryset.annotate(
+            order_count=Coalesce(F('customer_stats__order_count'), 0),
+            paid_total=Coalesce(
+                F('customer_stats__paid_total'), Value(Decimal('0')), output_field=cls.MONEY
+            ),
+            average_value=Coalesce(
+                F('customer_stats__average_order_value'), Value(Decimal('0')), output_field=cls.MONEY
+            ),
+            last_order_at=F('customer_stats__last_order_at')
+        )
+
+
+    @classmethod
+    def segment(cls, queryset, params):
+        """
+            Filter customers by their stats
+
+            Supports ?min_spent=, ?min_orders=, ?ordered_since= and ?country=.
+        """
+        filters = {
+            'min_spent': 'customer_stats__paid_total__gte',
+            'min_orders': 'customer_stats__order_count__gte',
+            'ordered_since': 'customer_stats__last_order_at__gte',
+            'country': 'customer_stats__country',
+        }
+        for param, lookup in filters.items():
+            value = params.get(param)
+            if value:
+                queryset = queryset.filter(**{lookup: value})
+        return queryset
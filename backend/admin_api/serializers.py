@@ -86,6 +86,11 @@ class AdminOrderItemSerializer(serializers.ModelSerializer):
         ]
 
     def get_product_image(self, obj):
+        # Set by AdminOrderListing.for_detail()
+        primary_images = getattr(obj.product, 'primary_images', None)
+        if primary_images is not None:
+            return primary_images[0].image.url if primary_images else None
+
         try:
             if obj.product.images.filter(is_primary=True).exists():
                 return obj.product.images.filter(is_primary=True).first().image.url
@@ -94,16 +99,19 @@ class AdminOrderItemSerializer(serializers.ModelSerializer):
             return None
 
 
-class AdminOrderSerializer(serializers.ModelSerializer):
+class AdminOrderListSerializer(serializers.ModelSerializer):
+    """ Admin order list row; expects AdminOrderListing.for_list() """
     customer_name = serializers.SerializerMethodField()
-    items = AdminOrderItemSerializer(many=True, read_only=True)
     customer_email = serializers.SerializerMethodField()
     items_count = serializers.SerializerMethodField()
-    order_items = serializers.SerializerMethodField()
 
     class Meta:
         model = Order
-        fields = '__all__'
+        fields = [
+            'id', 'customer_name', 'customer_email', 'total_amount',
+            'shipping_fee', 'order_status', 'payment_status', 'tracking_number',
+            'refund_status', 'items_count', 'created_at', 'updated_at'
+        ]
 
     def get_customer_name(self, obj):
         return f"{obj.user.first_name} {obj.user.last_name}"
@@ -112,8 +120,19 @@ class AdminOrderSerializer(serializers.ModelSerializer):
         return obj.user.email
 
     def get_items_count(self, obj):
+        if hasattr(obj, 'item_count'):
+            return obj.item_count
         return obj.items.count()
 
+
+class AdminOrderSerializer(AdminOrderListSerializer):
+    items = AdminOrderItemSerializer(many=True, read_only=True)
+    order_items = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Order
+        fields = '__all__'
+
     def get_order_items(self, obj):
         return [{
             'product_name': item.product.name,
@@ -123,7 +142,13 @@ class AdminOrderSerializer(serializers.ModelSerializer):
         } for item in obj.items.all()]
 
 
-class AdminUserSerializer(serializers.ModelSerializer):
+class AdminUserListSerializer(serializers.ModelSerializer):
+    """
+        Admin customer list row
+
+        Metrics come from AdminCustomerListing.with_metrics() annotations
+        when present, and from the customer's CustomerStats row otherwise.
+    """
     total_orders = serializers.SerializerMethodField()
     total_spent = serializers.SerializerMethodField()
     average_order_value = serializers.SerializerMethodField()
@@ -131,31 +156,45 @@ class AdminUserSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = User
-        exclude = ['password']
-        extra_kwargs = {
-            'date_joined': {'read_only': True},
-            'last_login': {'read_only': True},
-        }
+        fields = [
+            'id', 'email', 'first_name', 'last_name', 'phone_number',
+            'country', 'is_active', 'verified_email', 'date_joined', 'last_login',
+            'total_orders', 'total_spent', 'average_order_value', 'last_order_date'
+        ]
+        read_only_fields = fields
+
+    def metrics(self, obj):
+        """ (order count, paid total, average order value, last order date) """
+        if hasattr(obj, 'order_count'):
+            return obj.order_count, obj.paid_total, obj.average_value, obj.last_order_at
+
+        # One query per customer, cached on the instance
+        stats = getattr(obj, 'customer_stats', None)
+        if stats is None:
+            return 0, Decimal('0'), Decimal('0'), None
+        return stats.order_count, stats.paid_total, stats.average_order_value, stats.last_order_at
 
     def get_total_orders(self, obj):
-        return obj.order_set.count()
+        return self.metrics(obj)[0]
 
     def get_total_spent(self, obj):
-        total = obj.order_set.filter(
-            payment_status=True
-        ).aggregate(
-            total=Sum('total_amount')
-        )['total']
-        return total if total else 0
+        return self.metrics(obj)[1]
 
     def get_average_order_value(self, obj):
-        total_spent = self.get_total_spent(obj)
-        total_orders = self.get_total_orders(obj)
-        return total_spent / total_orders if total_orders > 0 else 0
+        return self.metrics(obj)[2]
 
     def get_last_order_date(self, obj):
-        last_order = obj.order_set.order_by('-created_at').first()
-        return last_order.created_at if last_order else None
+        return self.metrics(obj)[3]
+
+
+class AdminUserSerializer(AdminUserListSerializer):
+    class Meta:
+        model = User
+        exclude = ['password']
+        extra_kwargs = {
+            'date_joined': {'read_only': True},
+            'last_login': {'read_only': True},
+        }
 
 
 class StockHistorySerializer(serializers.ModelSerializer):
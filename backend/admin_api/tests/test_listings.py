@@ -0,0 +1,94 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from decimal import Decimal
+from orders.models import Order, OrderItem
+from products.models import Category, Product
+from users.models import User
+from ..listings import AdminCustomerListing
+from ..serializers import AdminUserSerializer, AdminUserListSerializer
+
+
+class AdminListingTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        admin = User.objects.create_user(
+            email='admin@example.com', username='admin', first_name='Ife',
+            last_name='Admin', password='adminpass123', is_staff=True
+        )
+        self.client.force_authenticate(user=admin)
+        category = Category.objects.create(name='Wigs')
+        self.products = [
+            Product.objects.create(
+                name=f'Wig {index}', category=category, description='Wig',
+                price=Decimal('50.00'), stock=100
+            )
+            for index in range(2)
+        ]
+
+
+    def create_customers(self, count):
+        customers = []
+        for _ in range(count):
+            index = User.objects.count()
+            customer = User.objects.create_user(
+                email=f'buyer{index}@example.com', username=f'buyer{index}',
+                first_name='Ada', last_name='Buyer', password='buyerpass123'
+            )
+            for paid in (True, True, False):
+                order = Order.objects.create(
+                    user=customer, total_amount=Decimal('100.00'),
+                    shipping_address='Lagos', payment_status=paid
+                )
+                for product in self.products:
+                    OrderItem.objects.create(
+                        order=order, product=product, quantity=1, price=Decimal('50.00')
+                    )
+            customers.append(customer)
+        return customers
+
+
+    def test_customer_list_is_one_query_per_page(self):
+        self.create_customers(2)
+        with self.assertNumQueries(2):
+            self.client.get(reverse('admin-users-list'))
+
+        self.create_customers(5)
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('admin-users-list'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 7)
+        row = response.data['results'][0]
+        self.assertEqual(row['total_orders'], 3)
+        self.assertEqual(Decimal(row['total_spent']), Decimal('200.00'))
+        self.assertNotIn('address', row)
+
+
+    def test_annotated_metrics_match_per_customer_queries(self):
+        customer = self.create_customers(1)[0]
+        Order.objects.create(user=customer, total_amount=Decimal('0.00'), shipping_address='Lagos')
+
+        expected = AdminUserSerializer(customer).data
+        annotated = AdminCustomerListing.with_metrics().get(pk=customer.pk)
+        with self.assertNumQueries(0):
+            data = AdminUserListSerializer(annotated).data
+
+        for field in ('total_orders', 'total_spent', 'average_order_value', 'last_order_date'):
+            self.assertEqual(data[field], expected[field], field)
+
+
+    def test_order_list_uses_fixed_number_of_queries(self):
+        self.create_customers(1)
+        with self.assertNumQueries(2):
+            self.client.get(reverse('admin-orders-list'))
+
+        self.create_customers(2)
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('admin-orders-list'))
+
+        self.assertEqual(response.data['count'], 9)
+        row = response.data['results'][0]
+        self.assertEqual((row['items_count'], row['customer_name']), (2, 'Ada Buyer'))
+        self.assertNotIn('items', row)
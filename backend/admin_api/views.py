@@ -22,7 +22,9 @@ from .serializers import (
     CustomerAnalyticsSerializer,
     AdminProductSerializer,
     AdminUserSerializer,
+    AdminUserListSerializer,
     AdminOrderSerializer,
+    AdminOrderListSerializer,
     CurrencySerializer,
     CurrencyConversionSerializer,
     ExchangeRateUpdateSerializer,
@@ -36,9 +38,11 @@ from .serializers import (
 )
 from products.models import Product, Category, ProductImage, FlashSale, FlashSaleProduct
 from products.serializers import FlashSaleSerializer
+from products.flash_sales import FlashSaleInventory, FlashSaleScheduler
+from products.pricing import PriceEngine
 from utils.cloudinary_utils import CloudinaryUploader
 from .utils.in_memory_file_upload import process_product_image
-from orders.models import Order
+from orders.models import Order, CustomerStats
 from users.models import User
 from reviews.models import Review
 from .utils.clean_html import clean_html_for_email
@@ -51,6 +55,7 @@ from django_filters.rest_framework import DjangoFilterBackend
 import logging
 from django.db.models.functions import Greatest
 from .pagination import AdminPagination
+from .listings import AdminOrderListing, AdminCustomerListing
 from currencies.utils import CurrencyConverter, CurrencyConversionError
 from customer_support.serializers import CustomerEmailSerializer
 from customer_support.models import EmailAttachment
@@ -60,8 +65,9 @@ from payments.serializers import PaymentSerializer, TransactionLogSerializer
 from payments.models import Payment, PaymentTransaction
 from customer_support.models import CustomerEmail, EmailTemplate
 from django.conf import settings
-from returns.serializers import ReturnSerializer, ProductReturnPolicySerializer, ReturnPolicySerializer
-from currencies.models import Currency
+from returns.serializers import ReturnSerializer, ReturnListSerializer, ProductReturnPolicySerializer, ReturnPolicySerializer
+from returns.queue import ReturnQueue
+from currencies.models import Currency, ExchangeRateHistory
 from django.template import Template, Context
 from decimal import Decimal
 from django.core.cache import cache
@@ -481,21 +487,21 @@ class DashboardViewSet(viewsets.ViewSet):
         new_customers = User.objects.filter(
             date_joined__gte=thirty_days_ago
         ).count()
-        returning_customers = User.objects.filter(
-            order__created_at__gte=thirty_days_ago
-        ).distinct().count() - new_customers
+        returning_customers = CustomerStats.objects.filter(
+            last_order_at__gte=thirty_days_ago
+        ).count() - new_customers
 
         # Customer growth
         customer_growth = User.objects.annotate(
             joined_date=TruncDate('date_joined')
-        ).values('join_date').annotate(
+        ).values('joined_date').annotate(
             count=Count('id')
-        ).order_by('join_date')
+        ).order_by('joined_date')
 
-        # Top customers by spending
-        top_customers = User.objects.annotate(
-            total_spent=Sum('order__total_amount')
-        ).order_by('-total_spent')[:10]
+        # Top customers by spending, from the stats rollup's index
+        top_customers = AdminCustomerListing.with_metrics(
+            User.objects.filter(customer_stats__paid_total__gt=0)
+        ).order_by('-customer_stats__paid_total')[:10]
 
         # Customer locations
         customer_locations = User.objects.values(
@@ -510,7 +516,7 @@ class DashboardViewSet(viewsets.ViewSet):
                 'returning': returning_customers
             },
             'customer_growth': list(customer_growth),
-            'top_customers': AdminUserSerializer(top_customers, many=True).data,
+            'top_customers': AdminUserListSerializer(top_customers, many=True).data,
             'customer_locations': {
                 item['country']: item['count'] for item in customer_locations if item['country']
             }
@@ -1195,8 +1201,17 @@ class AdminOrderViewSet(viewsets.ModelViewSet):
     ordering = ['-created_at']
     queryset = Order.objects.all()
 
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return AdminOrderListSerializer
+        return AdminOrderSerializer
+
+
     def get_queryset(self):
-        queryset = Order.objects.all().select_related('user').prefetch_related('items', 'items__product')
+        if self.action == 'list':
+            queryset = AdminOrderListing.for_list()
+        else:
+            queryset = AdminOrderListing.for_detail()
 
         # Handle search
         search = self.request.query_params.get('search')
@@ -1338,8 +1353,16 @@ class AdminUserViewSet(viewsets.ModelViewSet):
     ordering_fields = ['date_joined', 'last_login']
     ordering = ['-date_joined']
 
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return AdminUserListSerializer
+        return AdminUserSerializer
+
+
     def get_queryset(self):
-        queryset = User.objects.filter(is_staff=False, is_superuser=False)
+        queryset = AdminCustomerListing.with_metrics(
+            User.objects.filter(is_staff=False, is_superuser=False)
+        )
 
         # Filter by active status
         is_active = self.request.query_params.get('is_active')
@@ -1358,7 +1381,7 @@ class AdminUserViewSet(viewsets.ModelViewSet):
         if date_joined_after:
             queryset = queryset.filter(date_joined__gte=date_joined_after)
 
-        return queryset
+        return AdminCustomerListing.segment(queryset, self.request.query_params)
 
 
     @action(detail=True, methods=['post'])
@@ -1377,12 +1400,12 @@ class AdminUserViewSet(viewsets.ModelViewSet):
     def purchase_history(self, request, pk=None):
         """ Get user's purchase history """
         user = self.get_object()
-        orders = Order.objects.filter(user=user).order_by('-created_at')
+        orders = AdminOrderListing.for_detail(
+            Order.objects.filter(user=user)
+        ).order_by('-created_at')
         return Response({
-            'total_orders': orders.count(),
-            'total_spent': orders.filter(payment_status=True).aggregate(
-                total=Sum('total_amount')
-            )['total'] or 0,
+            'total_orders': user.order_count,
+            'total_spent': user.paid_total,
             'orders': AdminOrderSerializer(orders, many=True).data
         })
 
@@ -1500,11 +1523,16 @@ class AdminCurrencyViewSet(viewsets.ModelViewSet):
             CurrencyConverter.validate_exchange_rate(new_rate)
 
             # Update exchange rate
-            currency.exchange_rate = new_rate
-            currency.save()
-
-            # Clear currency cache
-            cache.delete('active_currencies')
+            previous_rate = currency.exchange_rate
+            with transaction.atomic():
+                currency.exchange_rate = new_rate
+                currency.save()
+                ExchangeRateHistory.objects.create(
+                    currency=currency,
+                    exchange_rate=currency.exchange_rate,
+                    previous_rate=previous_rate,
+                    source='admin'
+                )
 
             return Response(CurrencySerializer(currency).data)
         except CurrencyConversionError as e:
@@ -1536,9 +1564,6 @@ class AdminCurrencyViewSet(viewsets.ModelViewSet):
             currency.is_active = not currency.is_active
             currency.save()
 
-            # Clear currency cache
-            cache.delete('active_currencies')
-
             return Response({
                 'status': 'success',
                 'is_active': currency.is_active
@@ -1578,24 +1603,22 @@ class AdminReturnViewSet(viewsets.ModelViewSet):
     ordering = ['-created_at']
 
     def get_queryset(self):
-        queryset = Return.objects.prefetch_related(
-            'items',  # Fetch related return items
-            'items__images'  # Fetch related images for each item
-        ).select_related(
-            'order',  # If you need order details
-            'user'    # If you need user details
-        )
+        if self.action == 'list':
+            queryset = ReturnQueue.for_list()
+        elif self.action == 'retrieve':
+            queryset = ReturnQueue.for_detail()
+        else:
+            # Actions that write history re-serialize afterwards, so a
+            # prefetched history would be stale
+            queryset = Return.objects.all()
 
-        # Date filtering
-        date_from = self.request.query_params.get('date_from')
-        date_to = self.request.query_params.get('date_to')
+        return ReturnQueue.filter_dates(queryset, self.request.query_params)
 
-        if date_from:
-            queryset = queryset.filter(created_at__gte=date_from)
-        if date_to:
-            queryset = queryset.filter(created_at__lte=date_to)
 
-        return queryset
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return ReturnListSerializer
+        return ReturnSerializer
 
 
     @action(detail=True, methods=['patch'])
@@ -2452,6 +2475,16 @@ class AdminFlashSaleViewSet(viewsets.ModelViewSet):
         flash_sale.status = new_status
         flash_sale.save()
 
+        # Same side effects as the scheduler: Redis quotas, prices, caches
+        if new_status == 'active':
+            transaction.on_commit(
+                lambda: FlashSaleScheduler.sales_changed(activated=[flash_sale.id])
+            )
+        elif new_status in ('ended', 'cancelled'):
+            transaction.on_commit(
+                lambda: FlashSaleScheduler.sales_changed(ended=[flash_sale.id])
+            )
+
         return Response(self.get_serializer(flash_sale).data)
     
 
@@ -2465,10 +2498,17 @@ class AdminFlashSaleViewSet(viewsets.ModelViewSet):
             total_revenue=Sum('quantity_sold')
         ).select_related('product')
 
+        # Sale prices come from the price table while the sale is running
+        prices = PriceEngine.prices_for([sp.product_id for sp in sales_products])
+
+        def sale_price(sp):
+            row = prices.get(sp.product_id)
+            if row and row.flash_sale_id == flash_sale.id:
+                return row.sale_price
+            return flash_sale.calculate_discounted_price(sp.original_price or sp.product.price)
+
         total_sold = sum(sp.quantity_sold for sp in sales_products)
-        total_revenue = sum(
-            sp.quantity_sold * flash_sale.calculate_discounted_price(sp.product.price) for sp in sales_products
-        )
+        total_revenue = sum(sp.quantity_sold * sale_price(sp) for sp in sales_products)
 
         # Calculate metrics 
         metrics = {
@@ -2552,6 +2592,10 @@ class AdminFlashSaleViewSet(viewsets.ModelViewSet):
                         product_id=product_id,
                         defaults=product_data
                     )
+
+                if flash_sale.status == 'active':
+                    transaction.on_commit(lambda: FlashSaleInventory.load(flash_sale))
+                    transaction.on_commit(FlashSaleScheduler.rebuild_active_prices)
             
             return Response(self.get_serializer(flash_sale).data)
         
@@ -2816,10 +2860,11 @@ class ShippingRateViewSet(viewsets.ModelViewSet):
         order_amount = serializer.validated_data['order_amount']
 
         try:
-            # Get shipping rate for the currency
+            # Get the default (zone-less) shipping rate for the currency
             shipping_rate = get_object_or_404(
                 ShippingRate,
                 currency_code=currency,
+                zone__isnull=True,
                 is_active=True
             )
 
@@ -2,8 +2,23 @@
 
 from rest_framework import serializers
 from .models import Cart, CartItem
-from shipping.models import ShippingRate
+from shipping.quotes import ShippingQuoteEngine
 from products.serializers import ProductListSerializer
+from products.pricing import PriceEngine
+
+
+class CartItemListSerializer(serializers.ListSerializer):
+    """ Loads the price rows of every item's product in one query """
+
+    def to_representation(self, data):
+        if hasattr(data, 'select_related'):
+            data = data.select_related('product', 'product__category')
+        items = list(data)
+        PriceEngine.attach(
+            [item.product for item in items],
+            self.child.fields['product'].get_currency()
+        )
+        return super().to_representation(items)
 
 
 class CartItemSerializer(serializers.ModelSerializer):
@@ -23,6 +38,7 @@ class CartItemSerializer(serializers.ModelSerializer):
             'price_at_add', 'subtotal', 'created_at'
         ]
         read_only_fields = ['price_at_add']
+        list_serializer_class = CartItemListSerializer
 
 
 
@@ -45,18 +61,15 @@ class CartSerializer(serializers.ModelSerializer):
     def get_shipping_fee(self, obj):
         # Default currency
         currency_code = 'USD'
+        country = None
 
-        # Try to get currency from request
+        # Try to get currency and destination from request
         request = self.context.get('request')
         if request:
             currency_code = request.query_params.get('currency', 'USD')
+            country = request.query_params.get('country')
+            if not country and request.user.is_authenticated:
+                country = request.user.country
 
-        # Get shipping rate for the currency
-        try:
-            shipping_rate = ShippingRate.objects.get(
-                currency_code=currency_code,
-                is_active=True
-            )
-            return shipping_rate.flat_rate
-        except ShippingRate.DoesNotExist:
-            return 0
\ No newline at end of file
+        # Quote from the cached shipping table
+        return ShippingQuoteEngine.quote_cart(obj, currency_code, country).fee
\ No newline at end of file
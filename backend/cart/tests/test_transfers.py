@@ -0,0 +1,117 @@
+from django.test import TestCase
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from decimal import Decimal
+from cart.models import Cart, CartItem, GuestCart, GuestCartItem
+from cart.transfers import CartTransfer
+from products.models import Category, Product
+from products.pricing import PriceEngine
+from users.models import User
+from wishlist.models import Wishlist, WishlistItem
+
+
+class CartTransferTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='shopper@example.com', username='shopper', first_name='Ada',
+            last_name='Shopper', password='shopperpass123'
+        )
+        self.category = Category.objects.create(name='Bundles')
+        self.products = [self.product(index) for index in range(30)]
+        PriceEngine.rebuild()
+        # Warm the currency snapshot so it does not count against the first merge
+        PriceEngine.effective_prices([self.products[0].id])
+        self.cart = Cart.objects.create(user=self.user)
+
+
+    def product(self, index, **fields):
+        return Product.objects.create(**{
+            'name': f'Bundle {index}', 'category': self.category, 'description': 'Bundle',
+            'price': Decimal('50.00'), 'stock': 10, **fields
+        })
+
+
+    def guest_cart(self, session_id, products):
+        guest_cart = GuestCart.objects.create(session_id=session_id)
+        GuestCartItem.objects.bulk_create([
+            GuestCartItem(cart=guest_cart, product=product, quantity=2, price_at_add=Decimal('50.00'))
+            for product in products
+        ])
+        return guest_cart
+
+
+    def test_guest_merge_costs_constant_queries(self):
+        small = self.guest_cart('small', self.products[:3])
+        with CaptureQueriesContext(connection) as small_queries:
+            CartTransfer.merge_guest_cart(self.cart, small)
+
+        large = self.guest_cart('large', self.products)
+        with CaptureQueriesContext(connection) as large_queries:
+            result = CartTransfer.merge_guest_cart(self.cart, large)
+
+        self.assertEqual(len(large_queries), len(small_queries))
+        self.assertEqual(len(result.moved), 30)
+        self.assertFalse(GuestCart.objects.exists())
+        # Merged twice: quantities add up
+        self.assertEqual(CartItem.objects.get(cart=self.cart, product=self.products[0]).quantity, 4)
+        self.assertEqual(CartItem.objects.filter(cart=self.cart).count(), 30)
+
+
+    def test_merge_caps_stock_and_skips_unavailable(self):
+        low = self.product('low', stock=3)
+        hidden = self.product('hidden', is_available=False)
+        CartItem.objects.create(cart=self.cart, product=low, quantity=2, price_at_add=Decimal('40.00'))
+
+        result = CartTransfer.merge_items(self.cart, [
+            {'product_id': low.id, 'quantity': 5},
+            {'product_id': hidden.id, 'quantity': 1},
+            {'product_id': 999999, 'quantity': 1},
+            {'product_id': 'bad'},
+        ])
+
+        self.assertEqual(result.moved, [low.id])
+        self.assertEqual(result.skipped, {
+            hidden.id: CartTransfer.UNAVAILABLE, 999999: CartTransfer.NOT_FOUND
+        })
+        item = CartItem.objects.get(cart=self.cart, product=low)
+        self.assertEqual((item.quantity, item.price_at_add), (3, Decimal('40.00')))
+
+
+    def test_wishlist_and_cart_round_trip(self):
+        wishlist = Wishlist.objects.create(user=self.user)
+        WishlistItem.objects.bulk_create([
+            WishlistItem(wishlist=wishlist, product=product) for product in self.products[:5]
+        ])
+
+        result = CartTransfer.wishlist_to_cart(self.user)
+        self.assertEqual(sorted(result.moved), sorted(p.id for p in self.products[:5]))
+        self.assertFalse(WishlistItem.objects.exists())
+
+        item_ids = list(CartItem.objects.filter(cart=self.cart).values_list('id', flat=True))
+        result = CartTransfer.cart_to_wishlist(self.user, self.cart, item_ids)
+        self.assertEqual(len(result.moved), 5)
+        self.assertFalse(CartItem.objects.exists())
+        self.assertEqual(WishlistItem.objects.filter(wishlist=wishlist).count(), 5)
+
+
+    def test_move_to_cart_endpoint(self):
+        wishlist = Wishlist.objects.create(user=self.user)
+        WishlistItem.objects.create(wishlist=wishlist, product=self.products[0])
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+
+        response = client.post(
+            reverse('wishlist-move-to-cart'),
+            {'product_ids': [self.products[0].id, self.products[1].id]},
+            format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['moved'], [self.products[0].id])
+        self.assertEqual(response.data['skipped'], {self.products[1].id: CartTransfer.NOT_FOUND})
+        # Shown by the storefront's success toast
+        self.assertEqual(response.data['message'], f'{self.products[0].name} added to cart')
+
+        response = client.post(reverse('wishlist-move-to-cart'), {'product_id': self.products[0].id})
+        self.assertEqual(response.status_code, 404)
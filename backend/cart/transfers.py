@@ -0,0 +1,199 @@
+# cart/transfers.py
+
+from django.db import transaction
+from dataclasses import dataclass, field
+from typing import Dict, List
+from products.models import Product
+from products.pricing import PriceEngine
+from wishlist.models import Wishlist, WishlistItem
+from .models import Cart, CartItem
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TransferResult:
+    """ Outcome of a bulk cart or wishlist transfer """
+    moved: List[int] = field(default_factory=list)
+    # product id -> reason it was left behind
+    skipped: Dict[int, str] = field(default_factory=dict)
+
+
+class CartTransfer:
+    """
+        Set-based moves between carts, guest carts and wishlists
+
+        Every operation locks its target once, reads products, prices and
+        existing lines with one query each, writes with a single upsert
+        against the (cart, product) or (wishlist, product) constraint and
+        removes the sources in one DELETE, so the cost does not grow with
+        the number of items.
+    """
+    NOT_FOUND = 'not_found'
+    UNAVAILABLE = 'unavailable'
+    OUT_OF_STOCK = 'out_of_stock'
+
+
+    @classmethod
+    @transaction.atomic
+    def add_to_cart(cls, cart, quantities):
+        """
+            Add quantities to a cart, on top of what it already holds
+
+            Quantities are capped at the product's stock; missing,
+            unavailable and out of stock products are skipped.
+
+            Args:
+                cart: Target cart
+                quantities: Dict mapping product id to quantity to add
+
+            Returns:
+                TransferResult
+        """
+        result = TransferResult()
+        if not quantities:
+            return result
+
+        # Serialize concurrent merges into the same cart
+        Cart.objects.select_for_update().filter(pk=cart.pk).first()
+
+        products = Product.objects.only(
+            'id', 'is_available', 'stock', 'price', 'discount_price'
+        ).in_bulk(quantities.keys())
+        existing = dict(CartItem.objects.filter(
+            cart=cart, product_id__in=quantities.keys()
+        ).values_list('product_id', 'quantity'))
+
+        valid = {}
+        for product_id, quantity in quantities.items():
+            product = products.get(product_id)
+            if product is None:
+                result.skipped[product_id] = cls.NOT_FOUND
+            elif not product.is_available:
+                result.skipped[product_id] = cls.UNAVAILABLE
+            elif product.stock <= 0:
+                result.skipped[product_id] = cls.OUT_OF_STOCK
+            else:
+                valid[product_id] = min(existing.get(product_id, 0) + quantity, product.stock)
+
+        if not valid:
+            return result
+
+        prices = PriceEngine.effective_prices(valid.keys())
+        CartItem.objects.bulk_create(
+            [
+                CartItem(
+                    cart=cart,
+                    product_id=product_id,
+                    quantity=quantity,
+                    price_at_add=prices.get(
+                        product_id,
+                        products[product_id].discount_price or products[product_id].price
+                    )
+                )
+                for product_id, quantity in valid.items()
+            ],
+            # Existing lines keep the price they were added at
+            update_conflicts=True,
+            unique_fields=['cart', 'product'],
+            update_fields=['quantity', 'updated_at']
+        )
+        result.moved = list(valid)
+        return result
+
+
+    @classmethod
+    @transaction.atomic
+    def merge_guest_cart(cls, cart, guest_cart):
+        """ Move a guest cart's items into a user's cart and delete the guest cart """
+        quantities = dict(guest_cart.items.values_list('product_id', 'quantity'))
+        result = cls.add_to_cart(cart, quantities)
+        guest_cart.delete()
+        return result
+
+
+    @classmethod
+    def merge_items(cls, cart, items):
+        """
+            Merge client-held items ([{'product_id': 1, 'quantity': 2}, ...])
+
+            Malformed entries are skipped; repeated products are summed.
+        """
+        quantities = {}
+        for item in items:
+            try:
+                product_id, quantity = int(item['product_id']), int(item['quantity'])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if quantity > 0:
+                quantities[product_id] = quantities.get(product_id, 0) + quantity
+        return cls.add_to_cart(cart, quantities)
+
+
+    @classmethod
+    @transaction.atomic
+    def wishlist_to_cart(cls, user, product_ids=None):
+        """
+            Move wishlist products (all when product_ids is None) into the
+            user's cart, one of each
+
+            Returns:
+                TransferResult; products not in the wishlist are skipped
+        """
+        items = WishlistItem.objects.filter(wishlist__user=user)
+        if product_ids is not None:
+            items = items.filter(product_id__in=product_ids)
+        in_wishlist = set(items.values_list('product_id', flat=True))
+
+        cart, _ = Cart.objects.get_or_create(user=user)
+        result = cls.add_to_cart(cart, {product_id: 1 for product_id in in_wishlist})
+        for product_id in set(product_ids or ()) - in_wishlist:
+            result.skipped[product_id] = cls.NOT_FOUND
+
+        if result.moved:
+            WishlistItem.objects.filter(
+                wishlist__user=user, product_id__in=result.moved
+            ).delete()
+        return result
+
+
+    @classmethod
+    @transaction.atomic
+    def cart_to_wishlist(cls, user, cart, item_ids):
+        """
+            Move cart lines into the user's wishlist
+
+            Products already in the wishlist simply leave the cart.
+
+            Args:
+                item_ids: Cart item ids to move
+
+            Returns:
+                TransferResult keyed by product id
+        """
+        result = TransferResult()
+        wishlist, _ = Wishlist.objects.get_or_create(user=user)
+        Wishlist.objects.select_for_update().filter(pk=wishlist.pk).first()
+
+        lines = CartItem.objects.filter(cart=cart, id__in=item_ids).values_list(
+            'id', 'product_id', 'product__is_available'
+        )
+        moved_items = []
+        for item_id, product_id, is_available in lines:
+            if is_available:
+                moved_items.append(item_id)
+                result.moved.append(product_id)
+            else:
+                result.skipped[product_id] = cls.UNAVAILABLE
+
+        if moved_items:
+            WishlistItem.objects.bulk_create(
+                [
+                    WishlistItem(wishlist=wishlist, product_id=product_id)
+                    for product_id in result.moved
+                ],
+                ignore_conflicts=True
+            )
+            CartItem.objects.filter(id__in=moved_items).delete()
+        return result
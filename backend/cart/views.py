@@ -6,7 +6,8 @@ from rest_framework.response import Response
 from .models import Cart, CartItem, GuestCart, GuestCartItem
 from .serializers import CartSerializer
 from products.models import Product
-from wishlist.models import Wishlist, WishlistItem
+from products.pricing import PriceEngine
+from .transfers import CartTransfer
 
 
 class CartViewSet(viewsets.GenericViewSet):
@@ -60,13 +61,13 @@ class CartViewSet(viewsets.GenericViewSet):
                 product=product,
                 defaults={
                     'quantity': quantity,
-                    'price_at_add': product.discount_price or product.price
+                    'price_at_add': PriceEngine.effective_price(product)
                 }
             )
 
             if not created:
                 cart_item.quantity = quantity
-                cart_item.price_at_add = product.discount_price or product.price
+                cart_item.price_at_add = PriceEngine.effective_price(product)
                 cart_item.save()
 
             serializer = self.get_serializer(cart)
@@ -170,7 +171,7 @@ class CartViewSet(viewsets.GenericViewSet):
                                 cart=guest_cart,
                                 product=product,
                                 quantity=item_data['quantity'],
-                                price_at_add=product.discount_price or product.price
+                                price_at_add=PriceEngine.effective_price(product)
                             )
                         )
                 except Product.DoesNotExist:
@@ -215,18 +216,15 @@ class CartViewSet(viewsets.GenericViewSet):
         # Try session-based merge
         session_id = request.data.get('session_id')
         if session_id:
-            try:
-                guest_cart = GuestCart.objects.get(session_id=session_id)
-                self._merge_guest_cart_items(user_cart, guest_cart)
-                guest_cart.delete()
+            guest_cart = GuestCart.objects.filter(session_id=session_id).first()
+            if guest_cart is not None:
+                CartTransfer.merge_guest_cart(user_cart, guest_cart)
                 items_merged = True
-            except GuestCart.DoesNotExist:
-                pass
 
         # Try direct items merge
         direct_items = request.data.get('items', [])
         if direct_items:
-            self._merge_direct_items(user_cart, direct_items)
+            CartTransfer.merge_items(user_cart, direct_items)
             items_merged = True
 
         if not items_merged:
@@ -237,111 +235,40 @@ class CartViewSet(viewsets.GenericViewSet):
 
         serializer = self.get_serializer(user_cart)
         return Response(serializer.data)
-
-
-    def _merge_guest_cart_items(self, user_cart, guest_cart):
-        """Helper method to merge guest cart items"""
-        for guest_item in guest_cart.items.all():
-            user_item, created = CartItem.objects.get_or_create(
-                cart=user_cart,
-                product=guest_item.product,
-                defaults={
-                    'quantity': guest_item.quantity,
-                    'price_at_add': guest_item.product.discount_price or guest_item.product.price
-                }
-            )
-            if not created:
-                user_item.quantity += guest_item.quantity
-                user_item.save()
-
-
-    def _merge_direct_items(self, user_cart, items):
-        """Helper method to merge direct cart items"""
-        for item in items:
-            try:
-                product = Product.objects.get(id=item['product_id'])
-                user_item, created = CartItem.objects.get_or_create(
-                    cart=user_cart,
-                    product=product,
-                    defaults={
-                        'quantity': item['quantity'],
-                        'price_at_add': product.discount_price or product.price
-                    }
-                )
-                if not created:
-                    user_item.quantity += item['quantity']
-                    user_item.save()
-            except Product.DoesNotExist:
-                continue
     
 
     @action(detail=False, methods=['post'])
     def move_to_wishlist(self, request):
         """
-        Move an item from cart to wishlist
+        Move cart items to the wishlist
         
         Expected payload:
         {
             'item_id': int,  # ID of the cart item to move
+            'item_ids': [int],  # or several at once
         }
         """
-        # Get cart for current user
-        cart = self.get_cart(request)
-
-        # Get item ID from request data
-        item_id = request.data.get('item_id')
-
-        if not item_id:
+        if not request.user.is_authenticated:
             return Response(
-                {"error": "Item ID is required"},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        try:
-            # Find the cart item
-            cart_item = CartItem.objects.get(cart=cart, id=item_id)
-            product = cart_item.product
-
-            # Check if product is available
-            if not product.is_available:
-                return Response(
-                    {"error": "Product is not currently available"},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-            
-            # Get or create user's wishlist
-            wishlist, _ = Wishlist.objects.get_or_create(user=request.user)
-
-            # Check if product is already in wishlist
-            if WishlistItem.objects.filter(
-                wishlist=wishlist,
-                product=product
-            ).exists():
-                return Response(
-                    {"error": "Product is already in your wishlist"},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-            
-            # Create wishlist item 
-            WishlistItem.objects.create(
-                wishlist=wishlist,
-                product=product
+                {"error": "User must be authenticated"},
+                status=status.HTTP_401_UNAUTHORIZED
             )
 
-            # Remove item form cart
-            cart_item.delete()
-
-            # Serialize and return updated cart
-            serializer = self.get_serializer(cart)
-            return Response(serializer.data)
-        
-        except CartItem.DoesNotExist:
+        item_ids = request.data.get('item_ids') or (
+            [request.data['item_id']] if request.data.get('item_id') else []
+        )
+        if not item_ids:
             return Response(
-                {"error": "Cart item not found"},
+                {"error": "Item ID is required"},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        except Exception as e:
+
+        cart = self.get_cart(request)
+        result = CartTransfer.cart_to_wishlist(request.user, cart, item_ids)
+        if not result.moved:
             return Response(
-                {"error": str(e)},
+                {"error": "No cart items could be moved", "skipped": result.skipped},
                 status=status.HTTP_400_BAD_REQUEST
             )
+
+        return Response({'moved': result.moved, 'skipped': result.skipped})
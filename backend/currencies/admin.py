@@ -1,8 +1,7 @@
 # currencies/admin.py
 from django.contrib import admin
 from django.utils.html import format_html
-from django.core.cache import cache
-from .models import Currency
+from .models import Currency, ExchangeRateHistory
 
 
 @admin.register(Currency)
@@ -77,13 +76,6 @@ class CurrencyAdmin(admin.ModelAdmin):
     usd_conversion_preview.short_description = 'Example (USD $100)'
 
 
-    def save_model(self, request, obj, form, change):
-        """Override save_model to clear cache when currency is updated"""
-        super().save_model(request, obj, form, change)
-        # Clear currency cache
-        cache.delete('active_currencies')
-
-
     def has_delete_permission(self, request, obj=None):
         """Prevent deletion of USD (base currency)"""
         if obj and obj.code == 'USD':
@@ -106,4 +98,16 @@ class CurrencyAdmin(admin.ModelAdmin):
         }
         js = (
             'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/5.15.4/js/all.min.js',
-        )
\ No newline at end of file
+        )
+
+
+@admin.register(ExchangeRateHistory)
+class ExchangeRateHistoryAdmin(admin.ModelAdmin):
+    list_display = ('currency', 'exchange_rate', 'previous_rate', 'source', 'recorded_at')
+    list_filter = ('source', 'currency')
+    readonly_fields = ('currency', 'exchange_rate', 'previous_rate', 'source', 'recorded_at')
+    ordering = ('-recorded_at',)
+
+
+    def has_add_permission(self, request):
+        return False
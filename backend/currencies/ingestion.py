@@ -0,0 +1,113 @@
+# currencies/ingestion.py
+
+from django.db import transaction
+from django.utils import timezone
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Dict, List
+from .models import Currency, ExchangeRateHistory
+from .providers import get_provider
+from .signals import exchange_rates_updated
+from .utils import CurrencyConverter, ExchangeRateSnapshots, InvalidExchangeRate
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class IngestionResult:
+    """ Outcome of one ingestion run """
+    provider: str
+    updated: Dict[str, Decimal] = field(default_factory=dict)
+    unchanged: List[str] = field(default_factory=list)
+    invalid: Dict[str, str] = field(default_factory=dict)
+    missing: List[str] = field(default_factory=list)
+
+
+class ExchangeRateIngestion:
+    """
+        Refresh every exchange rate from a provider in one batch
+
+        Rates are fetched in a single provider call, validated with
+        CurrencyConverter.validate_exchange_rate, written with one bulk
+        update plus one history insert, and published as a new snapshot
+        once the transaction commits.
+    """
+    QUANTIZE = Decimal('0.000001')  # Matches Currency.exchange_rate
+
+
+    @classmethod
+    def run(cls, provider=None, dry_run=False) -> IngestionResult:
+        """
+            Fetch, validate and store exchange rates
+
+            Args:
+                provider: ExchangeRateProvider (defaults to the configured one)
+                dry_run: Validate and report without writing anything
+
+            Returns:
+                IngestionResult
+
+            Raises:
+                ExchangeRateProviderError: If the provider call fails
+        """
+        provider = provider or get_provider()
+        currencies = list(
+            Currency.objects.exclude(code=CurrencyConverter.BASE_CURRENCY)
+        )
+        rates = provider.fetch(
+            CurrencyConverter.BASE_CURRENCY,
+            [currency.code for currency in currencies]
+        )
+
+        result = IngestionResult(provider=provider.name)
+        now = timezone.now()
+        changed = []
+        history = []
+
+        for currency in currencies:
+            if currency.code not in rates:
+                result.missing.append(currency.code)
+                continue
+
+            try:
+                CurrencyConverter.validate_exchange_rate(rates[currency.code])
+                rate = Decimal(str(rates[currency.code])).quantize(cls.QUANTIZE)
+                # Rounding to the stored precision can push tiny rates to 0
+                CurrencyConverter.validate_exchange_rate(rate)
+            except InvalidExchangeRate as e:
+                logger.warning(f"Rejected {provider.name} rate for {currency.code}: {e}")
+                result.invalid[currency.code] = str(e)
+                continue
+
+            if rate == currency.exchange_rate:
+                result.unchanged.append(currency.code)
+                continue
+
+            history.append(ExchangeRateHistory(
+                currency=currency,
+                exchange_rate=rate,
+                previous_rate=currency.exchange_rate,
+                source=provider.name
+            ))
+            currency.exchange_rate = rate
+            currency.last_updated = now
+            changed.append(currency)
+            result.updated[currency.code] = rate
+
+        if dry_run or not changed:
+            return result
+
+        with transaction.atomic():
+            Currency.objects.bulk_update(changed, ['exchange_rate', 'last_updated'])
+            ExchangeRateHistory.objects.bulk_create(history)
+
+            transaction.on_commit(ExchangeRateSnapshots.publish)
+            exchange_rates_updated.send(
+                sender=Currency, codes=list(result.updated)
+            )
+
+        logger.info(
+            f"Ingested {len(changed)} exchange rates from {provider.name}"
+        )
+        return result
@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand, CommandError
+from currencies.ingestion import ExchangeRateIngestion
+from currencies.providers import get_provider, PROVIDERS, ExchangeRateProviderError
+
+
+class Command(BaseCommand):
+    help = 'Fetch all exchange rates from a provider and store them in one batch'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--provider',
+            choices=list(PROVIDERS),
+            help='Provider to use (defaults to settings.EXCHANGE_RATE_PROVIDER)'
+        )
+        parser.add_argument(
+            '--file',
+            help='JSON rates file for the file provider'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Validate and report without saving'
+        )
+
+    def handle(self, *args, **options):
+        name = options['provider']
+        provider_options = {}
+        if options['file']:
+            if name not in (None, 'file'):
+                raise CommandError('--file only applies to the file provider')
+            name, provider_options = 'file', {'path': options['file']}
+
+        try:
+            provider = get_provider(name, **provider_options)
+            result = ExchangeRateIngestion.run(provider, dry_run=options['dry_run'])
+        except ExchangeRateProviderError as e:
+            raise CommandError(str(e))
+
+        for code, rate in result.updated.items():
+            self.stdout.write(f'{code}: {rate}')
+        for code, error in result.invalid.items():
+            self.stdout.write(self.style.WARNING(f'{code}: rejected ({error})'))
+        if result.missing:
+            self.stdout.write(self.style.WARNING(
+                f'No rate from {result.provider} for: {", ".join(result.missing)}'))
+
+        verb = 'Would update' if options['dry_run'] else 'Updated'
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} {len(result.updated)} rates from {result.provider} '
+            f'({len(result.unchanged)} unchanged)'
+        ))
@@ -0,0 +1,30 @@
+# Generated by Django 5.1.2 on 2026-10-19 13:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('currencies', '0003_alter_currency_exchange_rate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExchangeRateHistory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('exchange_rate', models.DecimalField(decimal_places=6, max_digits=10)),
+                ('previous_rate', models.DecimalField(blank=True, decimal_places=6, max_digits=10, null=True)),
+                ('source', models.CharField(help_text="Provider or 'admin' for manual updates", max_length=50)),
+                ('recorded_at', models.DateTimeField(auto_now_add=True)),
+                ('currency', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rate_history', to='currencies.currency')),
+            ],
+            options={
+                'verbose_name_plural': 'Exchange rate history',
+                'ordering': ['-recorded_at'],
+                'indexes': [models.Index(fields=['currency', '-recorded_at'], name='currencies__currenc_4a50f9_idx')],
+            },
+        ),
+    ]
@@ -1,7 +1,6 @@
 # currencies/models.py
 
-from django.db import models
-from django.core.cache import cache
+from django.db import models, transaction
 from django.core.validators import MinValueValidator
 from decimal import Decimal
 from django.core.exceptions import ValidationError
@@ -68,10 +67,42 @@ class Currency(models.Model):
 
 
     def save(self, *args, **kwargs):
-        """Override save to handle cache invalidation"""
-        self.full_clean()  # Run validation
+        """Override save to publish a new exchange rate snapshot"""
+        from .utils import ExchangeRateSnapshots
 
-        # Clear cache when currency is updated
-        cache.delete('active_currencies')
+        self.full_clean()  # Run validation
 
         super().save(*args, **kwargs)
+
+        # Readers switch to the new rates once the change is committed
+        transaction.on_commit(ExchangeRateSnapshots.publish)
+
+
+    def delete(self, *args, **kwargs):
+        """Override delete to publish a snapshot without this currency"""
+        from .utils import ExchangeRateSnapshots
+
+        result = super().delete(*args, **kwargs)
+        transaction.on_commit(ExchangeRateSnapshots.publish)
+        return result
+
+
+class ExchangeRateHistory(models.Model):
+    """ Every exchange rate a currency has had, newest first """
+    currency = models.ForeignKey(Currency, on_delete=models.CASCADE, related_name='rate_history')
+    exchange_rate = models.DecimalField(max_digits=10, decimal_places=6)
+    previous_rate = models.DecimalField(max_digits=10, decimal_places=6, null=True, blank=True)
+    source = models.CharField(max_length=50, help_text="Provider or 'admin' for manual updates")
+    recorded_at = models.DateTimeField(auto_now_add=True)
+
+
+    class Meta:
+        verbose_name_plural = 'Exchange rate history'
+        ordering = ['-recorded_at']
+        indexes = [
+            models.Index(fields=['currency', '-recorded_at'])
+        ]
+
+
+    def __str__(self):
+        return f"{self.currency.code} {self.exchange_rate} ({self.source})"
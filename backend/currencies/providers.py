@@ -0,0 +1,128 @@
+# currencies/providers.py
+
+from django.conf import settings
+from decimal import Decimal, InvalidOperation
+from typing import Dict, Iterable
+from .utils import CurrencyConversionError
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ExchangeRateProviderError(CurrencyConversionError):
+    """ Exception for a provider that could not return rates """
+    pass
+
+
+class ExchangeRateProvider:
+    """
+        Source of exchange rates for the ingestion job
+
+        Subclasses return every requested rate from a single call, so a run
+        costs one round-trip however many currencies are configured.
+    """
+    name = None
+
+
+    def fetch(self, base: str, codes: Iterable[str]) -> Dict[str, Decimal]:
+        """
+            Fetch exchange rates
+
+            Args:
+                base: Base currency code the rates are relative to
+                codes: Currency codes to fetch
+
+            Returns:
+                Dict mapping currency codes to rates (missing codes omitted)
+
+            Raises:
+                ExchangeRateProviderError: If the rates could not be fetched
+        """
+        raise NotImplementedError
+
+
+class ForexPythonProvider(ExchangeRateProvider):
+    """ Rates from forex-python (European Central Bank reference rates) """
+    name = 'forex'
+
+
+    def fetch(self, base, codes):
+        try:
+            from forex_python.converter import CurrencyRates
+        except ImportError:
+            raise ExchangeRateProviderError('forex-python is not installed')
+
+        try:
+            rates = CurrencyRates(force_decimal=True).get_rates(base)
+        except Exception as e:
+            raise ExchangeRateProviderError(f"forex-python request failed: {e}")
+
+        return {code: rates[code] for code in codes if code in rates}
+
+
+class JSONFileProvider(ExchangeRateProvider):
+    """
+        Rates from a JSON file, for offline runs and tests
+
+        The file holds either {"base": "USD", "rates": {"NGN": 1500}} or a
+        plain {"NGN": 1500} mapping.
+    """
+    name = 'file'
+
+
+    def __init__(self, path=None):
+        self.path = path or settings.EXCHANGE_RATE_FILE
+        if not self.path:
+            raise ExchangeRateProviderError('No exchange rate file configured')
+
+
+    def fetch(self, base, codes):
+        try:
+            with open(self.path) as handle:
+                data = json.load(handle, parse_float=Decimal)
+        except (OSError, ValueError) as e:
+            raise ExchangeRateProviderError(f"Could not read {self.path}: {e}")
+
+        rates = data.get('rates', data)
+        file_base = data.get('base', base) if 'rates' in data else base
+        if file_base != base:
+            raise ExchangeRateProviderError(
+                f"Rates in {self.path} are relative to {file_base}, not {base}"
+            )
+
+        result = {}
+        for code in codes:
+            if code not in rates:
+                continue
+            try:
+                result[code] = Decimal(str(rates[code]))
+            except InvalidOperation:
+                # Left for validation to reject
+                result[code] = rates[code]
+        return result
+
+
+PROVIDERS = {
+    ForexPythonProvider.name: ForexPythonProvider,
+    JSONFileProvider.name: JSONFileProvider,
+}
+
+
+def get_provider(name=None, **options) -> ExchangeRateProvider:
+    """
+        Instantiate a provider by name
+
+        Args:
+            name: Provider name (defaults to settings.EXCHANGE_RATE_PROVIDER)
+            **options: Provider constructor arguments
+
+        Raises:
+            ExchangeRateProviderError: If the name is unknown
+    """
+    name = name or settings.EXCHANGE_RATE_PROVIDER
+    if name not in PROVIDERS:
+        raise ExchangeRateProviderError(
+            f"Unknown exchange rate provider '{name}'. Choose from: {', '.join(PROVIDERS)}"
+        )
+    return PROVIDERS[name](**options)
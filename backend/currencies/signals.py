@@ -0,0 +1,8 @@
+# currencies/signals.py
+
+from django.dispatch import Signal
+
+# Sent inside the transaction after a batch of exchange rates is written
+# with a bulk update (which bypasses Currency.save and post_save).
+# Provides: codes - the currency codes whose rates changed
+exchange_rates_updated = Signal()
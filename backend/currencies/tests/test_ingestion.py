@@ -0,0 +1,118 @@
+from django.test import TestCase
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from decimal import Decimal
+from io import StringIO
+from products.models import Category, Product, ProductPrice
+from ..models import Currency, ExchangeRateHistory
+from ..providers import JSONFileProvider, ExchangeRateProviderError, get_provider
+from ..ingestion import ExchangeRateIngestion
+from ..utils import ExchangeRateSnapshots
+import json
+import os
+import tempfile
+
+
+class ExchangeRateIngestionTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        ExchangeRateSnapshots._local = (None, None)
+        Currency.objects.create(
+            code='USD', name='US Dollar', symbol='$', exchange_rate=Decimal('1.00')
+        )
+        self.ngn = Currency.objects.create(
+            code='NGN', name='Nigerian Naira', symbol='₦', exchange_rate=Decimal('1500.00')
+        )
+        self.ghs = Currency.objects.create(
+            code='GHS', name='Ghanaian Cedis', symbol='GH₵', exchange_rate=Decimal('15.00')
+        )
+        self.kes = Currency.objects.create(
+            code='KES', name='Kenyan Shillings', symbol='KSh', exchange_rate=Decimal('130.00')
+        )
+
+
+    def write_rates(self, data):
+        handle, path = tempfile.mkstemp(suffix='.json')
+        with os.fdopen(handle, 'w') as rates_file:
+            json.dump(data, rates_file)
+        self.addCleanup(os.remove, path)
+        return path
+
+
+    def test_rates_are_written_in_one_batch_with_history(self):
+        path = self.write_rates({
+            'base': 'USD',
+            'rates': {'NGN': '1550.25', 'GHS': '15.00', 'KES': '-3'}
+        })
+
+        with self.captureOnCommitCallbacks(execute=True):
+            result = ExchangeRateIngestion.run(JSONFileProvider(path))
+
+        self.assertEqual(result.updated, {'NGN': Decimal('1550.250000')})
+        self.assertEqual(result.unchanged, ['GHS'])
+        self.assertIn('KES', result.invalid)
+
+        self.ngn.refresh_from_db()
+        self.kes.refresh_from_db()
+        self.assertEqual(self.ngn.exchange_rate, Decimal('1550.25'))
+        self.assertEqual(self.kes.exchange_rate, Decimal('130.00'))
+
+        history = ExchangeRateHistory.objects.get()
+        self.assertEqual(history.currency, self.ngn)
+        self.assertEqual(history.previous_rate, Decimal('1500.00'))
+        self.assertEqual(history.source, 'file')
+
+        # The new snapshot is published for every worker
+        self.assertEqual(
+            ExchangeRateSnapshots.current()[1]['NGN'].rate, Decimal('1550.25')
+        )
+
+
+    def test_price_table_follows_ingested_rates(self):
+        category = Category.objects.create(name='Straight Hairs')
+        product = Product.objects.create(
+            name='Raw Straight 20', category=category, description='Straight',
+            price=Decimal('100.00'), stock=5
+        )
+        path = self.write_rates({'NGN': 1600})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ExchangeRateIngestion.run(JSONFileProvider(path))
+
+        row = ProductPrice.objects.get(product=product, currency_code='NGN')
+        self.assertEqual(row.sale_price, Decimal('160000.00'))
+
+
+    def test_dry_run_and_missing_rates(self):
+        path = self.write_rates({'NGN': 1700})
+        result = ExchangeRateIngestion.run(JSONFileProvider(path), dry_run=True)
+
+        self.assertEqual(result.updated, {'NGN': Decimal('1700.000000')})
+        self.assertEqual(sorted(result.missing), ['GHS', 'KES'])
+        self.assertFalse(ExchangeRateHistory.objects.exists())
+        self.ngn.refresh_from_db()
+        self.assertEqual(self.ngn.exchange_rate, Decimal('1500.00'))
+
+
+    def test_provider_errors(self):
+        with self.assertRaises(ExchangeRateProviderError):
+            get_provider('unknown')
+
+        path = self.write_rates({'base': 'EUR', 'rates': {'NGN': 1600}})
+        with self.assertRaises(ExchangeRateProviderError):
+            JSONFileProvider(path).fetch('USD', ['NGN'])
+
+
+    def test_management_command(self):
+        path = self.write_rates({'NGN': 1650, 'GHS': 16, 'KES': 131})
+        out = StringIO()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('update_exchange_rates', file=path, stdout=out)
+
+        self.assertIn('Updated 3 rates from file', out.getvalue())
+        self.assertEqual(ExchangeRateHistory.objects.count(), 3)
+
+        with self.assertRaises(CommandError):
+            call_command('update_exchange_rates', file='/nonexistent.json', stdout=out)
@@ -2,6 +2,7 @@ from django.test import TestCase
 from django.core.cache import cache
 from decimal import Decimal
 from ..models import Currency
+from ..utils import ExchangeRateSnapshots
 
 class CurrencyModelTest(TestCase):
     def setUp(self):
@@ -54,25 +55,31 @@ class CurrencyModelTest(TestCase):
             currency = Currency(**invalid_data)
             currency.full_clean()
 
-    def test_cache_invalidation_on_save(self):
-        """Test that cache is invalidated when currency is saved"""
-        # Set something in cache
-        cache.set('active_currencies', {'test': 'data'})
-        
+    def test_snapshot_published_on_save(self):
+        """Test that a new rate snapshot is published when currency is saved"""
+        version = ExchangeRateSnapshots.version()
+
         # Save currency
-        currency = Currency.objects.create(**self.currency_data)
-        
-        # Check cache was cleared
-        self.assertIsNone(cache.get('active_currencies'))
+        with self.captureOnCommitCallbacks(execute=True):
+            Currency.objects.create(**self.currency_data)
+
+        # Check readers see the new snapshot
+        self.assertGreater(ExchangeRateSnapshots.version(), version)
+        self.assertIn('NGN', ExchangeRateSnapshots.current()[1])
+
+    def test_snapshot_published_on_update(self):
+        """Test that a new rate snapshot is published when currency is updated"""
+        with self.captureOnCommitCallbacks(execute=True):
+            currency = Currency.objects.create(**self.currency_data)
+        version = ExchangeRateSnapshots.version()
 
-    def test_cache_invalidation_on_update(self):
-        """Test that cache is invalidated when currency is updated"""
-        currency = Currency.objects.create(**self.currency_data)
-        cache.set('active_currencies', {'test': 'data'})
-        
         # Update currency
-        currency.exchange_rate = Decimal('760.00')
-        currency.save()
-        
-        # Check cache was cleared
-        self.assertIsNone(cache.get('active_currencies'))
\ No newline at end of file
+        with self.captureOnCommitCallbacks(execute=True):
+            currency.exchange_rate = Decimal('760.00')
+            currency.save()
+
+        # Check readers see the new rate
+        self.assertEqual(ExchangeRateSnapshots.version(), version + 1)
+        self.assertEqual(
+            ExchangeRateSnapshots.current()[1]['NGN'].rate, Decimal('760.00')
+        )
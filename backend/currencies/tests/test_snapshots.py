@@ -0,0 +1,72 @@
+from django.test import TestCase
+from django.core.cache import cache
+from decimal import Decimal
+from ..models import Currency
+from ..utils import CurrencyConverter, ExchangeRateSnapshots
+
+
+class ExchangeRateSnapshotsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        ExchangeRateSnapshots._local = (None, None)
+        Currency.objects.create(
+            code='USD', name='US Dollar', symbol='$', exchange_rate=Decimal('1.00')
+        )
+        self.ngn = Currency.objects.create(
+            code='NGN', name='Nigerian Naira', symbol='₦', exchange_rate=Decimal('750.00')
+        )
+
+
+    def test_first_read_publishes_and_later_reads_stay_local(self):
+        with self.assertNumQueries(1):
+            version, currencies = ExchangeRateSnapshots.current()
+        self.assertEqual(currencies['NGN'].rate, Decimal('750.00'))
+
+        with self.assertNumQueries(0):
+            self.assertEqual(ExchangeRateSnapshots.current(), (version, currencies))
+            CurrencyConverter.get_active_currencies()
+
+
+    def test_other_workers_switch_on_version_change(self):
+        ExchangeRateSnapshots.publish()
+        Currency.objects.filter(pk=self.ngn.pk).update(exchange_rate=Decimal('800.00'))
+        version = ExchangeRateSnapshots.publish()
+
+        # Another process still holds the previous snapshot
+        ExchangeRateSnapshots._local = (version - 1, {})
+        with self.assertNumQueries(0):
+            current_version, currencies = ExchangeRateSnapshots.current()
+        self.assertEqual(current_version, version)
+        self.assertEqual(currencies['NGN'].rate, Decimal('800.00'))
+
+
+    def test_old_snapshots_are_immutable(self):
+        old = ExchangeRateSnapshots.publish()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.ngn.exchange_rate = Decimal('900.00')
+            self.ngn.save()
+
+        self.assertEqual(
+            cache.get(ExchangeRateSnapshots.SNAPSHOT_KEY.format(old))['NGN'].rate,
+            Decimal('750.00')
+        )
+        self.assertEqual(
+            CurrencyConverter.convert_price(Decimal('2'), 'USD', 'NGN'),
+            Decimal('1800.00')
+        )
+
+
+    def test_derived_price_keys_follow_snapshot_version(self):
+        from products.models import Category, Product
+
+        category = Category.objects.create(name='Straight Hairs')
+        product = Product.objects.create(
+            name='Raw Straight 20', category=category, description='Straight',
+            price=Decimal('100.00'), stock=5
+        )
+        self.assertEqual(product.get_price_in_currency('NGN'), Decimal('75000.00'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.ngn.exchange_rate = Decimal('760.00')
+            self.ngn.save()
+        self.assertEqual(product.get_price_in_currency('NGN'), Decimal('76000.00'))
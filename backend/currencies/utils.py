@@ -1,9 +1,11 @@
 from decimal import Decimal, ROUND_HALF_UP, InvalidOperation
 from django.core.cache import cache
+from utils.cache import get_or_compute
 from .models import Currency
-from typing import Union, Dict, Optional, List
+from typing import Union, Dict, Optional, List, Tuple
 from dataclasses import dataclass
 from django.core.exceptions import ValidationError
+import time
 import logging
 
 logger = logging.getLogger(__name__)
@@ -37,8 +39,6 @@ class CurrencyInfo:
 
 class CurrencyConverter:
     """ Handle currency conversion operations """
-    CACHE_KEY = 'active_currencies'
-    CACHE_TIMEOUT = 60 * 60 * 24
     BASE_CURRENCY = 'USD'
 
 
@@ -84,66 +84,73 @@ class CurrencyConverter:
         return to_rate / from_rate
 
 
+    @classmethod
+    def load_active_currencies(cls) -> Dict[str, CurrencyInfo]:
+        """
+            Read active currencies from the database
+
+            Returns:
+                Dict mapping currency codes to CurrencyInfo objects
+
+            Note:
+                Always includes USD as base currency with rate 1.0
+        """
+        currencies = {}
+        for currency in Currency.objects.filter(is_active=True):
+            try:
+                # Validate exchange rate
+                cls.validate_exchange_rate(currency.exchange_rate)
+
+                currencies[currency.code] = CurrencyInfo(
+                    code=currency.code,
+                    symbol=currency.symbol,
+                    rate=Decimal(str(currency.exchange_rate)),
+                    name=currency.name
+                )
+            except InvalidExchangeRate as e:
+                logger.error(
+                    f"Invalid exchange rate for {currency.code}: {e}"
+                )
+                continue
+
+        # Ensure base currency is always present with rate 1.0
+        if cls.BASE_CURRENCY not in currencies:
+            currencies[cls.BASE_CURRENCY] = cls._base_currency_info()
+
+        return currencies
+
+
+    @classmethod
+    def _base_currency_info(cls) -> CurrencyInfo:
+        return CurrencyInfo(
+            code=cls.BASE_CURRENCY,
+            symbol='$',
+            rate=Decimal('1.0'),
+            name='US Dollar'
+        )
+
+
     @classmethod
     def get_active_currencies(cls) -> Dict[str, CurrencyInfo]:
         """
             Get all active currencies with their exchange rates
-            
+
+            Served from the process-local copy of the current exchange rate
+            snapshot (see ExchangeRateSnapshots).
+
             Returns:
                 Dict mapping currency codes to CurrencyInfo objects
-            
+
             Note:
                 Always includes USD as base currency with rate 1.0
         """
-        # Try to get from cache first
-        currencies = cache.get(cls.CACHE_KEY)
-
-        if currencies is None:
-                try:
-                    # Get fresh data from database
-                    currencies = {}
-                    for currency in Currency.objects.filter(is_active=True):
-                        try:
-                           # Validate exchange rate
-                           cls.validate_exchange_rate(currency.exchange_rate)
-
-                           currencies[currency.code] = CurrencyInfo(
-                                 code=currency.code,
-                                 symbol=currency.symbol,
-                                 rate=Decimal(str(currency.exchange_rate)),
-                                 name=currency.name
-                           )
-                        except InvalidExchangeRate as e:
-                           logger.error(
-                                 f"Invalid exchange rate for {currency.code}: {e}"
-                           )
-                           continue
-                    
-                    # Ensure base currency is always present with rate 1.0
-                    if cls.BASE_CURRENCY not in currencies:
-                        currencies[cls.BASE_CURRENCY] = CurrencyInfo(
-                            code=cls.BASE_CURRENCY,
-                            symbol='$',
-                            rate=Decimal('1.0'),
-                            name='US Dollar'
-                        )
-                    
-                    # Cache the results
-                    cache.set(cls.CACHE_KEY, currencies, cls.CACHE_TIMEOUT)
-                except Exception as e:
-                    logger.error(f"Failed to get active currencies: {e}")
-                    # Return at least USD as fallback
-                    currencies = {
-                        cls.BASE_CURRENCY: CurrencyInfo(
-                            code=cls.BASE_CURRENCY,
-                            symbol='$',
-                            rate=Decimal('1.0'),
-                            name='US Dollar'
-                        )
-                    }
+        try:
+            return ExchangeRateSnapshots.current()[1]
+        except Exception as e:
+            logger.error(f"Failed to get active currencies: {e}")
+            # Return at least USD as fallback
+            return {cls.BASE_CURRENCY: cls._base_currency_info()}
 
-        return currencies
-                            
 
     @classmethod
     def convert_price(
@@ -252,7 +259,98 @@ class CurrencyConverter:
 
     @classmethod
     def refresh_cache(cls) -> None:
-        """ Force refresh of currency cache """
-        cache.delete(cls.CACHE_KEY)
-        cls.get_active_currencies()
+        """ Publish a fresh exchange rate snapshot """
+        ExchangeRateSnapshots.publish()
+
+
+class ExchangeRateSnapshots:
+    """
+        Exchange rates published as immutable, versioned snapshots
+
+        Each publish stores the full set of active currencies under a new
+        version key and only then moves the "current" pointer, so a rate
+        change reaches every worker at once and no reader ever sees half an
+        update. Workers keep the snapshot in process memory and only read
+        the small pointer per lookup, so nothing is deleted and nobody
+        stampedes the database to rebuild a purged key. Caches of derived
+        prices embed the snapshot version in their keys.
+    """
+    CURRENT_KEY = 'exchange_rates_current'
+    COUNTER_KEY = 'exchange_rates_counter'
+    SNAPSHOT_KEY = 'exchange_rates_v{}'
+    BOOTSTRAP_KEY = 'exchange_rates_bootstrap'
+    BOOTSTRAP_TIMEOUT = 60  # Republishing after a flush is single-flight
+    SNAPSHOT_TIMEOUT = 60 * 60 * 24 * 7  # Old versions linger for slow readers
+
+    # (version, currencies) swapped as one tuple so threads never see a mix
+    _local = (None, None)
+
+
+    @classmethod
+    def _next_version(cls) -> int:
+        try:
+            return cache.incr(cls.COUNTER_KEY)
+        except ValueError:
+            # Seed from the clock so versions keep increasing after a flush
+            cache.add(cls.COUNTER_KEY, int(time.time()), None)
+            return cache.incr(cls.COUNTER_KEY)
+
+
+    @classmethod
+    def publish(cls) -> int:
+        """
+            Snapshot the active currencies and make it current
+
+            Returns:
+                int: The new snapshot version
+        """
+        currencies = CurrencyConverter.load_active_currencies()
+        version = cls._next_version()
+
+        # Write the snapshot before moving the pointer to it
+        cache.set(cls.SNAPSHOT_KEY.format(version), currencies, cls.SNAPSHOT_TIMEOUT)
+        cache.set(cls.CURRENT_KEY, version, None)
+
+        cls._local = (version, currencies)
+
+        logger.info(f"Published exchange rate snapshot v{version}")
+        return version
+
+
+    @classmethod
+    def current(cls) -> Tuple[int, Dict[str, CurrencyInfo]]:
+        """
+            Current snapshot version and currencies
+
+            Returns:
+                Tuple of (version, dict mapping codes to CurrencyInfo)
+        """
+        local = cls._local
+        version = cache.get(cls.CURRENT_KEY)
+        if version is not None and version == local[0]:
+            return local
+
+        currencies = cache.get(cls.SNAPSHOT_KEY.format(version)) if version is not None else None
+        if currencies is not None:
+            cls._local = (version, currencies)
+            return cls._local
+
+        # Nothing published yet (or the cache was flushed): exactly one
+        # worker republishes while the others wait for it
+        version = get_or_compute(cls.BOOTSTRAP_KEY, cls.publish, cls.BOOTSTRAP_TIMEOUT)
+        local = cls._local
+        if local[0] == version:
+            return local
+
+        currencies = cache.get(cls.SNAPSHOT_KEY.format(version))
+        if currencies is None:
+            return version, CurrencyConverter.load_active_currencies()
+        cls._local = (version, currencies)
+        return cls._local
+
+
+    @classmethod
+    def version(cls) -> int:
+        """ Version of the current snapshot, for keying derived caches """
+        return cls.current()[0]
 
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.2 on 2026-10-19 13:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customer_support', '0004_remove_emailattachment_file_url'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='emailattachment',
+            name='variants',
+            field=models.JSONField(blank=True, default=dict, help_text='Precomputed delivery URLs for image attachments'),
+        ),
+    ]
@@ -87,45 +87,46 @@ class EmailAttachment(models.Model):
     public_id = models.CharField(max_length=255, blank=True)
     content_type = models.CharField(max_length=300, blank=True)
     file_size = models.IntegerField(default=0)
+    variants = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Precomputed delivery URLs for image attachments"
+    )
     created_at = models.DateTimeField(auto_now_add=True)
 
 
+    def is_image(self):
+        return bool(self.public_id) and self.content_type.startswith('image/')
+
+
     def save(self, *args, **kwargs):
         if not self.file_size and self.file:
             self.file_size = self.file.size
+        if self.is_image() and not self.variants:
+            self.variants = CloudinaryUploader.build_variants(self.public_id)
         super().save(*args, **kwargs)
 
 
     def delete(self, *args, **kwargs):
-        # Delete from Cloudinary
-        if self.public_id:
+        # Delete from Cloudinary unless a deduplicated upload still uses it
+        if self.public_id and not EmailAttachment.objects.filter(
+            public_id=self.public_id
+        ).exclude(pk=self.pk).exists():
             CloudinaryUploader.delete_file(self.public_id)
         super().delete(*args, **kwargs)
 
 
     def get_thumbnail_url(self):
         """Get thumbnail URL for image attachments"""
-        if self.public_id and self.content_type.startswith('image/'):
-            return CloudinaryUploader.get_image_url(
-                self.public_id,
-                width=200,
-                height=200,
-                crop='fill',
-                quality='auto'
-            )
+        if self.is_image():
+            return CloudinaryUploader.get_variant_url(self.variants, self.public_id, 'thumbnail')
         return None
 
 
     def get_preview_url(self):
         """Get preview URL for image attachments"""
-        if self.public_id and self.content_type.startswith('image/'):
-            return CloudinaryUploader.get_image_url(
-                self.public_id,
-                width=800,
-                height=800,
-                crop='limit',
-                quality='auto'
-            )
+        if self.is_image():
+            return CloudinaryUploader.get_variant_url(self.variants, self.public_id, 'preview')
         return None
 
 
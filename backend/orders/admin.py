@@ -1,7 +1,7 @@
 # orders/admin.py
 
 from django.contrib import admin
-from .models import Order, OrderItem, OrderHistory
+from .models import Order, OrderItem, OrderHistory, PurchasedProduct, CustomerStats
 
 
 class OrderItemInline(admin.TabularInline):
@@ -52,3 +52,25 @@ class OrderAdmin(admin.ModelAdmin):
     list_filter = ['order_status', 'payment_status', 'created_at']
     search_fields = ['user__username', 'user__email', 'tracking_number']
     inlines = [OrderItemInline]
+
+
+@admin.register(PurchasedProduct)
+class PurchasedProductAdmin(admin.ModelAdmin):
+    list_display = ['user', 'product', 'first_delivered_at', 'first_order']
+    search_fields = ['user__email', 'product__name']
+    raw_id_fields = ['user', 'product', 'first_order']
+
+
+@admin.register(CustomerStats)
+class CustomerStatsAdmin(admin.ModelAdmin):
+    list_display = [
+        'user', 'order_count', 'paid_order_count', 'paid_total',
+        'average_order_value', 'last_order_at', 'country'
+    ]
+    list_filter = ['country']
+    search_fields = ['user__email']
+    ordering = ['-paid_total']
+    readonly_fields = [
+        'user', 'order_count', 'paid_order_count', 'paid_total', 'average_order_value',
+        'first_order_at', 'last_order_at', 'country', 'updated_at'
+    ]
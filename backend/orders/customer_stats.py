@@ -0,0 +1,199 @@
+# orders/customer_stats.py
+
+from django.db.models import (
+    F, Q, Count, Sum, Min, Max, Case, When, Value, Exists, OuterRef, Subquery,
+    DecimalField, DateTimeField
+)
+from django.db.models.functions import Coalesce, Greatest, Least, Round
+from django.utils import timezone
+from decimal import Decimal
+from users.models import User
+from .models import Order, CustomerStats
+
+
+class CustomerStatsLedger:
+    """
+        Keep CustomerStats rows in step with orders
+
+        Each order change is applied as a single UPDATE of F() deltas on the
+        customer's row, inside the order's own transaction, so concurrent
+        orders never lose a count. Order.save diffs against the order row
+        read under a lock, so a change saved twice from stale instances is
+        counted once. Deleted orders recompute the customer's row instead.
+        rebuild() repairs drift from queryset updates that bypass Order.save.
+
+        average_order_value is the paid total over all of the customer's
+        orders, rounded to the cent, as the admin has always reported it.
+    """
+    BATCH_SIZE = 1000
+    PAID = Q(payment_status=True) & ~Q(order_status='cancelled')
+    MONEY = DecimalField(max_digits=12, decimal_places=2)
+    CENT = Decimal('0.01')
+
+
+    @classmethod
+    def paid_amount(cls, payment_status, order_status, total_amount):
+        """ What an order adds to its customer's paid total (None if not paid) """
+        if payment_status and order_status != 'cancelled':
+            return total_amount
+        return None
+
+
+    @classmethod
+    def apply(cls, user_id, placed_at=None, added=None, removed=None):
+        """
+            Apply one order change to a customer's stats
+
+            Args:
+                user_id: Customer
+                placed_at: Creation time of a newly placed order (None if not new)
+                added: Amount now counted as paid (None if none)
+                removed: Amount no longer counted as paid (None if none)
+        """
+        if placed_at is None and added == removed:
+            return
+
+        paid_delta = (added is not None) - (removed is not None)
+        total_delta = (added or 0) - (removed or 0)
+        order_delta = 1 if placed_at is not None else 0
+
+        updates = {
+            'paid_order_count': F('paid_order_count') + paid_delta,
+            'paid_total': F('paid_total') + total_delta,
+            # Right-hand sides read the row's old values
+            'average_order_value': Case(
+                When(order_count=-order_delta, then=Value(Decimal('0'))),
+                default=Round((F('paid_total') + total_delta) / (F('order_count') + order_delta), 2),
+                output_field=cls.MONEY
+            ),
+            'country': Subquery(User.objects.filter(pk=user_id).order_by().values('country')[:1]),
+            'updated_at': timezone.now(),
+        }
+        if placed_at is not None:
+            placed = Value(placed_at, output_field=DateTimeField())
+            updates['order_count'] = F('order_count') + order_delta
+            updates['first_order_at'] = Least(Coalesce(F('first_order_at'), placed), placed)
+            updates['last_order_at'] = Greatest(Coalesce(F('last_order_at'), placed), placed)
+
+            # New orders create the row; a change to an existing order never
+            # does, since the row would then miss the customer's older orders
+            CustomerStats.objects.bulk_create(
+                [CustomerStats(user_id=user_id)], ignore_conflicts=True
+            )
+        CustomerStats.objects.filter(user_id=user_id).update(**updates)
+
+
+    @classmethod
+    def order_saved(cls, order, created):
+        """
+            Called from Order.save: count a new order or move its paid amount
+
+            Existing orders carry _counted, their STATS_FIELDS as stored
+            before the save (read under a lock).
+        """
+        current = tuple(getattr(order, field) for field in Order.STATS_FIELDS)
+        counted = None if created else getattr(order, '_counted', None)
+
+        if created:
+            cls.apply(order.user_id, placed_at=order.created_at, added=cls.paid_amount(*current[1:]))
+        elif counted is None or counted[0] != current[0]:
+            # No stored row to diff against, or moved to another customer
+            cls.rebuild({order.user_id, counted[0] if counted else order.user_id})
+        else:
+            cls.apply(
+                order.user_id,
+                added=cls.paid_amount(*current[1:]),
+                removed=cls.paid_amount(*counted[1:])
+            )
+
+        order._counted = current
+
+
+    @classmethod
+    def order_deleted(cls, order):
+        """ post_delete hook; first and last order dates need a recompute """
+        cls.rebuild([order.user_id])
+
+
+    @classmethod
+    def user_saved(cls, user, update_fields=None):
+        """ post_save hook for users: keep the denormalized country current """
+        if update_fields is not None and 'country' not in update_fields:
+            return
+        CustomerStats.objects.filter(user_id=user.pk).exclude(
+            country=user.country
+        ).update(country=user.country)
+
+
+    @classmethod
+    def rebuild(cls, user_ids=None):
+        """
+            Recompute stats from the Order table
+
+            Args:
+                user_ids: Customers to rebuild (None for all)
+
+            Returns:
+                int: Number of rows written
+        """
+        orders = Order.objects.all()
+        stale = CustomerStats.objects.all()
+        if user_ids is not None:
+            orders = orders.filter(user_id__in=user_ids)
+            stale = stale.filter(user_id__in=user_ids)
+
+        rows = orders.order_by().values('user_id').annotate(
+            order_count=Count('id'),
+            paid_order_count=Count('id', filter=cls.PAID),
+            paid_total=Coalesce(
+                Sum('total_amount', filter=cls.PAID), Value(Decimal('0')), output_field=cls.MONEY
+            ),
+            first_order_at=Min('created_at'),
+            last_order_at=Max('created_at'),
+            country=F('user__country')
+        )
+
+        now = timezone.now()
+        stats = [
+            CustomerStats(
+                average_order_value=(
+                    (row['paid_total'] / row['order_count']).quantize(cls.CENT)
+                    if row['order_count'] else Decimal('0')
+                ),
+                updated_at=now,
+                **row
+            )
+            for row in rows
+        ]
+
+        # Customers whose orders are all gone keep no row
+        stale.exclude(
+            Exists(Order.objects.filter(user_id=OuterRef('user_id')))
+        ).delete()
+        CustomerStats.objects.bulk_create(
+            stats,
+            batch_size=cls.BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=['user'],
+            update_fields=[
+                'order_count', 'paid_order_count', 'paid_total', 'average_order_value',
+                'first_order_at', 'last_order_at', 'country', 'updated_at'
+            ]
+        )
+        return len(stats)
+
+
+    @classmethod
+    def top_customers(cls, limit=10, country=None):
+        """
+            Customers with the highest paid totals
+
+            Served from the paid_total indexes (per country when given).
+
+            Returns:
+                CustomerStats queryset with users joined
+        """
+        stats = CustomerStats.objects.filter(paid_total__gt=0)
+        if country:
+            stats = stats.filter(country=country)
+        return stats.select_related('user').order_by('-paid_total')[:limit]
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from orders.purchases import PurchaseLedger
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the verified-purchase ledger from delivered orders'
+
+    def handle(self, *args, **options):
+        written = PurchaseLedger.backfill()
+        self.stdout.write(self.style.SUCCESS(f'Wrote {written} purchase ledger rows'))
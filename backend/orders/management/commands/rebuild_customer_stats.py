@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from orders.customer_stats import CustomerStatsLedger
+
+
+class Command(BaseCommand):
+    help = 'Recompute customer lifetime stats from orders'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user',
+            action='append',
+            type=int,
+            help='Only rebuild this user id (repeatable)'
+        )
+
+    def handle(self, *args, **options):
+        written = CustomerStatsLedger.rebuild(user_ids=options['user'])
+        self.stdout.write(self.style.SUCCESS(f'Wrote {written} customer stats rows'))
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.2 on 2026-10-19 14:16
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0006_purchase_ledger'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['user', 'order_status', 'delivered_at'], name='order_user_delivered_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.1.2 on 2026-10-19 14:30
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0007_order_delivered_index'),
+        ('users', '0010_alter_user_username'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CustomerStats',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='customer_stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('order_count', models.PositiveIntegerField(default=0)),
+                ('paid_order_count', models.PositiveIntegerField(default=0)),
+                ('paid_total', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('average_order_value', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('first_order_at', models.DateTimeField(blank=True, null=True)),
+                ('last_order_at', models.DateTimeField(blank=True, null=True)),
+                ('country', models.CharField(blank=True, max_length=100)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Customer stats',
+                'indexes': [models.Index(fields=['-paid_total'], name='customer_stats_value_idx'), models.Index(fields=['-last_order_at'], name='customer_stats_recent_idx'), models.Index(fields=['country', '-paid_total'], name='customer_stats_country_idx'), models.Index(fields=['-average_order_value'], name='customer_stats_aov_idx')],
+            },
+        ),
+    ]
@@ -1,6 +1,6 @@
 # orders/models.py
 
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 from django.conf import settings
 
@@ -34,6 +34,7 @@ class Order(models.Model):
         blank=True
     )
     cancelled_at = models.DateTimeField(null=True, blank=True)
+    delivered_at = models.DateTimeField(null=True, blank=True)
 
     user = models.ForeignKey('users.User', on_delete=models.CASCADE)
     total_amount = models.DecimalField(max_digits=10, decimal_places=2)
@@ -54,11 +55,57 @@ class Order(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Fields CustomerStats depends on
+    STATS_FIELDS = ('user_id', 'payment_status', 'order_status', 'total_amount')
+
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Return eligibility: a customer's recently delivered orders
+            models.Index(
+                fields=['user', 'order_status', 'delivered_at'],
+                name='order_user_delivered_idx'
+            ),
+        ]
     
     def __str__(self):
         return f"Order #{self.id}"
+
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Status as stored, to spot the transition to delivered
+        instance._loaded_status = instance.__dict__.get('order_status')
+        return instance
+
+
+    def save(self, *args, **kwargs):
+        from .purchases import PurchaseLedger
+        from .customer_stats import CustomerStatsLedger
+
+        created = self._state.adding
+        delivered = (
+            self.order_status == 'delivered'
+            and getattr(self, '_loaded_status', None) != 'delivered'
+        )
+        if delivered and not self.delivered_at:
+            self.delivered_at = timezone.now()
+
+        # The order, its purchase ledger entries and its customer's stats
+        # change together
+        with transaction.atomic():
+            if not created:
+                # Diff the stats against the row as stored now, under a lock,
+                # so concurrent saves from stale instances count a change once
+                self._counted = Order.objects.select_for_update().filter(
+                    pk=self.pk
+                ).values_list(*self.STATS_FIELDS).first()
+            super().save(*args, **kwargs)
+            if delivered:
+                PurchaseLedger.record_order(self)
+            CustomerStatsLedger.order_saved(self, created)
+        self._loaded_status = self.order_status
     
 
     def cancel_order(self, user):
@@ -120,6 +167,87 @@ class OrderItem(models.Model):
         return f"{self.quantity}x {self.product.name} in Order #{self.order.id}"
 
 
+    def save(self, *args, **kwargs):
+        from .purchases import PurchaseLedger
+
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            # Items added to an already delivered order
+            if self.order.order_status == 'delivered':
+                PurchaseLedger.record_order(self.order, product_ids=[self.product_id])
+
+
+class PurchasedProduct(models.Model):
+    """
+        Ledger of products each user has received
+
+        One row per (user, product), written when an order is delivered, so
+        verified-purchase checks are a unique index lookup instead of a
+        join through orders and order items.
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        related_name='purchased_products',
+        on_delete=models.CASCADE
+    )
+    product = models.ForeignKey('products.Product', on_delete=models.CASCADE)
+    first_order = models.ForeignKey(
+        Order,
+        null=True,
+        blank=True,
+        related_name='+',
+        on_delete=models.SET_NULL
+    )
+    first_delivered_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'product'], name='unique_purchased_product')
+        ]
+
+
+    def __str__(self):
+        return f"{self.user} received {self.product} on {self.first_delivered_at:%Y-%m-%d}"
+
+
+class CustomerStats(models.Model):
+    """
+        Lifetime order totals per customer
+
+        Kept current by Order.save (see orders/customer_stats.py), so
+        rankings and segments are index scans here instead of aggregates
+        over every order. Paid figures count orders that are paid and not
+        cancelled.
+    """
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        primary_key=True,
+        related_name='customer_stats',
+        on_delete=models.CASCADE
+    )
+    order_count = models.PositiveIntegerField(default=0)
+    paid_order_count = models.PositiveIntegerField(default=0)
+    paid_total = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    average_order_value = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    first_order_at = models.DateTimeField(null=True, blank=True)
+    last_order_at = models.DateTimeField(null=True, blank=True)
+    country = models.CharField(max_length=100, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = 'Customer stats'
+        indexes = [
+            models.Index(fields=['-paid_total'], name='customer_stats_value_idx'),
+            models.Index(fields=['-last_order_at'], name='customer_stats_recent_idx'),
+            models.Index(fields=['country', '-paid_total'], name='customer_stats_country_idx'),
+            models.Index(fields=['-average_order_value'], name='customer_stats_aov_idx'),
+        ]
+
+
+    def __str__(self):
+        return f"{self.user}: {self.order_count} orders, {self.paid_total} paid"
+
+
 class OrderHistory(models.Model):
     order = models.ForeignKey(
         'Order',
@@ -1,9 +1,14 @@
 # orders/serializers.py
 
+from django.db import transaction
 from rest_framework import serializers
 from .models import Order, OrderItem
 from products.serializers import ProductListSerializer
 from products.models import Product
+from products.flash_sales import FlashSaleInventory, FlashSaleClaimError
+from products.pricing import PriceEngine
+from shipping.quotes import ShippingQuoteEngine
+from decimal import Decimal
 
 
 class OrderItemSerializer(serializers.ModelSerializer):
@@ -47,7 +52,17 @@ class CreateOrderSerializer(serializers.ModelSerializer):
     def validate_items(self, value):
         if not value:
             raise serializers.ValidationError("No items provided")
-        
+
+        # One line per product: order items are unique per product and a
+        # flash sale claim has to cover the combined quantity
+        quantities = {}
+        for item in value:
+            quantities[item['product_id']] = quantities.get(item['product_id'], 0) + item['quantity']
+        value = [
+            {'product_id': product_id, 'quantity': quantity}
+            for product_id, quantity in quantities.items()
+        ]
+
         # Validate each item
         for item in value:
             try:
@@ -69,36 +84,94 @@ class CreateOrderSerializer(serializers.ModelSerializer):
     
     def create(self, validated_data):
         items_data = validated_data.pop('items')
-        shipping_fee = self.context.get('shipping_fee', 0)
-        
-        # Create order with zero total amount initially
-        order = Order.objects.create(
-            user=self.context['request'].user,
-            total_amount=0,
-            shipping_fee=shipping_fee,
-            **validated_data
+        user = self.context['request'].user
+
+        # Claim flash sale units before touching the order tables so a sold
+        # out product is rejected without waiting on any row lock
+        sale_products = FlashSaleInventory.active_sale_products(
+            [item['product_id'] for item in items_data]
         )
+        claims = {}
+        try:
+            for item_data in items_data:
+                sale_product = sale_products.get(item_data['product_id'])
+                if sale_product:
+                    claims[item_data['product_id']] = FlashSaleInventory.claim(
+                        sale_product, user.id, item_data['quantity']
+                    )
+        except FlashSaleClaimError as e:
+            self._release_claims(claims.values())
+            raise serializers.ValidationError({'items': [e.message], 'code': e.code})
+
+        try:
+            with transaction.atomic():
+                # Create order with zero total amount initially
+                order = Order.objects.create(
+                    user=user,
+                    total_amount=0,
+                    shipping_fee=0,
+                    **validated_data
+                )
 
-        total_amount = 0
-        # Create order items and calculate total
-        for item_data in items_data:
-            product_id = item_data['product_id']
-            quantity = item_data['quantity']
-
-            # Get current product price
-            product = Product.objects.get(id=product_id)
-            price = product.discount_price or product.price
-
-            OrderItem.objects.create(
-                order=order,
-                product=product,
-                quantity=quantity,
-                price=price
-            )
-            total_amount += price * quantity
-
-        # Update order total
-        order.total_amount = total_amount + shipping_fee
-        order.save()
-
-        return order
\ No newline at end of file
+                product_ids = [item['product_id'] for item in items_data]
+                products = Product.objects.in_bulk(product_ids)
+                prices = PriceEngine.effective_prices(product_ids)
+
+                total_amount = 0
+                quantity_total = 0
+                weight_total = Decimal('0')
+                # Create order items and calculate total
+                for item_data in items_data:
+                    product_id = item_data['product_id']
+                    quantity = item_data['quantity']
+
+                    # Flash sale price if claimed, else the effective price
+                    product = products[product_id]
+                    if product_id in claims:
+                        price = claims[product_id].price
+                    else:
+                        price = prices.get(product_id, product.discount_price or product.price)
+
+                    OrderItem.objects.create(
+                        order=order,
+                        product=product,
+                        quantity=quantity,
+                        price=price
+                    )
+                    total_amount += price * quantity
+                    quantity_total += quantity
+                    weight_total += product.weight * quantity
+
+                # Update order total
+                shipping_fee = self._shipping_fee(total_amount, quantity_total, weight_total)
+                order.shipping_fee = shipping_fee
+                order.total_amount = total_amount + shipping_fee
+                order.save()
+
+                FlashSaleInventory.record(list(claims.values()), order.id)
+        except Exception:
+            self._release_claims(claims.values())
+            raise
+
+        return order
+
+
+    def _release_claims(self, claims):
+        for claim in claims:
+            FlashSaleInventory.release(claim)
+
+
+    def _shipping_fee(self, subtotal, quantity, weight):
+        """ Fee from the context, or quoted for the order's destination """
+        if 'shipping_fee' in self.context:
+            return self.context['shipping_fee']
+        if 'shipping_currency' not in self.context:
+            return 0
+
+        return ShippingQuoteEngine.quote(
+            self.context['shipping_currency'],
+            subtotal=subtotal,
+            quantity=quantity,
+            weight=weight,
+            country=self.context.get('shipping_country')
+        ).fee
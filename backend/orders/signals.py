@@ -0,0 +1,20 @@
+# orders/signals.py
+
+from django.conf import settings
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Order
+from .customer_stats import CustomerStatsLedger
+
+
+@receiver(post_delete, sender=Order)
+def uncount_order(sender, instance, **kwargs):
+    """ Recompute the customer's stats without the deleted order """
+    CustomerStatsLedger.order_deleted(instance)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def sync_customer_country(sender, instance, created, update_fields=None, **kwargs):
+    """ Carry a customer's country over to their stats row """
+    if not created:
+        CustomerStatsLedger.user_saved(instance, update_fields)
@@ -0,0 +1,171 @@
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APIClient
+from decimal import Decimal
+from io import StringIO
+from orders.models import Order, CustomerStats
+from orders.customer_stats import CustomerStatsLedger
+from users.models import User
+
+
+class CustomerStatsLedgerTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='buyer@example.com', username='buyer', first_name='Ada',
+            last_name='Buyer', password='buyerpass123', country='Nigeria'
+        )
+
+
+    def order(self, amount, paid=False, user=None):
+        return Order.objects.create(
+            user=user or self.user, total_amount=Decimal(amount),
+            shipping_address='Lagos', payment_status=paid
+        )
+
+
+    def stats(self, user=None):
+        return CustomerStats.objects.get(user=user or self.user)
+
+
+    def assertMatchesRebuild(self):
+        fields = [
+            'order_count', 'paid_order_count', 'paid_total', 'average_order_value',
+            'first_order_at', 'last_order_at', 'country'
+        ]
+        incremental = list(CustomerStats.objects.order_by('user').values(*fields))
+        CustomerStatsLedger.rebuild()
+        self.assertEqual(list(CustomerStats.objects.order_by('user').values(*fields)), incremental)
+
+
+    def test_orders_update_stats_incrementally(self):
+        first = self.order('100.00', paid=True)
+        second = self.order('50.00')
+        stats = self.stats()
+        self.assertEqual((stats.order_count, stats.paid_order_count), (2, 1))
+        # Paid total over all orders, as the admin has always shown it
+        self.assertEqual((stats.paid_total, stats.average_order_value), (Decimal('100.00'), Decimal('50.00')))
+        self.assertEqual((stats.first_order_at, stats.last_order_at), (first.created_at, second.created_at))
+        self.assertEqual(stats.country, 'Nigeria')
+
+        # Payment arrives on a loaded order
+        second = Order.objects.get(pk=second.pk)
+        second.payment_status = True
+        second.save()
+        stats = self.stats()
+        self.assertEqual((stats.paid_total, stats.average_order_value), (Decimal('150.00'), Decimal('75.00')))
+
+        # Cancelling a paid order takes it out of the paid figures
+        first = Order.objects.get(pk=first.pk)
+        first.cancel_order(self.user)
+        stats = self.stats()
+        self.assertEqual((stats.order_count, stats.paid_order_count), (2, 1))
+        self.assertEqual((stats.paid_total, stats.average_order_value), (Decimal('50.00'), Decimal('25.00')))
+        self.assertMatchesRebuild()
+
+
+    def test_average_is_rounded_like_a_rebuild(self):
+        self.order('100.01', paid=True)
+        self.order('0.00')
+        self.order('0.00')
+        self.assertEqual(self.stats().average_order_value, Decimal('33.34'))
+        self.assertMatchesRebuild()
+
+
+    def test_stale_instances_count_a_payment_once(self):
+        order = self.order('80.00')
+        # A redelivered payment webhook handled twice from the same snapshot
+        first = Order.objects.get(pk=order.pk)
+        second = Order.objects.get(pk=order.pk)
+        for instance in (first, second):
+            instance.payment_status = True
+            instance.save()
+
+        stats = self.stats()
+        self.assertEqual((stats.paid_order_count, stats.paid_total), (1, Decimal('80.00')))
+        self.assertMatchesRebuild()
+
+
+    def test_status_saves_use_one_update(self):
+        order = Order.objects.get(pk=self.order('80.00').pk)
+        order.payment_status = True
+        with CaptureQueriesContext(connection) as queries:
+            order.save()
+
+        stats_queries = [
+            query['sql'] for query in queries.captured_queries
+            if 'orders_customerstats' in query['sql']
+        ]
+        self.assertEqual(len(stats_queries), 1)
+        self.assertTrue(stats_queries[0].startswith('UPDATE'))
+
+
+    def test_deletes_and_country_changes(self):
+        first = self.order('100.00', paid=True)
+        self.order('40.00', paid=True)
+
+        first.delete()
+        stats = self.stats()
+        self.assertEqual((stats.order_count, stats.paid_total), (1, Decimal('40.00')))
+        self.assertNotEqual(stats.first_order_at, first.created_at)
+
+        self.user.country = 'Ghana'
+        self.user.save()
+        self.assertEqual(self.stats().country, 'Ghana')
+
+        Order.objects.filter(user=self.user).delete()
+        self.assertFalse(CustomerStats.objects.exists())
+
+
+    def test_rebuild_command_repairs_drift(self):
+        self.order('100.00', paid=True)
+        # Queryset updates bypass Order.save
+        Order.objects.update(payment_status=False)
+        self.assertEqual(self.stats().paid_total, Decimal('100.00'))
+
+        out = StringIO()
+        call_command('rebuild_customer_stats', '--user', str(self.user.pk), stdout=out)
+        self.assertIn('Wrote 1 customer stats rows', out.getvalue())
+        self.assertEqual(self.stats().paid_total, Decimal('0.00'))
+
+
+    def test_rankings_and_segments_read_the_rollup(self):
+        other = User.objects.create_user(
+            email='other@example.com', username='other', first_name='Bola',
+            last_name='Buyer', password='buyerpass123', country='Ghana'
+        )
+        self.order('100.00', paid=True)
+        self.order('300.00', paid=True, user=other)
+        self.order('20.00', paid=False, user=other)
+
+        self.assertEqual(
+            [stats.user_id for stats in CustomerStatsLedger.top_customers()], [other.id, self.user.id]
+        )
+        self.assertEqual(
+            [stats.user_id for stats in CustomerStatsLedger.top_customers(country='Nigeria')],
+            [self.user.id]
+        )
+
+        admin = User.objects.create_user(
+            email='admin@example.com', username='admin', first_name='Ife',
+            last_name='Admin', password='adminpass123', is_staff=True
+        )
+        client = APIClient()
+        client.force_authenticate(user=admin)
+
+        response = client.get(reverse('admin-users-list'), {'min_spent': '200', 'country': 'Ghana'})
+        self.assertEqual([row['id'] for row in response.data['results']], [other.id])
+        row = response.data['results'][0]
+        self.assertEqual((row['total_orders'], Decimal(row['total_spent'])), (2, Decimal('300.00')))
+
+        response = client.get(reverse('admin-users-purchase-history', args=[other.id]))
+        self.assertEqual(
+            (response.data['total_orders'], response.data['total_spent']), (2, Decimal('300.00'))
+        )
+
+        response = client.get(reverse('admin-analytics-customer-analytics'))
+        self.assertEqual(
+            [row['id'] for row in response.data['top_customers']], [other.id, self.user.id]
+        )
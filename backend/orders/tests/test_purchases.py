@@ -0,0 +1,108 @@
+from django.test import TestCase
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APIClient
+from decimal import Decimal
+from io import StringIO
+from orders.models import Order, OrderItem, PurchasedProduct
+from orders.purchases import PurchaseLedger
+from products.models import Category, Product
+from reviews.models import Review
+from users.models import User
+
+
+class PurchaseLedgerTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='buyer@example.com', username='buyer', first_name='Ada',
+            last_name='Buyer', password='buyerpass123'
+        )
+        category = Category.objects.create(name='Closures')
+        self.product = Product.objects.create(
+            name='Lace Closure 14', category=category, description='Closure',
+            price=Decimal('80.00'), stock=10
+        )
+        self.other = Product.objects.create(
+            name='Lace Closure 16', category=category, description='Closure',
+            price=Decimal('90.00'), stock=10
+        )
+        self.order = Order.objects.create(
+            user=self.user, total_amount=Decimal('80.00'), shipping_address='Lagos'
+        )
+        OrderItem.objects.create(
+            order=self.order, product=self.product, quantity=1, price=Decimal('80.00')
+        )
+
+
+    def deliver(self, order):
+        order = Order.objects.get(pk=order.pk)
+        order.order_status = 'delivered'
+        order.save()
+        return order
+
+
+    def test_delivery_records_products_and_verifies_reviews(self):
+        review = Review.objects.create(
+            user=self.user, product=self.product, rating=4, comment='Early review'
+        )
+        self.assertFalse(review.verified_purchase)
+        self.assertFalse(PurchaseLedger.has_purchased(self.user, self.product.id))
+
+        order = self.deliver(self.order)
+        self.assertIsNotNone(order.delivered_at)
+
+        entry = PurchasedProduct.objects.get(user=self.user, product=self.product)
+        self.assertEqual(entry.first_delivered_at, order.delivered_at)
+        review.refresh_from_db()
+        self.assertTrue(review.verified_purchase)
+
+        # Saving the delivered order again does not move the first delivery
+        order.tracking_number = 'TRK-1'
+        order.save()
+        self.assertEqual(
+            PurchasedProduct.objects.get(pk=entry.pk).first_delivered_at, entry.first_delivered_at
+        )
+
+
+    def test_new_review_is_verified_with_one_lookup(self):
+        self.deliver(self.order)
+        with self.assertNumQueries(1):
+            self.assertTrue(PurchaseLedger.has_purchased(self.user, self.product.id))
+
+        review = Review.objects.create(
+            user=self.user, product=self.product, rating=5, comment='Lovely'
+        )
+        self.assertTrue(review.verified_purchase)
+        self.assertEqual(
+            PurchaseLedger.purchased(self.user, [self.product.id, self.other.id]),
+            {self.product.id}
+        )
+
+
+    def test_backfill_rebuilds_from_delivered_orders(self):
+        Order.objects.filter(pk=self.order.pk).update(order_status='delivered')
+        self.assertFalse(PurchasedProduct.objects.exists())
+
+        out = StringIO()
+        call_command('backfill_purchase_ledger', stdout=out)
+        self.assertIn('Wrote 1 purchase ledger rows', out.getvalue())
+
+        order = Order.objects.get(pk=self.order.pk)
+        entry = PurchasedProduct.objects.get(user=self.user, product=self.product)
+        self.assertEqual(entry.first_delivered_at, order.delivered_at)
+        self.assertEqual(entry.first_order_id, order.id)
+
+
+    def test_purchased_badges_endpoint(self):
+        self.deliver(self.order)
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+
+        response = client.get(
+            reverse('order-purchased'),
+            {'product_ids': f'{self.product.id},{self.other.id}'}
+        )
+        self.assertEqual(response.data, {'product_ids': [self.product.id]})
+
+        response = client.get(reverse('order-purchased'), {'product_ids': 'a,b'})
+        self.assertEqual(response.status_code, 400)
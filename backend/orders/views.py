@@ -7,13 +7,14 @@ from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from django_filters.rest_framework import DjangoFilterBackend
 from .models import Order
 from cart.models import Cart
-from shipping.models import ShippingRate
 from .serializers import (
     OrderDetailSerializer,
     OrderListSerializer,
     CreateOrderSerializer
 )
 from .utils import send_order_status_email
+from .purchases import PurchaseLedger
+from utils.query_params import product_ids_param
 
 
 class OrderViewSet(viewsets.ModelViewSet):
@@ -56,17 +57,12 @@ class OrderViewSet(viewsets.ModelViewSet):
         # Calculate shipping fee
         cart = Cart.objects.get(user=request.user)
 
-        try:
-            shipping_rate = ShippingRate.objects.get(
-                currency_code=currency_code,
-                is_active=True
-            )
-            shipping_fee = shipping_rate.flat_rate
-        except ShippingRate.DoesNotExist:
-            shipping_fee = 0
-        
-        # Include shipping fee in the context for use in serializer's create method
-        serializer.context['shipping_fee'] = shipping_fee
+        # Shipping is quoted in the serializer's create method once the
+        # order's items, total and weight are known
+        serializer.context['shipping_currency'] = currency_code
+        serializer.context['shipping_country'] = (
+            request.data.get('country') or request.user.country
+        )
 
         order = serializer.save()
 
@@ -119,6 +115,16 @@ class OrderViewSet(viewsets.ModelViewSet):
 
         return Response(OrderDetailSerializer(order).data)
     
+    @action(detail=False)
+    def purchased(self, request):
+        """
+            Which of the given products the user has received, for
+            "you bought this" badges: ?product_ids=1,2,3
+        """
+        purchased = PurchaseLedger.purchased(request.user, product_ids_param(request))
+        return Response({'product_ids': sorted(purchased)})
+
+
     @action(detail=True, methods=['post'])
     def cancel(self, request, pk=None):
         order = self.get_object()
@@ -0,0 +1,226 @@
+# products/autocomplete.py
+
+from django.core.cache import cache
+from django.db.models import Prefetch
+import threading
+import heapq
+import time
+import re
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ProductAutocomplete:
+    """
+        Per-process prefix index of available product names
+
+        Every word of a product name is indexed by all of its prefixes, so a
+        lookup is a few dict reads and a set intersection with no database
+        access. Changes are applied incrementally: the worker handling a
+        product change updates its own index and records the product id
+        under a new version in the cache; other workers replay those
+        changes the next time they check the version.
+    """
+    VERSION_KEY = 'product_autocomplete_version'
+    CHANGE_KEY = 'product_autocomplete_change_{}'
+    CHANGE_TIMEOUT = 60 * 60
+    MAX_REPLAY = 200  # Rebuild instead of replaying longer change logs
+    CHECK_INTERVAL = 1.0  # Seconds between version checks
+    MAX_PREFIX_LENGTH = 20
+    RESULT_LIMIT = 10
+
+    _lock = threading.RLock()
+    _entries = {}  # product id -> suggestion payload
+    _prefixes = {}  # prefix -> set of product ids
+    _version = None
+    _checked_at = 0.0
+    _token_pattern = re.compile(r'\w+')
+
+
+    @classmethod
+    def _tokens(cls, text):
+        return cls._token_pattern.findall(text.lower())
+
+
+    @classmethod
+    def _load(cls, product_ids=None):
+        """ Fetch suggestion payloads for available products """
+        from .models import Product, ProductImage
+        from .serializers import ProductImageSerializer
+
+        queryset = Product.objects.filter(is_available=True).only(
+            'id', 'name', 'slug', 'created_at'
+        ).prefetch_related(
+            Prefetch(
+                'images',
+                queryset=ProductImage.objects.filter(is_primary=True),
+                to_attr='primary_images'
+            )
+        )
+        if product_ids is not None:
+            queryset = queryset.filter(id__in=product_ids)
+
+        return {
+            product.id: {
+                'id': product.id,
+                'name': product.name,
+                'slug': product.slug,
+                'primary_image': (
+                    dict(ProductImageSerializer(product.primary_images[0]).data)
+                    if product.primary_images else None
+                ),
+                'created_at': product.created_at,
+            }
+            for product in queryset
+        }
+
+
+    @classmethod
+    def _index(cls, entry):
+        for token in cls._tokens(entry['name']):
+            for length in range(1, min(len(token), cls.MAX_PREFIX_LENGTH) + 1):
+                cls._prefixes.setdefault(token[:length], set()).add(entry['id'])
+
+
+    @classmethod
+    def _unindex(cls, product_id):
+        entry = cls._entries.pop(product_id, None)
+        if not entry:
+            return
+        for token in cls._tokens(entry['name']):
+            for length in range(1, min(len(token), cls.MAX_PREFIX_LENGTH) + 1):
+                ids = cls._prefixes.get(token[:length])
+                if ids:
+                    ids.discard(product_id)
+                    if not ids:
+                        del cls._prefixes[token[:length]]
+
+
+    @classmethod
+    def _apply(cls, product_ids):
+        """ Re-read the given products and update the local index """
+        fresh = cls._load(product_ids)
+        for product_id in product_ids:
+            cls._unindex(product_id)
+            if product_id in fresh:
+                cls._entries[product_id] = fresh[product_id]
+                cls._index(fresh[product_id])
+
+
+    @classmethod
+    def rebuild(cls):
+        """ Rebuild the whole index from the database """
+        with cls._lock:
+            version = cache.get(cls.VERSION_KEY)
+            if version is None:
+                cache.add(cls.VERSION_KEY, 0, None)
+                version = cache.get(cls.VERSION_KEY, 0)
+
+            cls._entries = {}
+            cls._prefixes = {}
+            for entry in cls._load().values():
+                cls._entries[entry['id']] = entry
+                cls._index(entry)
+
+            cls._version = version
+            cls._checked_at = time.monotonic()
+
+
+    @classmethod
+    def _sync(cls):
+        """ Bring the local index up to the shared version """
+        now = time.monotonic()
+        if cls._version is not None and now - cls._checked_at < cls.CHECK_INTERVAL:
+            return
+
+        with cls._lock:
+            current = cache.get(cls.VERSION_KEY)
+            if cls._version is None or current is None or current < cls._version:
+                cls.rebuild()
+                return
+
+            if current > cls._version:
+                pending = range(cls._version + 1, current + 1)
+                if len(pending) > cls.MAX_REPLAY:
+                    cls.rebuild()
+                    return
+
+                changes = cache.get_many([cls.CHANGE_KEY.format(v) for v in pending])
+                if len(changes) != len(pending):
+                    # Part of the change log expired
+                    cls.rebuild()
+                    return
+                cls._apply(set(changes.values()))
+                cls._version = current
+
+            cls._checked_at = now
+
+
+    @classmethod
+    def product_changed(cls, product_id):
+        """ Record a product change and update this worker's index """
+        with cls._lock:
+            try:
+                version = cache.incr(cls.VERSION_KEY)
+            except ValueError:
+                # No shared version yet; the next lookup rebuilds everywhere
+                cache.add(cls.VERSION_KEY, 0, None)
+                cls._version = None
+                return
+
+            cache.set(cls.CHANGE_KEY.format(version), product_id, cls.CHANGE_TIMEOUT)
+
+            if cls._version is not None and version == cls._version + 1:
+                cls._apply({product_id})
+                cls._version = version
+            else:
+                # Missed other workers' changes; replay them on the next lookup
+                cls._checked_at = 0.0
+
+
+    @classmethod
+    def suggest(cls, query, limit=None):
+        """
+            Suggest products whose name words start with the query words
+
+            Args:
+                query: Text typed by the customer
+                limit: Maximum number of suggestions
+
+            Returns:
+                List of dicts with id, name, slug, primary_image and type
+                ('exact' when the name contains the whole query)
+        """
+        cls._sync()
+
+        tokens = cls._tokens(query)
+        if not tokens:
+            return []
+
+        query = query.strip().lower()
+        with cls._lock:
+            candidates = None
+            for token in tokens:
+                ids = cls._prefixes.get(token[:cls.MAX_PREFIX_LENGTH], set())
+                candidates = ids.copy() if candidates is None else candidates & ids
+                if not candidates:
+                    return []
+
+            entries = [cls._entries[product_id] for product_id in candidates]
+
+        def sort_key(entry):
+            name = entry['name'].lower()
+            return (not name.startswith(query), query not in name, -entry['created_at'].timestamp())
+
+        results = []
+        for entry in heapq.nsmallest(limit or cls.RESULT_LIMIT, entries, key=sort_key):
+            results.append({
+                'id': entry['id'],
+                'name': entry['name'],
+                'slug': entry['slug'],
+                'primary_image': entry['primary_image'],
+                'type': 'exact' if query in entry['name'].lower() else 'suggestion',
+            })
+
+        return results
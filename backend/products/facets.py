@@ -0,0 +1,151 @@
+# products/facets.py
+
+from django.db.models import Case, When, Value, CharField, Count
+from currencies.utils import CurrencyConverter
+from decimal import Decimal
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ProductFacets:
+    """
+        Facet counts for a filtered product queryset
+
+        Category, hair type, length bucket and price band are computed
+        together in a single GROUP BY query and folded in Python.
+    """
+    # (key, min inches, max inches) - bounds are inclusive, None is open
+    LENGTH_BUCKETS = [
+        ('up_to_12', None, 12),
+        ('13_18', 13, 18),
+        ('19_24', 19, 24),
+        ('25_30', 25, 30),
+        ('over_30', 31, None),
+    ]
+
+    # (key, min USD, max USD) - max is exclusive, None is open
+    PRICE_BANDS = [
+        ('under_50', None, Decimal('50')),
+        ('50_100', Decimal('50'), Decimal('100')),
+        ('100_200', Decimal('100'), Decimal('200')),
+        ('200_500', Decimal('200'), Decimal('500')),
+        ('500_plus', Decimal('500'), None),
+    ]
+
+
+    @classmethod
+    def _length_bucket(cls):
+        whens = []
+        for key, low, high in cls.LENGTH_BUCKETS:
+            conditions = {}
+            if low is not None:
+                conditions['length__gte'] = low
+            if high is not None:
+                conditions['length__lte'] = high
+            whens.append(When(then=Value(key), **conditions))
+        return Case(*whens, default=Value(None), output_field=CharField())
+
+
+    @classmethod
+    def _price_band(cls):
+        whens = []
+        for key, low, high in cls.PRICE_BANDS:
+            conditions = {}
+            if low is not None:
+                conditions['price__gte'] = low
+            if high is not None:
+                conditions['price__lt'] = high
+            whens.append(When(then=Value(key), **conditions))
+        return Case(*whens, default=Value(None), output_field=CharField())
+
+
+    @classmethod
+    def _convert(cls, amount, currency):
+        if amount is None or currency == CurrencyConverter.BASE_CURRENCY:
+            return amount
+        try:
+            return CurrencyConverter.convert_price(
+                amount=amount,
+                from_currency=CurrencyConverter.BASE_CURRENCY,
+                to_currency=currency
+            )
+        except ValueError as e:
+            logger.error(f"Facet price conversion failed: {str(e)}")
+            return amount
+
+
+    @classmethod
+    def compute(cls, queryset, currency='USD'):
+        """
+            Count products per facet value
+
+            Args:
+                queryset: Already filtered product queryset
+                currency: Currency used to express price band bounds
+
+            Returns:
+                Dict with total and per-facet lists of counts
+        """
+        from .models import Product
+
+        rows = queryset.order_by().annotate(
+            length_bucket=cls._length_bucket(),
+            price_band=cls._price_band()
+        ).values(
+            'category__slug',
+            'category__name',
+            'hair_type',
+            'length_bucket',
+            'price_band'
+        ).annotate(count=Count('id'))
+
+        total = 0
+        categories = {}
+        hair_types = {}
+        lengths = {}
+        price_bands = {}
+
+        for row in rows:
+            count = row['count']
+            total += count
+
+            category = categories.setdefault(row['category__slug'], {
+                'slug': row['category__slug'],
+                'name': row['category__name'],
+                'count': 0
+            })
+            category['count'] += count
+
+            if row['hair_type']:
+                hair_types[row['hair_type']] = hair_types.get(row['hair_type'], 0) + count
+            if row['length_bucket']:
+                lengths[row['length_bucket']] = lengths.get(row['length_bucket'], 0) + count
+            if row['price_band']:
+                price_bands[row['price_band']] = price_bands.get(row['price_band'], 0) + count
+
+        if currency not in CurrencyConverter.get_active_currencies():
+            currency = CurrencyConverter.BASE_CURRENCY
+
+        return {
+            'total': total,
+            'categories': sorted(categories.values(), key=lambda c: c['name']),
+            'hair_types': [
+                {'value': value, 'label': label, 'count': hair_types.get(value, 0)}
+                for value, label in Product.HAIR_TYPE_CHOICES
+            ],
+            'lengths': [
+                {'key': key, 'min': low, 'max': high, 'count': lengths.get(key, 0)}
+                for key, low, high in cls.LENGTH_BUCKETS
+            ],
+            'price_bands': [
+                {
+                    'key': key,
+                    'min': cls._convert(low, currency),
+                    'max': cls._convert(high, currency),
+                    'currency': currency,
+                    'count': price_bands.get(key, 0)
+                }
+                for key, low, high in cls.PRICE_BANDS
+            ],
+        }
@@ -0,0 +1,670 @@
+# products/flash_sales.py
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Q, Sum, Min
+from django.utils import timezone
+from django_redis import get_redis_connection
+from channels.layers import get_channel_layer
+from asgiref.sync import async_to_sync
+from utils.cache import invalidate_product_cache
+from .pricing import PriceEngine
+from datetime import timedelta
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Optional, Dict, List
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class FlashSaleClaimError(Exception):
+    """Raised when flash sale units cannot be claimed"""
+
+    def __init__(self, message: str = None, code: str = None, remaining: int = 0):
+        self.message = message or "Flash sale units could not be claimed"
+        self.code = code or "claim_error"
+        self.remaining = remaining
+        super().__init__(self.message)
+
+
+@dataclass
+class FlashSaleClaim:
+    flash_sale_id: int
+    product_id: int
+    user_id: int
+    quantity: int
+    price: Decimal
+    remaining: int  # Units left for the product, -1 when unlimited
+
+
+class FlashSaleInventory:
+    """
+        Flash sale quotas held in Redis
+
+        When a sale starts, each product's remaining quota, the sale-wide
+        limit and the per-customer limit are loaded into Redis. Checkout
+        claims units with a Lua script that checks and decrements all of them
+        atomically, so buyers never queue on a database row and a sold out
+        product is rejected without touching the database. Claimed purchases
+        are pushed onto a queue and written back to FlashSalePurchase and
+        FlashSaleProduct.quantity_sold in batches by `flush_purchases`.
+
+        Without a Redis cache backend claims fall back to conditional
+        database updates, which are correct but serialize on the row.
+    """
+    KEY_PREFIX = 'flash_sale:{{{}}}'  # Hash tag keeps a sale's keys in one slot
+    QUEUE_KEY = 'flash_sale:purchase_queue'
+    UNLIMITED = -1
+    KEY_GRACE_PERIOD = 60 * 60 * 24  # Keep keys a day past the sale end
+    WRITE_BACK_BATCH_SIZE = 500
+
+    # KEYS: stock, meta, claimed  ARGV: product id, quantity, ttl
+    CLAIM_SCRIPT = """
+        local remaining = redis.call('HGET', KEYS[1], ARGV[1])
+        if not remaining then
+            return {0, 0}
+        end
+        remaining = tonumber(remaining)
+        local quantity = tonumber(ARGV[2])
+        if remaining ~= -1 and remaining < quantity then
+            return {-1, remaining}
+        end
+
+        local total = redis.call('HGET', KEYS[2], 'total')
+        if total and tonumber(total) < quantity then
+            return {-1, tonumber(total)}
+        end
+
+        local limit = tonumber(redis.call('HGET', KEYS[2], 'per_customer') or '0')
+        local claimed = tonumber(redis.call('HGET', KEYS[3], ARGV[1]) or '0')
+        if limit > 0 and claimed + quantity > limit then
+            return {-2, limit - claimed}
+        end
+
+        if remaining ~= -1 then
+            remaining = redis.call('HINCRBY', KEYS[1], ARGV[1], -quantity)
+        end
+        if total then
+            redis.call('HINCRBY', KEYS[2], 'total', -quantity)
+        end
+        redis.call('HINCRBY', KEYS[3], ARGV[1], quantity)
+        redis.call('EXPIRE', KEYS[3], ARGV[3])
+        return {1, remaining}
+    """
+
+    # KEYS: stock, meta, claimed  ARGV: product id, quantity
+    RELEASE_SCRIPT = """
+        local remaining = redis.call('HGET', KEYS[1], ARGV[1])
+        if not remaining then
+            return 0
+        end
+        local quantity = tonumber(ARGV[2])
+        if tonumber(remaining) ~= -1 then
+            redis.call('HINCRBY', KEYS[1], ARGV[1], quantity)
+        end
+        if redis.call('HEXISTS', KEYS[2], 'total') == 1 then
+            redis.call('HINCRBY', KEYS[2], 'total', quantity)
+        end
+        if redis.call('HINCRBY', KEYS[3], ARGV[1], -quantity) <= 0 then
+            redis.call('HDEL', KEYS[3], ARGV[1])
+        end
+        return 1
+    """
+
+
+    @classmethod
+    def get_client(cls):
+        """ Raw Redis client, or None when the cache is not Redis backed """
+        try:
+            return get_redis_connection('default')
+        except NotImplementedError:
+            return None
+
+
+    @classmethod
+    def _key(cls, flash_sale_id, name):
+        return f"{cls.KEY_PREFIX.format(flash_sale_id)}:{name}"
+
+
+    @classmethod
+    def _keys(cls, flash_sale_id, user_id):
+        return [
+            cls._key(flash_sale_id, 'stock'),
+            cls._key(flash_sale_id, 'meta'),
+            cls._key(flash_sale_id, f'claimed:{user_id}'),
+        ]
+
+
+    @classmethod
+    def _ttl(cls, flash_sale):
+        seconds = int((flash_sale.end_time - timezone.now()).total_seconds())
+        return max(seconds, 0) + cls.KEY_GRACE_PERIOD
+
+
+    @classmethod
+    def _pending(cls, flash_sale_id, client):
+        """ Units claimed but not yet written back, per (user, product) """
+        pending = {}
+        for raw in client.lrange(cls.QUEUE_KEY, 0, -1):
+            entry = json.loads(raw)
+            if entry['flash_sale'] == flash_sale_id:
+                key = (entry['user'], entry['product'])
+                pending[key] = pending.get(key, 0) + entry['quantity']
+        return pending
+
+
+    @classmethod
+    def load(cls, flash_sale, client=None, replace=True):
+        """
+            Load a sale's quotas, prices and customer limits into Redis
+
+            Remaining quotas are derived from quantity_sold and purchases
+            still waiting in the write-back queue, so reloading an active
+            sale (e.g. after a Redis restart) resumes where it left off.
+
+            Args:
+                flash_sale: FlashSale to load
+                replace: Overwrite counters already in Redis. When False only
+                    missing counters are filled in, so concurrent lazy loads
+                    cannot reset units that were claimed in between.
+
+            Returns:
+                bool: False when Redis is not available
+        """
+        client = client or cls.get_client()
+        if client is None:
+            return False
+
+        from .models import FlashSalePurchase
+
+        sale_products = list(flash_sale.sale_products.select_related('product'))
+        ttl = cls._ttl(flash_sale)
+
+        claimed = {
+            (row['user_id'], row['product_id']): row['quantity']
+            for row in FlashSalePurchase.objects.filter(
+                flash_sale=flash_sale
+            ).values('user_id', 'product_id').annotate(quantity=Sum('quantity'))
+        }
+        pending_sold = {}
+        for (user_id, product_id), quantity in cls._pending(flash_sale.id, client).items():
+            claimed[(user_id, product_id)] = claimed.get((user_id, product_id), 0) + quantity
+            pending_sold[product_id] = pending_sold.get(product_id, 0) + quantity
+
+        stock, prices = {}, {}
+        for sale_product in sale_products:
+            sold = sale_product.quantity_sold + pending_sold.get(sale_product.product_id, 0)
+            if sale_product.quantity_limit is None:
+                stock[sale_product.product_id] = cls.UNLIMITED
+            else:
+                stock[sale_product.product_id] = max(sale_product.quantity_limit - sold, 0)
+            prices[sale_product.product_id] = str(flash_sale.calculate_discounted_price(
+                sale_product.original_price or sale_product.product.price
+            ))
+
+        meta = {'per_customer': flash_sale.max_quantity_per_customer or 0}
+        if flash_sale.total_quantity_limit is not None:
+            sold = sum(sale_product.quantity_sold for sale_product in sale_products)
+            sold += sum(pending_sold.values())
+            meta['total'] = max(flash_sale.total_quantity_limit - sold, 0)
+
+        hashes = {
+            cls._key(flash_sale.id, 'stock'): stock,
+            cls._key(flash_sale.id, 'price'): prices,
+            cls._key(flash_sale.id, 'meta'): meta,
+        }
+        for (user_id, product_id), quantity in claimed.items():
+            hashes.setdefault(cls._key(flash_sale.id, f'claimed:{user_id}'), {})[product_id] = quantity
+
+        pipe = client.pipeline(transaction=True)
+        if replace:
+            pipe.delete(*hashes.keys())
+        for key, values in hashes.items():
+            for field, value in values.items():
+                if replace:
+                    pipe.hset(key, field, value)
+                else:
+                    pipe.hsetnx(key, field, value)
+            pipe.expire(key, ttl)
+        pipe.execute()
+
+        logger.info(f"Loaded flash sale {flash_sale.id} inventory for {len(stock)} products")
+        return True
+
+
+    @classmethod
+    def unload(cls, flash_sale_id, client=None):
+        """ Drop a finished sale's quota keys """
+        client = client or cls.get_client()
+        if client is None:
+            return
+
+        keys = [cls._key(flash_sale_id, name) for name in ('stock', 'price', 'meta')]
+        keys.extend(client.scan_iter(match=cls._key(flash_sale_id, 'claimed:*')))
+        client.delete(*keys)
+
+
+    @classmethod
+    def remaining(cls, flash_sale_id, client=None) -> Optional[Dict[int, int]]:
+        """ Remaining units per product id (-1 is unlimited), None if not loaded """
+        client = client or cls.get_client()
+        if client is None:
+            return None
+
+        stock = client.hgetall(cls._key(flash_sale_id, 'stock'))
+        if not stock:
+            return None
+        return {int(product_id): int(units) for product_id, units in stock.items()}
+
+
+    @classmethod
+    def active_sale_products(cls, product_ids):
+        """ Map product id -> FlashSaleProduct for sales running right now """
+        from .models import FlashSaleProduct
+
+        # FlashSaleScheduler keeps status in step with the sale window
+        sale_products = FlashSaleProduct.objects.filter(
+            product_id__in=product_ids,
+            flash_sale__status='active'
+        ).select_related('flash_sale', 'product')
+        return {sale_product.product_id: sale_product for sale_product in sale_products}
+
+
+    @classmethod
+    def claim(cls, sale_product, user_id, quantity, client=None) -> FlashSaleClaim:
+        """
+            Atomically claim units of a flash sale product for a customer
+
+            Args:
+                sale_product: FlashSaleProduct of an active sale
+                user_id: Buying customer
+                quantity: Units requested
+
+            Returns:
+                FlashSaleClaim with the sale price and remaining units
+
+            Raises:
+                FlashSaleClaimError: code 'sold_out' or 'limit_exceeded'
+        """
+        client = client or cls.get_client()
+        if client is None:
+            return cls._claim_in_database(sale_product, user_id, quantity)
+
+        flash_sale = sale_product.flash_sale
+        keys = cls._keys(flash_sale.id, user_id)
+        args = [sale_product.product_id, quantity, cls._ttl(flash_sale)]
+
+        status, remaining = client.eval(cls.CLAIM_SCRIPT, len(keys), *keys, *args)
+        if status == 0:
+            # Not loaded yet (first buyer, or Redis lost the keys)
+            cls.load(flash_sale, client=client, replace=False)
+            status, remaining = client.eval(cls.CLAIM_SCRIPT, len(keys), *keys, *args)
+
+        cls._raise_for_status(status, remaining, sale_product)
+
+        price = client.hget(cls._key(flash_sale.id, 'price'), sale_product.product_id)
+        return FlashSaleClaim(
+            flash_sale_id=flash_sale.id,
+            product_id=sale_product.product_id,
+            user_id=user_id,
+            quantity=quantity,
+            price=Decimal(price.decode() if isinstance(price, bytes) else price),
+            remaining=remaining
+        )
+
+
+    @classmethod
+    def _raise_for_status(cls, status, remaining, sale_product):
+        if status == -1:
+            raise FlashSaleClaimError(
+                f"{sale_product.product.name} is sold out in {sale_product.flash_sale.name}",
+                code='sold_out',
+                remaining=max(remaining, 0)
+            )
+        if status == -2:
+            raise FlashSaleClaimError(
+                f"Purchase limit reached for {sale_product.product.name}. "
+                f"You can buy {max(remaining, 0)} more",
+                code='limit_exceeded',
+                remaining=max(remaining, 0)
+            )
+        if status != 1:
+            raise FlashSaleClaimError(
+                f"{sale_product.product.name} is not available in this sale",
+                code='not_available'
+            )
+
+
+    @classmethod
+    def _claim_in_database(cls, sale_product, user_id, quantity):
+        """ Row-level fallback used when no Redis backend is configured """
+        from .models import FlashSaleProduct, FlashSalePurchase
+
+        flash_sale = sale_product.flash_sale
+        with transaction.atomic():
+            locked = FlashSaleProduct.objects.select_for_update().get(pk=sale_product.pk)
+            purchased = FlashSalePurchase.objects.filter(
+                flash_sale=flash_sale,
+                product_id=sale_product.product_id,
+                user_id=user_id
+            ).aggregate(total=Sum('quantity'))['total'] or 0
+
+            if locked.quantity_limit is None:
+                remaining = cls.UNLIMITED
+            else:
+                remaining = locked.quantity_limit - locked.quantity_sold
+                if remaining < quantity:
+                    cls._raise_for_status(-1, remaining, sale_product)
+
+            if flash_sale.total_quantity_limit is not None:
+                sold = flash_sale.sale_products.aggregate(total=Sum('quantity_sold'))['total'] or 0
+                if flash_sale.total_quantity_limit - sold < quantity:
+                    cls._raise_for_status(-1, flash_sale.total_quantity_limit - sold, sale_product)
+
+            limit = flash_sale.max_quantity_per_customer
+            if limit and purchased + quantity > limit:
+                cls._raise_for_status(-2, limit - purchased, sale_product)
+
+            FlashSaleProduct.objects.filter(pk=locked.pk).update(
+                quantity_sold=F('quantity_sold') + quantity
+            )
+
+        return FlashSaleClaim(
+            flash_sale_id=flash_sale.id,
+            product_id=sale_product.product_id,
+            user_id=user_id,
+            quantity=quantity,
+            price=flash_sale.calculate_discounted_price(
+                locked.original_price or sale_product.product.price
+            ),
+            remaining=remaining if remaining == cls.UNLIMITED else remaining - quantity
+        )
+
+
+    @classmethod
+    def release(cls, claim: FlashSaleClaim, client=None):
+        """ Return the units of a claim whose order was not placed """
+        client = client or cls.get_client()
+        if client is None:
+            from .models import FlashSaleProduct
+            FlashSaleProduct.objects.filter(
+                flash_sale_id=claim.flash_sale_id,
+                product_id=claim.product_id
+            ).update(quantity_sold=F('quantity_sold') - claim.quantity)
+            return
+
+        keys = cls._keys(claim.flash_sale_id, claim.user_id)
+        client.eval(cls.RELEASE_SCRIPT, len(keys), *keys, claim.product_id, claim.quantity)
+
+
+    @classmethod
+    def record(cls, claims: List[FlashSaleClaim], order_id, client=None):
+        """
+            Persist claims of a placed order
+
+            Call inside the order's transaction. With Redis the purchases are
+            queued for `flush_purchases` once it commits; otherwise
+            quantity_sold was already updated by the claim and only the
+            purchase rows are written.
+        """
+        if not claims:
+            return
+
+        client = client or cls.get_client()
+        if client is None:
+            from .models import FlashSalePurchase
+            FlashSalePurchase.objects.bulk_create([
+                FlashSalePurchase(
+                    flash_sale_id=claim.flash_sale_id,
+                    product_id=claim.product_id,
+                    user_id=claim.user_id,
+                    quantity=claim.quantity,
+                    price_at_purchase=claim.price,
+                    order_id=order_id
+                )
+                for claim in claims
+            ])
+            return
+
+        entries = [
+            json.dumps({
+                'flash_sale': claim.flash_sale_id,
+                'product': claim.product_id,
+                'user': claim.user_id,
+                'quantity': claim.quantity,
+                'price': str(claim.price),
+                'order': order_id,
+            })
+            for claim in claims
+        ]
+        transaction.on_commit(lambda: client.rpush(cls.QUEUE_KEY, *entries))
+
+
+    @classmethod
+    def flush_purchases(cls, batch_size=None, client=None) -> int:
+        """
+            Write one batch of queued purchases back to the database
+
+            Returns:
+                int: Number of purchases written
+        """
+        client = client or cls.get_client()
+        if client is None:
+            return 0
+
+        from .models import FlashSaleProduct, FlashSalePurchase
+
+        batch_size = batch_size or cls.WRITE_BACK_BATCH_SIZE
+        pipe = client.pipeline(transaction=True)
+        pipe.lrange(cls.QUEUE_KEY, 0, batch_size - 1)
+        pipe.ltrim(cls.QUEUE_KEY, batch_size, -1)
+        raw_entries, _ = pipe.execute()
+        if not raw_entries:
+            return 0
+
+        entries = [json.loads(raw) for raw in raw_entries]
+        sold = {}
+        for entry in entries:
+            key = (entry['flash_sale'], entry['product'])
+            sold[key] = sold.get(key, 0) + entry['quantity']
+
+        try:
+            with transaction.atomic():
+                FlashSalePurchase.objects.bulk_create([
+                    FlashSalePurchase(
+                        flash_sale_id=entry['flash_sale'],
+                        product_id=entry['product'],
+                        user_id=entry['user'],
+                        quantity=entry['quantity'],
+                        price_at_purchase=Decimal(entry['price']),
+                        order_id=entry['order']
+                    )
+                    for entry in entries
+                ])
+                for (flash_sale_id, product_id), quantity in sold.items():
+                    FlashSaleProduct.objects.filter(
+                        flash_sale_id=flash_sale_id,
+                        product_id=product_id
+                    ).update(quantity_sold=F('quantity_sold') + quantity)
+        except Exception:
+            # Put the batch back at the head of the queue for the next flush
+            client.lpush(cls.QUEUE_KEY, *reversed(raw_entries))
+            raise
+
+        return len(entries)
+
+
+class FlashSaleScheduler:
+    """
+        Moves flash sales through their lifecycle on time
+
+        Each run flips due sales with one guarded bulk UPDATE per transition,
+        using the (status, start_time, end_time) index, so status alone
+        tells whether a sale is running. Sales about to start are warmed
+        (quotas and sale prices loaded into Redis) ahead of time, and the
+        map of active sale prices is rebuilt on every transition so price
+        lookups read the cache instead of comparing timestamps.
+    """
+    WARM_AHEAD = 5 * 60  # Seconds before start to load the sale into Redis
+    MAX_SLEEP = 30  # Upper bound between runs, picks up newly created sales
+    WARMED_KEY = 'flash_sale_warmed_{}'
+    DASHBOARD_GROUP = 'admin_dashboard'
+
+
+    @classmethod
+    def run_pending(cls, now=None):
+        """
+            Warm, start and end every sale that is due
+
+            Returns:
+                Dict with the ids of 'activated' and 'ended' sales
+        """
+        from .models import FlashSale
+
+        now = now or timezone.now()
+
+        upcoming = FlashSale.objects.filter(
+            status='scheduled',
+            start_time__gt=now,
+            start_time__lte=now + timedelta(seconds=cls.WARM_AHEAD)
+        )
+        for flash_sale in upcoming:
+            cls.warm(flash_sale)
+
+        activated = list(FlashSale.objects.filter(
+            status='scheduled',
+            start_time__lte=now,
+            end_time__gt=now
+        ).values_list('id', flat=True))
+        if activated:
+            FlashSale.objects.filter(
+                id__in=activated, status='scheduled'
+            ).update(status='active', updated_at=now)
+
+        ended = list(FlashSale.objects.filter(
+            status__in=['scheduled', 'active'],
+            end_time__lte=now
+        ).values_list('id', flat=True))
+        if ended:
+            FlashSale.objects.filter(
+                id__in=ended, status__in=['scheduled', 'active']
+            ).update(status='ended', updated_at=now)
+
+        if activated or ended:
+            cls.sales_changed(activated=activated, ended=ended)
+
+        return {'activated': activated, 'ended': ended}
+
+
+    @classmethod
+    def seconds_until_next(cls, now=None):
+        """ Seconds until the next warm-up, start or end (capped at MAX_SLEEP) """
+        from .models import FlashSale
+
+        now = now or timezone.now()
+        upcoming = FlashSale.objects.filter(
+            status__in=['scheduled', 'active']
+        ).aggregate(
+            next_start=Min('start_time', filter=Q(status='scheduled', start_time__gt=now)),
+            next_end=Min('end_time')
+        )
+
+        candidates = [cls.MAX_SLEEP]
+        if upcoming['next_start']:
+            start = upcoming['next_start']
+            warm_at = start - timedelta(seconds=cls.WARM_AHEAD)
+            moment = warm_at if warm_at > now else start
+            candidates.append((moment - now).total_seconds())
+        if upcoming['next_end']:
+            candidates.append((upcoming['next_end'] - now).total_seconds())
+
+        return max(min(candidates), 0)
+
+
+    @classmethod
+    def warm(cls, flash_sale):
+        """ Load an upcoming sale into Redis once """
+        timeout = cls.WARM_AHEAD + int((flash_sale.end_time - flash_sale.start_time).total_seconds())
+        if cache.add(cls.WARMED_KEY.format(flash_sale.id), True, timeout):
+            FlashSaleInventory.load(flash_sale)
+
+
+    @classmethod
+    def sales_changed(cls, activated=(), ended=()):
+        """
+            Apply the side effects of sales starting or ending
+
+            Loads started sales into Redis, drops ended ones, rebuilds the
+            active price map and the affected price rows, purges product
+            caches and notifies the admin dashboard.
+        """
+        from .models import FlashSale
+
+        for flash_sale in FlashSale.objects.filter(id__in=activated):
+            FlashSaleInventory.load(flash_sale, replace=False)
+
+        for flash_sale_id in ended:
+            FlashSaleInventory.unload(flash_sale_id)
+            cache.delete(cls.WARMED_KEY.format(flash_sale_id))
+
+        cls.rebuild_active_prices()
+        PriceEngine.rebuild(PriceEngine.products_in_sales([*activated, *ended]))
+        invalidate_product_cache(None)
+        cls._notify(activated, ended)
+
+
+    @classmethod
+    def rebuild_active_prices(cls):
+        """ Recompute the product -> sale price map of active sales """
+        from .models import FlashSaleProduct
+
+        prices = {}
+        sale_products = FlashSaleProduct.objects.filter(
+            flash_sale__status='active'
+        ).select_related('flash_sale', 'product')
+
+        for sale_product in sale_products:
+            flash_sale = sale_product.flash_sale
+            price = flash_sale.calculate_discounted_price(
+                sale_product.original_price or sale_product.product.price
+            )
+            current = prices.get(sale_product.product_id)
+            if current is None or price < current['price']:
+                prices[sale_product.product_id] = {
+                    'flash_sale': flash_sale.id,
+                    'price': price,
+                    'ends_at': flash_sale.end_time,
+                }
+
+        cache.set(settings.CACHE_KEYS['ACTIVE_FLASH_SALE_PRICES'], prices, None)
+        return prices
+
+
+    @classmethod
+    def active_prices(cls):
+        """ Map product id -> {'flash_sale', 'price', 'ends_at'} for running sales """
+        prices = cache.get(settings.CACHE_KEYS['ACTIVE_FLASH_SALE_PRICES'])
+        if prices is None:
+            prices = cls.rebuild_active_prices()
+        return prices
+
+
+    @classmethod
+    def _notify(cls, activated, ended):
+        try:
+            async_to_sync(get_channel_layer().group_send)(
+                cls.DASHBOARD_GROUP,
+                {
+                    'type': 'flash_sale_update',
+                    'data': {
+                        'activated': list(activated),
+                        'ended': list(ended),
+                        'timestamp': timezone.now().isoformat()
+                    }
+                }
+            )
+        except Exception as e:
+            logger.error(f"Failed to push flash sale update: {str(e)}")
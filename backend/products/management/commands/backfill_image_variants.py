@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand
+from products.models import ProductImage
+from returns.models import ReturnImage
+from customer_support.models import EmailAttachment
+from utils.cloudinary_utils import CloudinaryUploader
+
+
+class Command(BaseCommand):
+    help = 'Precompute Cloudinary variant URLs for stored images'
+
+    MODELS = {
+        'product_images': ProductImage,
+        'return_images': ReturnImage,
+        'email_attachments': EmailAttachment,
+    }
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--model',
+            choices=list(self.MODELS.keys()),
+            help='Only backfill one image model'
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Rebuild variants for rows that already have them'
+        )
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        models = (
+            {options['model']: self.MODELS[options['model']]}
+            if options['model'] else self.MODELS
+        )
+
+        for label, model in models.items():
+            queryset = model.objects.exclude(public_id='')
+            if not options['force']:
+                queryset = queryset.filter(variants={})
+            if model is EmailAttachment:
+                queryset = queryset.filter(content_type__startswith='image/')
+
+            updated = 0
+            batch = []
+            for image in queryset.only('id', 'public_id').iterator(chunk_size=options['batch_size']):
+                image.variants = CloudinaryUploader.build_variants(image.public_id)
+                batch.append(image)
+
+                if len(batch) >= options['batch_size']:
+                    model.objects.bulk_update(batch, ['variants'])
+                    updated += len(batch)
+                    batch = []
+
+            if batch:
+                model.objects.bulk_update(batch, ['variants'])
+                updated += len(batch)
+
+            self.stdout.write(self.style.SUCCESS(
+                f'Backfilled variants for {updated} {label}'))
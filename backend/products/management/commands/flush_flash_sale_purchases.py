@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+from products.flash_sales import FlashSaleInventory
+import time
+
+
+class Command(BaseCommand):
+    help = 'Write queued flash sale purchases back to the database in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=FlashSaleInventory.WRITE_BACK_BATCH_SIZE
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=0,
+            help='Keep running, polling the queue every N seconds'
+        )
+
+    def handle(self, *args, **options):
+        if FlashSaleInventory.get_client() is None:
+            self.stdout.write(self.style.WARNING(
+                'Cache is not Redis backed; purchases are written at checkout'))
+            return
+
+        while True:
+            written = 0
+            while True:
+                flushed = FlashSaleInventory.flush_purchases(options['batch_size'])
+                written += flushed
+                if flushed < options['batch_size']:
+                    break
+
+            if written or not options['interval']:
+                self.stdout.write(self.style.SUCCESS(
+                    f'Wrote {written} flash sale purchases'))
+
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
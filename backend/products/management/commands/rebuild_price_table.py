@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from products.pricing import PriceEngine
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the effective price table for every product and currency'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--currency',
+            action='append',
+            help='Only rebuild this currency (repeatable)'
+        )
+
+    def handle(self, *args, **options):
+        written = PriceEngine.rebuild(currency_codes=options['currency'])
+        self.stdout.write(self.style.SUCCESS(f'Wrote {written} price rows'))
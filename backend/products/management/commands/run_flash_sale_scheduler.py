@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from products.flash_sales import FlashSaleScheduler
+import time
+
+
+class Command(BaseCommand):
+    help = 'Start and end flash sales on time'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Process due sales once and exit (for cron)'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            result = FlashSaleScheduler.run_pending()
+            if result['activated'] or result['ended']:
+                self.stdout.write(self.style.SUCCESS(
+                    f"Activated {len(result['activated'])} and ended "
+                    f"{len(result['ended'])} flash sales"))
+
+            if options['once']:
+                return
+
+            # Sleep until the next warm-up, start or end is due
+            time.sleep(FlashSaleScheduler.seconds_until_next())
@@ -0,0 +1,64 @@
+# Generated by Django 5.1.2 on 2026-10-19 13:38
+
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+# GIN indexes are PostgreSQL only, so they are created here rather than in
+# Product.Meta.indexes to keep the schema usable on SQLite test databases.
+CREATE_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS product_search_vector_idx "
+    "ON products_product USING gin (search_vector)",
+    "CREATE INDEX IF NOT EXISTS product_name_trgm_idx "
+    "ON products_product USING gin (name gin_trgm_ops)",
+]
+
+DROP_INDEXES = [
+    "DROP INDEX IF EXISTS product_search_vector_idx",
+    "DROP INDEX IF EXISTS product_name_trgm_idx",
+]
+
+
+def create_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    for statement in CREATE_INDEXES:
+        schema_editor.execute(statement)
+
+    schema_editor.execute("""
+        UPDATE products_product AS p
+        SET search_vector =
+            setweight(to_tsvector('english', coalesce(p.name, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(c.name, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(p.hair_type, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(p.description, '')), 'C')
+        FROM products_category AS c
+        WHERE c.id = p.category_id
+    """)
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    for statement in DROP_INDEXES:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0013_productimage_variants'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='product',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
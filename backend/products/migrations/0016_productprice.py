@@ -0,0 +1,32 @@
+# Generated by Django 5.1.2 on 2026-10-19 13:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0015_product_catalog_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductPrice',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('currency_code', models.CharField(max_length=3)),
+                ('list_price', models.DecimalField(decimal_places=2, max_digits=14)),
+                ('sale_price', models.DecimalField(decimal_places=2, help_text='Price the customer pays', max_digits=14)),
+                ('source', models.CharField(choices=[('list', 'List Price'), ('discount', 'Discount Price'), ('flash_sale', 'Flash Sale')], default='list', max_length=20)),
+                ('valid_until', models.DateTimeField(blank=True, help_text='When the sale price stops applying', null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('flash_sale', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='products.flashsale')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='prices', to='products.product')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['currency_code', 'sale_price'], name='product_price_currency_idx')],
+                'constraints': [models.UniqueConstraint(fields=('product', 'currency_code'), name='unique_product_currency_price')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.2 on 2026-10-19 13:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0016_productprice'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='price_version',
+            field=models.PositiveIntegerField(default=1, editable=False, help_text='Bumped when price fields change; part of price cache keys'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.1.2 on 2026-10-19 14:04
+
+import django.core.validators
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0017_product_price_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='weight',
+            field=models.DecimalField(decimal_places=3, default=Decimal('0'), help_text='Shipping weight in kg, used for weight-based shipping tiers', max_digits=6, validators=[django.core.validators.MinValueValidator(Decimal('0'))]),
+        ),
+    ]
@@ -2,7 +2,7 @@
 
 from django.db import models
 from django.utils.text import slugify
-from currencies.utils import CurrencyConverter
+from currencies.utils import CurrencyConverter, ExchangeRateSnapshots
 from django.core.mail import send_mail
 from django.conf import settings
 from django.core.validators import MinValueValidator
@@ -13,10 +13,13 @@ from django.core.files.storage import default_storage
 from cloudinary_storage.storage import MediaCloudinaryStorage
 from django.conf import settings
 from utils.cloudinary_utils import CloudinaryUploader
+from utils.cache import get_or_compute, local_cache
 import os
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 from django.core.files.images import get_image_dimensions
+from django.contrib.postgres.search import SearchVectorField
+from .search import ProductSearch
 import logging
 
 logger = logging.getLogger(__name__)
@@ -47,9 +50,18 @@ class Category(models.Model):
             self.slug = slugify(self.name)
         super().save(*args, **kwargs)
 
+        # Category name is part of each product's search document
+        ProductSearch.update_category(self)
+
 
     def __str__(self):
         return self.name
+
+
+@local_cache('categories')
+def get_categories():
+    """ Every category by id, served from the process-local cache """
+    return list(Category.objects.order_by('id'))
     
 
 
@@ -97,6 +109,13 @@ class Product(models.Model):
         help_text="Discount price in USD (base currency)"
     )
     stock = models.IntegerField(default=0)
+    weight = models.DecimalField(
+        max_digits=6,
+        decimal_places=3,
+        default=Decimal('0'),
+        validators=[MinValueValidator(Decimal('0'))],
+        help_text="Shipping weight in kg, used for weight-based shipping tiers"
+    )
     care_instructions = models.TextField(blank=True)
     is_featured = models.BooleanField(default=False)
     is_available = models.BooleanField(default=True)
@@ -111,6 +130,40 @@ class Product(models.Model):
         default=True,
         help_text="Send notification when stock falls below threshold"
     )
+    search_vector = SearchVectorField(null=True, editable=False)
+    price_version = models.PositiveIntegerField(
+        default=1,
+        editable=False,
+        help_text="Bumped when price fields change; part of price cache keys"
+    )
+
+    SEARCH_FIELDS = {'name', 'description', 'hair_type', 'category', 'category_id'}
+    PRICE_FIELDS = ('price', 'discount_price')
+    # Shown by cached listings and the autocomplete index
+    LISTING_FIELDS = {
+        'name', 'slug', 'category', 'category_id', 'is_available', 'is_featured',
+        'price', 'discount_price'
+    }
+
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember loaded prices so save() can tell whether they changed
+        instance._loaded_prices = instance._price_snapshot()
+        return instance
+
+
+    def _price_snapshot(self):
+        return tuple(self.__dict__.get(field) for field in self.PRICE_FIELDS)
+
+
+    def price_fields_changed(self):
+        """ Whether price or discount_price differ from the stored values """
+        loaded = getattr(self, '_loaded_prices', None)
+        if self.pk is None or loaded is None:
+            return True
+        return loaded != self._price_snapshot()
 
 
     def update_stock(self, quantity_changed, transaction_type, order=None, user=None, notes=''):
@@ -126,9 +179,9 @@ class Product(models.Model):
         """
         previous_stock = self.stock
         
-        # Update stock
+        # Update stock; a stock-only write skips price, cache and search work
         self.stock += quantity_changed
-        self.save()
+        self.save(update_fields=['stock', 'last_stock_update', 'updated_at'])
 
 
         # Create stock history record
@@ -192,28 +245,22 @@ class Product(models.Model):
             if currency_code == 'USD':
                 return self.price
             
-            # Try to get from cache first
-            cache_key = f'product_price_{self.id}_{currency_code}'
-            cached_price = cache.get(cache_key)
-            if cached_price is not None:
-                return cached_price
-            
-            # Convert price
-            converted_price = CurrencyConverter.convert_price(
-                amount=self.price,
-                from_currency='USD',
-                to_currency=currency_code,
-                round_digits=2
+            cache_key = (
+                f'product_price_{self.id}_v{self.price_version}'
+                f'_r{ExchangeRateSnapshots.version()}_{currency_code}'
             )
 
-            # Cache the converted price
-            cache.set(
+            # Converted once per key even when many requests miss together
+            return get_or_compute(
                 cache_key,
-                converted_price,
-                timeout=settings.CACHE_TIMEOUTS['PRODUCT']
+                lambda: CurrencyConverter.convert_price(
+                    amount=self.price,
+                    from_currency='USD',
+                    to_currency=currency_code,
+                    round_digits=2
+                ),
+                settings.CACHE_TIMEOUTS['PRODUCT']
             )
-
-            return converted_price
         
         except ValueError as e:
             logger.error(f"Price conversion failed for product {self.id}: {str(e)}")
@@ -238,28 +285,22 @@ class Product(models.Model):
             if currency_code == 'USD':
                 return self.discount_price
             
-            # Try to get from cache first
-            cache_key = f'product_discount_price_{self.id}_{currency_code}'
-            cached_price = cache.get(cache_key)
-            if cached_price is not None:
-                return cached_price
-            
-            # Convert discount_price
-            converted_price = CurrencyConverter.convert_price(
-                amount=self.discount_price,
-                from_currency='USD',
-                to_currency=currency_code,
-                round_digits=2
+            cache_key = (
+                f'product_discount_price_{self.id}_v{self.price_version}'
+                f'_r{ExchangeRateSnapshots.version()}_{currency_code}'
             )
 
-            # Cache the converted price
-            cache.set(
+            # Converted once per key even when many requests miss together
+            return get_or_compute(
                 cache_key,
-                converted_price,
-                timeout=settings.CACHE_TIMEOUTS['PRODUCT']
+                lambda: CurrencyConverter.convert_price(
+                    amount=self.discount_price,
+                    from_currency='USD',
+                    to_currency=currency_code,
+                    round_digits=2
+                ),
+                settings.CACHE_TIMEOUTS['PRODUCT']
             )
-
-            return converted_price
         
         except ValueError as e:
             logger.error(f"Discount price conversion failed for product {self.id}: {str(e)}")
@@ -306,26 +347,54 @@ class Product(models.Model):
         )
     
 
-    def clear_price_cache(self):
-        """ Clear cached prices when product is updated """
-        active_currencies = CurrencyConverter.get_active_currencies()
-        for currency in active_currencies:
-            cache.delete(f'product_price_{self.id}_{currency}')
-            cache.delete(f'product_discount_price_{self.id}_{currency}')
-
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Catalog listing and faceting filter on availability first
+            models.Index(
+                fields=['is_available', 'category', '-created_at'],
+                name='product_avail_cat_created_idx'
+            ),
+            models.Index(
+                fields=['is_available', 'is_featured', '-created_at'],
+                name='product_avail_feat_created_idx'
+            ),
+            models.Index(
+                fields=['is_available', 'hair_type', 'length'],
+                name='product_avail_hair_length_idx'
+            ),
+            models.Index(
+                fields=['is_available', 'price'],
+                name='product_avail_price_idx'
+            ),
+        ]
+        # GIN indexes on search_vector and name (gin_trgm_ops) are created by
+        # migration 0014 on PostgreSQL only
 
     
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.name)
 
-        # Clear price cache when product is updated
-        if self.id:
-            self.clear_price_cache()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and not set(self.PRICE_FIELDS).intersection(update_fields):
+            self._price_changed = False
+        else:
+            self._price_changed = self.price_fields_changed()
+
+        # A new price version moves price caches to fresh keys; entries
+        # under the old version simply expire
+        if self._price_changed and self.pk is not None:
+            self.price_version += 1
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'price_version'}
 
         super().save(*args, **kwargs)
+        self._loaded_prices = self._price_snapshot()
+
+        # Keep the full-text document in sync unless only unrelated fields changed
+        if update_fields is None or self.SEARCH_FIELDS.intersection(update_fields):
+            ProductSearch.update_product(self)
 
 
     def __str__(self):
@@ -356,6 +425,11 @@ class ProductImage(models.Model):
         upload_to=settings.CLOUDINARY_STORAGE_FOLDERS['PRODUCT_IMAGES']
     )
     public_id = models.CharField(max_length=225, blank=True)
+    variants = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Precomputed delivery URLs keyed by variant name"
+    )
     is_primary = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
@@ -364,7 +438,14 @@ class ProductImage(models.Model):
         ordering = ['-is_primary', '-created_at']
     
 
+    def get_variant_url(self, name):
+        return CloudinaryUploader.get_variant_url(self.variants, self.public_id, name)
+
+
     def save(self, *args, **kwargs):
+        if self.public_id and not self.variants:
+            self.variants = CloudinaryUploader.build_variants(self.public_id)
+
         if self.is_primary:
             ProductImage.objects.filter(
                 product=self.product,
@@ -374,8 +455,10 @@ class ProductImage(models.Model):
     
 
     def delete(self, *args, **kwargs):
-        # Delete from Cloudinary
-        if self.public_id:
+        # Delete from Cloudinary unless a deduplicated upload still uses it
+        if self.public_id and not ProductImage.objects.filter(
+            public_id=self.public_id
+        ).exclude(pk=self.pk).exists():
             CloudinaryUploader.delete_file(self.public_id)
         super().delete(*args, **kwargs)
 
@@ -612,3 +695,67 @@ class FlashSalePurchase(models.Model):
 
     def __str__(self):
         return f"{self.user.email} purchased {self.quantity}x {self.product.name} in {self.flash_sale.name}"
+
+
+class ProductPrice(models.Model):
+    """ Effective selling price of a product in one currency (see PriceEngine) """
+    SOURCE_LIST = 'list'
+    SOURCE_DISCOUNT = 'discount'
+    SOURCE_FLASH_SALE = 'flash_sale'
+    SOURCE_CHOICES = [
+        (SOURCE_LIST, 'List Price'),
+        (SOURCE_DISCOUNT, 'Discount Price'),
+        (SOURCE_FLASH_SALE, 'Flash Sale'),
+    ]
+
+    product = models.ForeignKey(
+        Product,
+        on_delete=models.CASCADE,
+        related_name='prices'
+    )
+    currency_code = models.CharField(max_length=3)
+    list_price = models.DecimalField(max_digits=14, decimal_places=2)
+    sale_price = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        help_text="Price the customer pays"
+    )
+    source = models.CharField(
+        max_length=20,
+        choices=SOURCE_CHOICES,
+        default=SOURCE_LIST
+    )
+    flash_sale = models.ForeignKey(
+        FlashSale,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+'
+    )
+    valid_until = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When the sale price stops applying"
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['product', 'currency_code'],
+                name='unique_product_currency_price'
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=['currency_code', 'sale_price'],
+                name='product_price_currency_idx'
+            )
+        ]
+
+    @property
+    def is_discounted(self):
+        return self.sale_price < self.list_price
+
+    def __str__(self):
+        return f"{self.product_id} {self.currency_code} {self.sale_price} ({self.source})"
@@ -0,0 +1,245 @@
+# products/pricing.py
+
+from django.db import transaction
+from currencies.utils import CurrencyConverter
+from decimal import Decimal, ROUND_HALF_UP
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class PriceEngine:
+    """
+        Effective selling prices, materialized per product and currency
+
+        The list price, `discount_price` and any active flash sale are
+        resolved once into a ProductPrice row for every active currency.
+        Rows are rebuilt for the affected products when a product's price
+        changes, a flash sale starts or ends, or an exchange rate changes,
+        so readers fetch a page of prices with a single query and no
+        conversion or cache lookups per product.
+    """
+    BATCH_SIZE = 1000
+    QUANTIZE = Decimal('0.01')
+
+
+    @classmethod
+    def _convert(cls, amount, rate):
+        if amount is None:
+            return None
+        return (amount * rate).quantize(cls.QUANTIZE, rounding=ROUND_HALF_UP)
+
+
+    @classmethod
+    def resolve(cls, product, sale_products=()):
+        """
+            Resolve a product's base currency selling price
+
+            Args:
+                product: Product with price and discount_price loaded
+                sale_products: The product's FlashSaleProduct entries in
+                    active sales
+
+            Returns:
+                Tuple of (sale price, source, flash sale or None)
+        """
+        from .models import ProductPrice
+
+        price, source, flash_sale = product.price, ProductPrice.SOURCE_LIST, None
+
+        if product.discount_price and product.discount_price < price:
+            price, source = product.discount_price, ProductPrice.SOURCE_DISCOUNT
+
+        for sale_product in sale_products:
+            sale = sale_product.flash_sale
+            sale_price = sale.calculate_discounted_price(
+                sale_product.original_price or product.price
+            )
+            if sale_price < price:
+                price, source, flash_sale = sale_price, ProductPrice.SOURCE_FLASH_SALE, sale
+
+        return price, source, flash_sale
+
+
+    @classmethod
+    def _active_sale_products(cls, product_ids):
+        """ Active flash sale entries grouped by product id """
+        from .models import FlashSaleProduct
+
+        queryset = FlashSaleProduct.objects.filter(
+            flash_sale__status='active'
+        ).select_related('flash_sale')
+        if product_ids is not None:
+            queryset = queryset.filter(product_id__in=product_ids)
+
+        sale_products = {}
+        for sale_product in queryset:
+            sale_products.setdefault(sale_product.product_id, []).append(sale_product)
+        return sale_products
+
+
+    @classmethod
+    def rebuild(cls, product_ids=None, currency_codes=None):
+        """
+            Recompute price rows
+
+            Args:
+                product_ids: Products to refresh (None for the whole catalog)
+                currency_codes: Currencies to refresh (None for all active)
+
+            Returns:
+                int: Number of rows written
+        """
+        from .models import Product, ProductPrice
+
+        # Rates come from the database: a rebuild triggered by a rate change
+        # may run before this process picks up the new snapshot
+        active = CurrencyConverter.load_active_currencies()
+        currencies = active
+        if currency_codes is not None:
+            currencies = {
+                code: info for code, info in currencies.items() if code in currency_codes
+            }
+
+        products = Product.objects.only('id', 'price', 'discount_price')
+        if product_ids is not None:
+            products = products.filter(id__in=product_ids)
+
+        sale_products = cls._active_sale_products(product_ids)
+
+        written = 0
+        batch = []
+        for product in products.iterator(chunk_size=cls.BATCH_SIZE):
+            price, source, flash_sale = cls.resolve(product, sale_products.get(product.id, ()))
+            for code, info in currencies.items():
+                rate = Decimal('1') if code == CurrencyConverter.BASE_CURRENCY else info.rate
+                batch.append(ProductPrice(
+                    product_id=product.id,
+                    currency_code=code,
+                    list_price=cls._convert(product.price, rate),
+                    sale_price=cls._convert(price, rate),
+                    source=source,
+                    flash_sale=flash_sale,
+                    valid_until=flash_sale.end_time if flash_sale else None
+                ))
+
+            if len(batch) >= cls.BATCH_SIZE:
+                written += cls._write(batch)
+                batch = []
+
+        if batch:
+            written += cls._write(batch)
+
+        # Currencies that were deactivated no longer have prices
+        stale = ProductPrice.objects.exclude(
+            currency_code__in=active.keys()
+        )
+        if product_ids is not None:
+            stale = stale.filter(product_id__in=product_ids)
+        stale.delete()
+
+        return written
+
+
+    @classmethod
+    def _write(cls, rows):
+        from .models import ProductPrice
+
+        ProductPrice.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=['product', 'currency_code'],
+            update_fields=[
+                'list_price', 'sale_price', 'source', 'flash_sale', 'valid_until', 'updated_at'
+            ]
+        )
+        return len(rows)
+
+
+    @classmethod
+    def refresh_on_commit(cls, product_ids=None, currency_codes=None):
+        """ Rebuild rows once the current transaction commits """
+        product_ids = list(product_ids) if product_ids is not None else None
+        transaction.on_commit(lambda: cls.rebuild(product_ids, currency_codes))
+
+
+    @classmethod
+    def prices_for(cls, product_ids, currency='USD'):
+        """
+            Price rows for many products in one query
+
+            Missing rows (new products or currencies) are built on the fly.
+
+            Returns:
+                Dict mapping product id to ProductPrice
+        """
+        from .models import ProductPrice
+
+        product_ids = set(product_ids)
+        if currency not in CurrencyConverter.get_active_currencies():
+            currency = CurrencyConverter.BASE_CURRENCY
+
+        rows = {
+            row.product_id: row
+            for row in ProductPrice.objects.filter(
+                product_id__in=product_ids, currency_code=currency
+            )
+        }
+
+        missing = product_ids - rows.keys()
+        if missing:
+            cls.rebuild(missing, [currency])
+            rows.update({
+                row.product_id: row
+                for row in ProductPrice.objects.filter(
+                    product_id__in=missing, currency_code=currency
+                )
+            })
+
+        return rows
+
+
+    @classmethod
+    def attach(cls, products, currency='USD'):
+        """ Set `price_row` on each product from a single bulk read """
+        rows = cls.prices_for([product.id for product in products], currency)
+        for product in products:
+            product.price_row = rows.get(product.id)
+        return products
+
+
+    @classmethod
+    def get(cls, product, currency='USD'):
+        """ Price row for one product (uses `price_row` when attached) """
+        row = getattr(product, 'price_row', None)
+        if row is not None and row.currency_code == currency:
+            return row
+        return cls.prices_for([product.id], currency).get(product.id)
+
+
+    @classmethod
+    def effective_prices(cls, product_ids, currency='USD'):
+        """ Map product id -> selling price in the given currency """
+        return {
+            product_id: row.sale_price
+            for product_id, row in cls.prices_for(product_ids, currency).items()
+        }
+
+
+    @classmethod
+    def effective_price(cls, product, currency='USD'):
+        """ Selling price of one product, falling back to the model fields """
+        row = cls.get(product, currency)
+        if row is not None:
+            return row.sale_price
+        return product.discount_price or product.price
+
+
+    @classmethod
+    def products_in_sales(cls, flash_sale_ids):
+        """ Ids of products taking part in the given flash sales """
+        from .models import FlashSaleProduct
+
+        return list(FlashSaleProduct.objects.filter(
+            flash_sale_id__in=flash_sale_ids
+        ).values_list('product_id', flat=True).distinct())
@@ -0,0 +1,149 @@
+# products/search.py
+
+from django.contrib.postgres.search import (
+    SearchVector, SearchQuery, SearchRank, TrigramSimilarity
+)
+from django.db import connection
+from django.db.models import Q, F, Value, Case, When, FloatField
+from django.db.models.functions import Coalesce
+from rest_framework import filters
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ProductSearch:
+    """
+        Full-text product search
+
+        On PostgreSQL products are matched against the maintained
+        `search_vector` column (GIN indexed) and a trigram index on name for
+        typo tolerance. Other databases fall back to icontains matching so
+        the test suite still runs on SQLite.
+    """
+    CONFIG = 'english'
+    TRIGRAM_THRESHOLD = 0.3
+
+
+    @staticmethod
+    def is_supported():
+        return connection.vendor == 'postgresql'
+
+
+    @classmethod
+    def vector_expression(cls, category_name):
+        """
+            Weighted search document for a product
+
+            Name ranks above category and hair type, which rank above
+            description. The category name is passed in as a value so the
+            expression can be used in a single-table UPDATE.
+        """
+        return (
+            SearchVector('name', weight='A', config=cls.CONFIG)
+            + SearchVector(Value(category_name or ''), weight='B', config=cls.CONFIG)
+            + SearchVector(Coalesce('hair_type', Value('')), weight='B', config=cls.CONFIG)
+            + SearchVector('description', weight='C', config=cls.CONFIG)
+        )
+
+
+    @classmethod
+    def update_product(cls, product):
+        """ Refresh the search vector of a single product """
+        if not cls.is_supported():
+            return
+
+        from .models import Product
+        Product.objects.filter(pk=product.pk).update(
+            search_vector=cls.vector_expression(product.category.name)
+        )
+
+
+    @classmethod
+    def update_category(cls, category):
+        """ Refresh the search vectors of every product in a category """
+        if not cls.is_supported():
+            return
+
+        category.products.update(
+            search_vector=cls.vector_expression(category.name)
+        )
+
+
+    @classmethod
+    def search(cls, queryset, terms):
+        """
+            Filter and rank products matching the search terms
+
+            Args:
+                queryset: Product queryset to search within
+                terms: Raw search string
+
+            Returns:
+                Queryset annotated with `search_rank` (higher is better)
+        """
+        terms = terms.strip()
+        if not terms:
+            return queryset
+
+        if cls.is_supported():
+            search_query = SearchQuery(terms, search_type='websearch', config=cls.CONFIG)
+            return queryset.annotate(
+                search_rank=(
+                    SearchRank(F('search_vector'), search_query)
+                    + TrigramSimilarity('name', terms)
+                )
+            ).filter(
+                Q(search_vector=search_query) | Q(name__trigram_similar=terms)
+            )
+
+        # Fallback: every term must appear in the name or description
+        for term in terms.split():
+            queryset = queryset.filter(
+                Q(name__icontains=term) | Q(description__icontains=term)
+            )
+
+        return queryset.annotate(
+            search_rank=Case(
+                When(name__icontains=terms, then=Value(1.0)),
+                default=Value(0.5),
+                output_field=FloatField()
+            )
+        )
+
+
+    @classmethod
+    def fuzzy(cls, queryset, term):
+        """
+            Products whose name is similar to the term (typo tolerant)
+
+            Falls back to a prefix match on databases without pg_trgm.
+        """
+        if cls.is_supported():
+            return queryset.annotate(
+                similarity=TrigramSimilarity('name', term)
+            ).filter(
+                similarity__gte=cls.TRIGRAM_THRESHOLD
+            ).order_by('-similarity')
+
+        return queryset.filter(name__istartswith=term)
+
+
+class ProductSearchFilter(filters.SearchFilter):
+    """ SearchFilter backed by ProductSearch instead of ILIKE scans """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+        return ProductSearch.search(queryset, ' '.join(terms))
+
+
+class ProductOrderingFilter(filters.OrderingFilter):
+    """ Order search results by relevance unless another ordering is requested """
+
+    def get_default_ordering(self, view):
+        search_param = ProductSearchFilter.search_param
+        if view.request.query_params.get(search_param, '').strip():
+            return ['-search_rank', '-created_at']
+        return super().get_default_ordering(view)
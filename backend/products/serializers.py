@@ -2,9 +2,11 @@
 from rest_framework import serializers
 from .models import Category, Product, ProductImage, StockHistory, FlashSaleProduct, FlashSale, FlashSalePurchase
 from currencies.utils import CurrencyConverter
+from .pricing import PriceEngine
 from django.conf import settings
 import logging
 from django.db import transaction
+from django.db.models import prefetch_related_objects
 
 logger = logging.getLogger(__name__)
 
@@ -14,10 +16,12 @@ class ProductImageSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = ProductImage
-        fields = ['id', 'url', 'public_id', 'is_primary']
-        read_only_fields = ['id']
+        fields = ['id', 'url', 'public_id', 'is_primary', 'variants']
+        read_only_fields = ['id', 'variants']
     
     def get_url(self, obj):
+        if obj.variants.get('original'):
+            return obj.variants['original']
         if obj.image:
             # Return the complete Cloudinary URL
             return f"https://res.cloudinary.com/{settings.CLOUDINARY_STORAGE['CLOUD_NAME']}/image/upload/{obj.public_id}"
@@ -44,18 +48,32 @@ class CategorySerializer(serializers.ModelSerializer):
 
 
 
+class ProductPriceListSerializer(serializers.ListSerializer):
+    """ Loads the price and rating rows for a whole page of products in one query each """
+
+    def to_representation(self, data):
+        products = list(data.all() if hasattr(data, 'all') else data)
+        PriceEngine.attach(products, self.child.get_currency())
+        # No-op for products fetched with select_related('rating_summary')
+        prefetch_related_objects(products, 'rating_summary')
+        return super().to_representation(products)
+
+
 class ProductListSerializer(serializers.ModelSerializer):
     """ Serializer for listing products with minimal data """
     category = CategorySerializer(read_only=True)
     primary_image = serializers.SerializerMethodField()
     price_data = serializers.SerializerMethodField()
+    rating = serializers.SerializerMethodField()
 
 
     class Meta:
         model = Product
         fields = [
-            'id', 'name', 'slug', 'category', 'price_data', 'is_featured', 'primary_image'
+            'id', 'name', 'slug', 'category', 'price_data', 'is_featured', 'primary_image',
+            'rating'
         ]
+        list_serializer_class = ProductPriceListSerializer
 
 
     def get_primary_image(self, obj):
@@ -63,80 +81,67 @@ class ProductListSerializer(serializers.ModelSerializer):
         if primary_image:
             return ProductImageSerializer(primary_image).data
         return None
+
+
+    def get_rating(self, obj):
+        """ Average and count from the denormalized rating summary """
+        summary = getattr(obj, 'rating_summary', None)
+        if summary is None:
+            return {'average': 0, 'count': 0}
+        return {'average': round(summary.average, 1), 'count': summary.rating_count}
+
+
+    def get_currency(self):
+        """ Requested currency, falling back to the base currency """
+        if '_currency' not in self.context:
+            request = self.context.get('request', None)
+            currency = request.GET.get('currency', 'USD') if request else 'USD'
+            currencies = CurrencyConverter.get_active_currencies()
+            self.context['_currencies'] = currencies
+            self.context['_currency'] = currency if currency in currencies else 'USD'
+        return self.context['_currency']
+
+
+    def format_amount(self, amount, currency):
+        symbol = self.context['_currencies'][currency].symbol
+        return f"{symbol}{amount:,.2f}"
     
 
     def get_price_data(self, obj):
-        request = self.context.get('request', None)
-        currency = request.GET.get('currency', 'USD') if request else 'USD'
-        
-        try:
-            currencies = CurrencyConverter.get_active_currencies()
-            if currency not in currencies:
-                currency = 'USD'
-            
-            # Get the currency info
-            currency_info = currencies[currency]
-
-            # Convert the price to the requested currency
-            regular_price = CurrencyConverter.convert_price(
-                amount=obj.price,
-                from_currency='USD',
-                to_currency=currency
-            )
-
-            # Handle discount price
-            discount_price = None
-            if obj.discount_price:
-                discount_price = CurrencyConverter.convert_price(
-                    amount=obj.discount_price,
-                    from_currency='USD',
-                    to_currency=currency
-                )
-            
-            data = {
-                'amount': regular_price,
-                'currency': currency,
-                'formatted': CurrencyConverter.format_price(
-                    amount=regular_price,
-                    currency_code=currency,
-                    include_symbol=True
-                ),
-                'is_discounted': bool(discount_price),
-                'discount_amount': discount_price,
-                'discount_formatted': (
-                    CurrencyConverter.format_price(
-                        amount=discount_price,
-                        currency_code=currency,
-                        include_symbol=True
-                    ) if discount_price else None
-                ),
-                'savings_percentage': None
-            }
-
-            # Calculate savings percentage if discounted
-            if discount_price:
-                savings = ((regular_price - discount_price) / regular_price) * 100
-                data['savings_percentage'] = round(savings, 2)
-            
-            return data
-        
-        except ValueError as e:
-            logger.error(f"Price conversion failed: {str(e)}")
-
-        # Return USD prices as fallback
-        return {
-            'amount': obj.price,
-            'currency': 'USD',
-            'formatted': CurrencyConverter.format_price(obj.price, 'USD'),
-            'is_discounted': bool(obj.discount_price),
-            'discount_amount': obj.discount_price,
+        currency = self.get_currency()
+        row = PriceEngine.get(obj, currency)
+
+        if row is None:
+            # Product without a price row (e.g. not saved yet); use USD fields
+            currency = 'USD'
+            amount, sale_price = obj.price, obj.discount_price
+            source, valid_until = None, None
+        else:
+            amount, sale_price = row.list_price, row.sale_price
+            source, valid_until = row.source, row.valid_until
+
+        is_discounted = bool(sale_price) and sale_price < amount
+        data = {
+            'amount': amount,
+            'currency': currency,
+            'formatted': self.format_amount(amount, currency),
+            'is_discounted': is_discounted,
+            'discount_amount': sale_price if is_discounted else None,
             'discount_formatted': (
-                CurrencyConverter.format_price(
-                    obj.discount_price, 'USD') if obj.discount_price else None,
+                self.format_amount(sale_price, currency) if is_discounted else None
             ),
-            'savings_percentage': None
+            'savings_percentage': None,
+            'price_source': source,
+            'sale_ends_at': valid_until,
         }
 
+        # Calculate savings percentage if discounted
+        if is_discounted:
+            savings = ((amount - sale_price) / amount) * 100
+            data['savings_percentage'] = round(savings, 2)
+
+        return data
+
 
 class ProductDetailsSerializer(ProductListSerializer):
     """ Serializer for detailed product view """
@@ -1,21 +1,86 @@
 from django.db.models.signals import post_save, post_delete
+from django.db import transaction
 from django.dispatch import receiver
-from .models import Product, Category
+from .models import Product, Category, ProductImage, FlashSale, FlashSaleProduct, get_categories
+from .autocomplete import ProductAutocomplete
+from .pricing import PriceEngine
+from currencies.models import Currency
+from currencies.signals import exchange_rates_updated
 from utils.cache import invalidate_product_cache, invalidate_category_cache
 
 
+def listing_changed(update_fields):
+    """ Whether a save can change what listings and autocomplete show """
+    return update_fields is None or bool(Product.LISTING_FIELDS.intersection(update_fields))
+
+
+def purge_listing_caches(product_id, category_id):
+    """ Clear product and category caches, purging product lists once """
+    invalidate_product_cache(product_id)
+    invalidate_category_cache(category_id, product_lists=False)
+
+
 @receiver([post_save, post_delete], sender=Product)
-def invalidate_product_caches(sender, instance, **Kwargs):
-    """ Invalidate caches when a product is saved or deleted """
-    invalidate_product_cache(instance.id)
-    if instance.category:
-        invalidate_category_cache(instance.category.id)
+def invalidate_product_caches(sender, instance, update_fields=None, **kwargs):
+    """ Invalidate caches once a listed field change commits; stock writes skip this """
+    if not listing_changed(update_fields):
+        return
+    product_id, category_id = instance.id, instance.category_id
+    transaction.on_commit(lambda: purge_listing_caches(product_id, category_id))
 
 
 @receiver([post_save, post_delete], sender=Category)
 def invalidate_category_caches(sender, instance, **kwargs):
     """ Invalidate caches when a category is saved or deleted """
-    invalidate_category_cache(instance.id)
-    # Also invalidate product caches as they might display category info
-    for product in instance.products.all():
-        invalidate_product_cache(product.id)
\ No newline at end of file
+    # Product caches too, as they display category info
+    category_id = instance.id
+    transaction.on_commit(get_categories.invalidate)
+    transaction.on_commit(lambda: purge_listing_caches(None, category_id))
+
+
+@receiver([post_save, post_delete], sender=Product)
+def update_product_autocomplete(sender, instance, update_fields=None, **kwargs):
+    """ Apply product changes to the autocomplete index once committed """
+    if not listing_changed(update_fields):
+        return
+    product_id = instance.id
+    transaction.on_commit(lambda: ProductAutocomplete.product_changed(product_id))
+
+
+@receiver([post_save, post_delete], sender=ProductImage)
+def update_product_image_autocomplete(sender, instance, **kwargs):
+    """ Primary image changes alter the autocomplete payload """
+    product_id = instance.product_id
+    transaction.on_commit(lambda: ProductAutocomplete.product_changed(product_id))
+
+
+@receiver(post_save, sender=Product)
+def update_product_prices(sender, instance, **kwargs):
+    """ Rebuild the product's price rows when its price fields change """
+    if getattr(instance, '_price_changed', True):
+        PriceEngine.refresh_on_commit([instance.id])
+
+
+@receiver([post_save, post_delete], sender=FlashSaleProduct)
+def update_flash_sale_product_prices(sender, instance, **kwargs):
+    """ Adding or removing a product from a running sale changes its price """
+    if FlashSale.objects.filter(id=instance.flash_sale_id, status='active').exists():
+        PriceEngine.refresh_on_commit([instance.product_id])
+
+
+@receiver(post_save, sender=FlashSale)
+def update_flash_sale_prices(sender, instance, **kwargs):
+    """ Status or discount changes affect every product in the sale """
+    PriceEngine.refresh_on_commit(PriceEngine.products_in_sales([instance.id]))
+
+
+@receiver([post_save, post_delete], sender=Currency)
+def update_currency_prices(sender, instance, **kwargs):
+    """ Exchange rate changes reprice the catalog in that currency """
+    PriceEngine.refresh_on_commit(currency_codes=[instance.code])
+
+
+@receiver(exchange_rates_updated)
+def update_ingested_currency_prices(sender, codes, **kwargs):
+    """ Batched rate ingestion reprices the catalog in the changed currencies """
+    PriceEngine.refresh_on_commit(currency_codes=codes)
@@ -0,0 +1,114 @@
+from django.test import TestCase
+from django.core.cache import cache
+from unittest.mock import patch
+from decimal import Decimal
+from ..models import Category, Product, ProductImage
+from ..autocomplete import ProductAutocomplete
+
+
+class ProductAutocompleteTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.category = Category.objects.create(name='Straight Hairs')
+        self.bundle = Product.objects.create(
+            name='Silky Straight Bundle',
+            category=self.category,
+            description='Raw hair',
+            price=Decimal('120.00'),
+            stock=10
+        )
+        self.wig = Product.objects.create(
+            name='Straight Lace Wig',
+            category=self.category,
+            description='Lace front',
+            price=Decimal('250.00'),
+            stock=10
+        )
+        ProductImage.objects.create(
+            product=self.wig,
+            image='wig.jpg',
+            public_id='products/wig',
+            is_primary=True
+        )
+        ProductAutocomplete.rebuild()
+
+
+    def test_prefix_match_on_any_word(self):
+        results = ProductAutocomplete.suggest('stra')
+        self.assertEqual(
+            {result['id'] for result in results}, {self.bundle.id, self.wig.id}
+        )
+        # Names starting with the query come first
+        self.assertEqual(results[0]['id'], self.wig.id)
+
+
+    def test_all_words_must_match(self):
+        results = ProductAutocomplete.suggest('bundle stra')
+        self.assertEqual([result['id'] for result in results], [self.bundle.id])
+        self.assertEqual(results[0]['type'], 'suggestion')
+
+        results = ProductAutocomplete.suggest('silky straight')
+        self.assertEqual(results[0]['type'], 'exact')
+
+
+    def test_payload_includes_primary_image(self):
+        results = {result['id']: result for result in ProductAutocomplete.suggest('lace')}
+        self.assertEqual(results[self.wig.id]['slug'], self.wig.slug)
+        self.assertEqual(results[self.wig.id]['primary_image']['public_id'], 'products/wig')
+
+
+    def test_lookup_does_not_query_database(self):
+        ProductAutocomplete.suggest('silky')
+        with self.assertNumQueries(0):
+            ProductAutocomplete.suggest('straight')
+
+
+    def test_product_signals_update_index(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.bundle.is_available = False
+            self.bundle.save()
+            Product.objects.create(
+                name='Kinky Curly Bundle',
+                category=self.category,
+                description='Curly hair',
+                price=Decimal('140.00'),
+                stock=5
+            )
+
+        names = [result['name'] for result in ProductAutocomplete.suggest('bundle')]
+        self.assertEqual(names, ['Kinky Curly Bundle'])
+
+
+    @patch('utils.cache.delete_pattern')
+    def test_stock_writes_skip_cache_and_index_work(self, mock_delete_pattern):
+        ProductAutocomplete.suggest('silky')
+        version = cache.get(ProductAutocomplete.VERSION_KEY)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.bundle.update_stock(5, 'restock')
+        self.assertEqual(cache.get(ProductAutocomplete.VERSION_KEY), version)
+        mock_delete_pattern.assert_not_called()
+
+        # Listed fields purge product lists once, after commit
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.bundle.name = 'Silky Bone Straight Bundle'
+            self.bundle.save()
+            mock_delete_pattern.assert_not_called()
+        for callback in callbacks:
+            callback()
+        mock_delete_pattern.assert_called_once_with('product_list*')
+        self.assertNotEqual(cache.get(ProductAutocomplete.VERSION_KEY), version)
+
+
+    def test_replays_changes_from_other_workers(self):
+        # Another worker renames a product and records the change
+        Product.objects.filter(pk=self.bundle.pk).update(name='Body Wave Bundle')
+        version = cache.incr(ProductAutocomplete.VERSION_KEY)
+        cache.set(ProductAutocomplete.CHANGE_KEY.format(version), self.bundle.pk)
+
+        ProductAutocomplete._checked_at = 0.0
+        self.assertEqual(ProductAutocomplete.suggest('silky'), [])
+        self.assertEqual(
+            [result['id'] for result in ProductAutocomplete.suggest('body wave')],
+            [self.bundle.id]
+        )
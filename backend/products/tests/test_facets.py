@@ -0,0 +1,79 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from decimal import Decimal
+from ..models import Category, Product
+
+
+class ProductFacetsTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse('product-facets')
+        straight = Category.objects.create(name='Straight Hairs')
+        curly = Category.objects.create(name='Curly Hairs')
+
+        Product.objects.create(
+            name='Raw Straight 10', category=straight, description='Straight',
+            hair_type='raw', length=10, price=Decimal('40.00'), stock=5
+        )
+        Product.objects.create(
+            name='Virgin Straight 20', category=straight, description='Straight',
+            hair_type='virgin', length=20, price=Decimal('150.00'), stock=5
+        )
+        Product.objects.create(
+            name='Virgin Curly 20', category=curly, description='Curly',
+            hair_type='virgin', length=20, price=Decimal('180.00'), stock=5,
+            is_featured=True
+        )
+        Product.objects.create(
+            name='Hidden Curly', category=curly, description='Curly',
+            hair_type='raw', length=30, price=Decimal('600.00'), stock=5,
+            is_available=False
+        )
+
+
+    def counts(self, facet, key):
+        return {entry[key]: entry['count'] for entry in facet}
+
+
+    def test_facet_counts_for_all_products(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        data = response.data
+        self.assertEqual(data['total'], 3)
+        self.assertEqual(
+            self.counts(data['categories'], 'slug'),
+            {'straight-hairs': 2, 'curly-hairs': 1}
+        )
+        self.assertEqual(
+            self.counts(data['hair_types'], 'value'),
+            {'raw': 1, 'virgin': 2, 'single donor': 0}
+        )
+        lengths = self.counts(data['lengths'], 'key')
+        self.assertEqual(lengths['up_to_12'], 1)
+        self.assertEqual(lengths['19_24'], 2)
+        bands = self.counts(data['price_bands'], 'key')
+        self.assertEqual(bands['under_50'], 1)
+        self.assertEqual(bands['100_200'], 2)
+        self.assertEqual(bands['500_plus'], 0)
+
+
+    def test_facet_counts_follow_current_filters(self):
+        response = self.client.get(f"{self.url}?hair_type=virgin")
+        data = response.data
+        self.assertEqual(data['total'], 2)
+        self.assertEqual(
+            self.counts(data['categories'], 'slug'),
+            {'straight-hairs': 1, 'curly-hairs': 1}
+        )
+
+        response = self.client.get(f"{self.url}?is_featured=true")
+        self.assertEqual(response.data['total'], 1)
+
+
+    def test_facets_use_single_grouped_query(self):
+        self.client.get(self.url)  # Warm the currency cache
+        with self.assertNumQueries(1):
+            self.client.get(self.url)
@@ -0,0 +1,292 @@
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from concurrent.futures import ThreadPoolExecutor
+from unittest import skipIf
+from unittest.mock import patch
+from datetime import timedelta
+from decimal import Decimal
+from users.models import User
+from orders.models import Order
+from cart.models import Cart
+from ..models import Category, Product, FlashSale, FlashSaleProduct, FlashSalePurchase
+from ..flash_sales import FlashSaleInventory, FlashSaleClaimError, FlashSaleScheduler
+from django.core.cache import cache
+import os
+
+try:
+    import fakeredis
+except ImportError:
+    fakeredis = None
+
+
+def redis_client():
+    """ Local Redis when REDIS_TEST_URL is set, otherwise fakeredis """
+    url = os.getenv('REDIS_TEST_URL')
+    if url:
+        import redis
+        client = redis.Redis.from_url(url)
+        client.flushdb()
+        return client
+    return fakeredis.FakeRedis(server=fakeredis.FakeServer())
+
+
+class FlashSaleTestMixin:
+    def create_sale(self, quantity_limit=5, per_customer=2, total_limit=None):
+        category = Category.objects.create(name='Flash Category')
+        self.product = Product.objects.create(
+            name='Flash Bundle', category=category, description='Bundle',
+            price=Decimal('100.00'), stock=10000
+        )
+        now = timezone.now()
+        self.flash_sale = FlashSale.objects.create(
+            name='Midnight Sale',
+            start_time=now - timedelta(hours=1),
+            end_time=now + timedelta(hours=1),
+            discount_type='percentage',
+            discount_value=Decimal('20'),
+            status='active',
+            max_quantity_per_customer=per_customer,
+            total_quantity_limit=total_limit
+        )
+        self.sale_product = FlashSaleProduct.objects.create(
+            flash_sale=self.flash_sale,
+            product=self.product,
+            quantity_limit=quantity_limit
+        )
+
+
+    def create_user(self, index):
+        return User.objects.create_user(
+            email=f'buyer{index}@example.com',
+            username=f'buyer{index}',
+            password='buyerpass123',
+            first_name='Flash',
+            last_name='Buyer'
+        )
+
+
+@skipIf(fakeredis is None and not os.getenv('REDIS_TEST_URL'), 'Requires fakeredis or REDIS_TEST_URL')
+class FlashSaleInventoryTest(FlashSaleTestMixin, TestCase):
+    def setUp(self):
+        self.redis = redis_client()
+        self.create_sale()
+        self.user = self.create_user(1)
+
+
+    def test_claim_applies_sale_price_and_limits(self):
+        claim = FlashSaleInventory.claim(self.sale_product, self.user.id, 2, client=self.redis)
+        self.assertEqual(claim.price, Decimal('80.00'))
+        self.assertEqual(claim.remaining, 3)
+
+        with self.assertRaises(FlashSaleClaimError) as context:
+            FlashSaleInventory.claim(self.sale_product, self.user.id, 1, client=self.redis)
+        self.assertEqual(context.exception.code, 'limit_exceeded')
+
+
+    def test_sold_out_is_reported_without_database(self):
+        FlashSaleInventory.load(self.flash_sale, client=self.redis)
+        for index in range(2, 5):
+            buyer_id = self.create_user(index).id
+            FlashSaleInventory.claim(self.sale_product, buyer_id, 2 if index < 4 else 1, client=self.redis)
+
+        with self.assertNumQueries(0):
+            with self.assertRaises(FlashSaleClaimError) as context:
+                FlashSaleInventory.claim(self.sale_product, self.user.id, 1, client=self.redis)
+        self.assertEqual(context.exception.code, 'sold_out')
+
+
+    def test_release_returns_units(self):
+        claim = FlashSaleInventory.claim(self.sale_product, self.user.id, 2, client=self.redis)
+        FlashSaleInventory.release(claim, client=self.redis)
+
+        self.assertEqual(FlashSaleInventory.remaining(self.flash_sale.id, client=self.redis), {self.product.id: 5})
+        FlashSaleInventory.claim(self.sale_product, self.user.id, 2, client=self.redis)
+
+
+    def test_flush_writes_purchases_and_quantity_sold(self):
+        order = Order.objects.create(user=self.user, total_amount=Decimal('160.00'), shipping_address='Lagos')
+        claim = FlashSaleInventory.claim(self.sale_product, self.user.id, 2, client=self.redis)
+        with self.captureOnCommitCallbacks(execute=True):
+            FlashSaleInventory.record([claim], order.id, client=self.redis)
+
+        self.assertEqual(FlashSaleInventory.flush_purchases(client=self.redis), 1)
+
+        purchase = FlashSalePurchase.objects.get()
+        self.assertEqual(purchase.quantity, 2)
+        self.assertEqual(purchase.price_at_purchase, Decimal('80.00'))
+        self.sale_product.refresh_from_db()
+        self.assertEqual(self.sale_product.quantity_sold, 2)
+
+
+    def test_reload_accounts_for_queued_purchases(self):
+        order = Order.objects.create(user=self.user, total_amount=Decimal('160.00'), shipping_address='Lagos')
+        claim = FlashSaleInventory.claim(self.sale_product, self.user.id, 2, client=self.redis)
+        with self.captureOnCommitCallbacks(execute=True):
+            FlashSaleInventory.record([claim], order.id, client=self.redis)
+
+        FlashSaleInventory.load(self.flash_sale, client=self.redis)
+        self.assertEqual(FlashSaleInventory.remaining(self.flash_sale.id, client=self.redis), {self.product.id: 3})
+
+
+@skipIf(fakeredis is None and not os.getenv('REDIS_TEST_URL'), 'Requires fakeredis or REDIS_TEST_URL')
+class FlashSaleLoadTest(FlashSaleTestMixin, TestCase):
+    BUYERS = 3000
+    UNITS = 250
+
+    def test_concurrent_buyers_never_oversell(self):
+        client = redis_client()
+        self.create_sale(quantity_limit=self.UNITS, per_customer=1)
+        FlashSaleInventory.load(self.flash_sale, client=client)
+
+        def buy(user_id):
+            try:
+                return FlashSaleInventory.claim(self.sale_product, user_id, 1, client=client)
+            except FlashSaleClaimError as e:
+                return e.code
+
+        users = User.objects.bulk_create([
+            User(email=f'buyer{index}@example.com', username=f'buyer{index}')
+            for index in range(self.BUYERS)
+        ])
+        user_ids = User.objects.values_list('id', flat=True)
+
+        # Every buyer tries twice; the per-customer limit must hold too
+        buyer_ids = [user_id for user_id in user_ids for _ in range(2)]
+        with ThreadPoolExecutor(max_workers=64) as executor:
+            results = list(executor.map(buy, buyer_ids))
+
+        claims = [result for result in results if not isinstance(result, str)]
+        self.assertEqual(len(claims), self.UNITS)
+        self.assertEqual(len({claim.user_id for claim in claims}), self.UNITS)
+        self.assertEqual(
+            FlashSaleInventory.remaining(self.flash_sale.id, client=client),
+            {self.product.id: 0}
+        )
+        self.assertEqual(
+            len(results) - len(claims),
+            results.count('sold_out') + results.count('limit_exceeded')
+        )
+
+        # Write back in batches
+        order = Order.objects.create(user=users[0], total_amount=Decimal('0'), shipping_address='Lagos')
+        with self.captureOnCommitCallbacks(execute=True):
+            FlashSaleInventory.record(claims, order.id, client=client)
+
+        written = 0
+        while True:
+            flushed = FlashSaleInventory.flush_purchases(batch_size=100, client=client)
+            if not flushed:
+                break
+            written += flushed
+
+        self.assertEqual(written, self.UNITS)
+        self.sale_product.refresh_from_db()
+        self.assertEqual(self.sale_product.quantity_sold, self.UNITS)
+
+
+class FlashSaleCheckoutTest(FlashSaleTestMixin, TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.create_sale(quantity_limit=3, per_customer=2)
+        self.user = self.create_user(1)
+        Cart.objects.create(user=self.user)
+        self.client.force_authenticate(user=self.user)
+
+
+    def place_order(self, quantity):
+        return self.client.post(reverse('order-list'), {
+            'shipping_address': 'Lagos',
+            'items': [{'product_id': self.product.id, 'quantity': quantity}]
+        }, format='json')
+
+
+    @patch('orders.views.send_order_status_email')
+    def test_checkout_charges_sale_price_and_enforces_limit(self, mock_email):
+        response = self.place_order(2)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Decimal(response.data['total_amount']), Decimal('160.00'))
+
+        purchase = FlashSalePurchase.objects.get()
+        self.assertEqual(purchase.quantity, 2)
+
+        response = self.place_order(1)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Order.objects.count(), 1)
+
+
+    @patch('orders.views.send_order_status_email')
+    def test_duplicate_lines_are_claimed_together(self, mock_email):
+        def post(*quantities):
+            return self.client.post(reverse('order-list'), {
+                'shipping_address': 'Lagos',
+                'items': [
+                    {'product_id': self.product.id, 'quantity': quantity}
+                    for quantity in quantities
+                ]
+            }, format='json')
+
+        # Over the per-customer limit combined; nothing stays claimed
+        response = post(1, 2)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = post(1, 1)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Decimal(response.data['total_amount']), Decimal('160.00'))
+        item = Order.objects.get().items.get()
+        self.assertEqual(item.quantity, 2)
+        self.assertEqual(FlashSalePurchase.objects.get().quantity, 2)
+
+
+@patch('products.flash_sales.FlashSaleScheduler._notify')
+class FlashSaleSchedulerTest(FlashSaleTestMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+        self.create_sale()
+        self.now = timezone.now()
+        FlashSale.objects.filter(pk=self.flash_sale.pk).update(
+            status='scheduled',
+            start_time=self.now + timedelta(minutes=1),
+            end_time=self.now + timedelta(hours=1)
+        )
+
+
+    def test_starts_and_ends_sales_on_time(self, mock_notify):
+        result = FlashSaleScheduler.run_pending(now=self.now)
+        self.assertEqual(result, {'activated': [], 'ended': []})
+        self.assertEqual(FlashSaleScheduler.active_prices(), {})
+
+        result = FlashSaleScheduler.run_pending(now=self.now + timedelta(minutes=2))
+        self.assertEqual(result['activated'], [self.flash_sale.id])
+        self.flash_sale.refresh_from_db()
+        self.assertEqual(self.flash_sale.status, 'active')
+        self.assertEqual(
+            FlashSaleScheduler.active_prices()[self.product.id]['price'],
+            Decimal('80.00')
+        )
+        mock_notify.assert_called_once_with([self.flash_sale.id], [])
+
+        result = FlashSaleScheduler.run_pending(now=self.now + timedelta(hours=2))
+        self.assertEqual(result['ended'], [self.flash_sale.id])
+        self.flash_sale.refresh_from_db()
+        self.assertEqual(self.flash_sale.status, 'ended')
+        self.assertEqual(FlashSaleScheduler.active_prices(), {})
+
+
+    def test_cancelled_sales_are_left_alone(self, mock_notify):
+        FlashSale.objects.filter(pk=self.flash_sale.pk).update(status='cancelled')
+        result = FlashSaleScheduler.run_pending(now=self.now + timedelta(minutes=2))
+        self.assertEqual(result, {'activated': [], 'ended': []})
+        mock_notify.assert_not_called()
+
+
+    def test_sleeps_until_next_transition(self, mock_notify):
+        FlashSaleScheduler.run_pending(now=self.now)
+        self.assertAlmostEqual(FlashSaleScheduler.seconds_until_next(now=self.now), 30)
+
+        FlashSale.objects.filter(pk=self.flash_sale.pk).update(
+            start_time=self.now + timedelta(seconds=FlashSaleScheduler.WARM_AHEAD + 10)
+        )
+        self.assertAlmostEqual(FlashSaleScheduler.seconds_until_next(now=self.now), 10)
@@ -4,6 +4,8 @@ from django.core.exceptions import ValidationError
 from decimal import Decimal
 from ..models import Category, Product, ProductImage, StockHistory
 from users.models import User
+from unittest.mock import patch
+import cloudinary
 import time
 
 
@@ -104,6 +106,37 @@ class ProductTest(TestCase):
         )
 
 
+    def test_stock_update_skips_price_work(self):
+        product = Product.objects.create(**self.product_data)
+
+        with patch('products.signals.PriceEngine.refresh_on_commit') as mock_refresh, \
+                patch('products.models.cache.delete') as mock_delete:
+            product.update_stock(quantity_changed=-1, transaction_type='order')
+
+        mock_refresh.assert_not_called()
+        deleted_keys = [call.args[0] for call in mock_delete.call_args_list]
+        self.assertFalse([key for key in deleted_keys if 'price' in key])
+        product.refresh_from_db()
+        self.assertEqual(product.price_version, 1)
+
+
+    def test_price_change_bumps_price_version(self):
+        product = Product.objects.create(**self.product_data)
+
+        product.is_featured = False
+        product.save()
+        self.assertEqual(product.price_version, 1)
+
+        with patch('products.signals.PriceEngine.refresh_on_commit') as mock_refresh:
+            product.price = Decimal('189.99')
+            product.save()
+
+        mock_refresh.assert_called_once_with([product.id])
+        product = Product.objects.get(pk=product.pk)
+        self.assertEqual(product.price_version, 2)
+        self.assertFalse(product.price_fields_changed())
+
+
     def test_low_stock_threshold(self):
         product = Product.objects.create(**self.product_data)
         initial_stock = product.stock
@@ -235,4 +268,19 @@ class ProductImageTest(TestCase):
         image2.refresh_from_db()
 
         self.assertFalse(image1.is_primary)
-        self.assertTrue(image2.is_primary)
\ No newline at end of file
+        self.assertTrue(image2.is_primary)
+
+    @patch.multiple(cloudinary.config(), cloud_name='test-cloud', api_key='key', api_secret='secret')
+    def test_variants_precomputed_on_save(self):
+        image = ProductImage.objects.create(
+            product=self.product,
+            image='test.jpg',
+            public_id='products/test'
+        )
+
+        image.refresh_from_db()
+        for name in ['original', 'thumbnail', 'card', 'preview', 'zoom']:
+            self.assertIn(name, image.variants)
+            self.assertIn('products/test', image.variants[name])
+        self.assertIn('c_fill', image.variants['thumbnail'])
+        self.assertEqual(image.get_variant_url('zoom'), image.variants['zoom'])
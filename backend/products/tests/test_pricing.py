@@ -0,0 +1,110 @@
+from django.test import TestCase
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory
+from datetime import timedelta
+from decimal import Decimal
+from currencies.models import Currency
+from ..models import Category, Product, ProductPrice, FlashSale, FlashSaleProduct
+from ..pricing import PriceEngine
+from ..serializers import ProductListSerializer
+
+
+class PriceEngineTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        Currency.objects.create(
+            code='USD', name='US Dollar', symbol='$', exchange_rate=Decimal('1.00')
+        )
+        self.ngn = Currency.objects.create(
+            code='NGN', name='Nigerian Naira', symbol='₦', exchange_rate=Decimal('1500.00')
+        )
+        category = Category.objects.create(name='Straight Hairs')
+        self.product = Product.objects.create(
+            name='Raw Straight 20', category=category, description='Straight',
+            price=Decimal('200.00'), discount_price=Decimal('180.00'), stock=5
+        )
+        self.other = Product.objects.create(
+            name='Raw Straight 24', category=category, description='Straight',
+            price=Decimal('250.00'), stock=5
+        )
+
+
+    def test_rebuild_materializes_every_currency(self):
+        PriceEngine.rebuild()
+
+        row = ProductPrice.objects.get(product=self.product, currency_code='NGN')
+        self.assertEqual(row.list_price, Decimal('300000.00'))
+        self.assertEqual(row.sale_price, Decimal('270000.00'))
+        self.assertEqual(row.source, ProductPrice.SOURCE_DISCOUNT)
+        self.assertEqual(ProductPrice.objects.count(), 4)
+
+
+    def test_active_flash_sale_wins_and_expires_with_sale(self):
+        now = timezone.now()
+        flash_sale = FlashSale.objects.create(
+            name='Midnight Sale', start_time=now - timedelta(hours=1),
+            end_time=now + timedelta(hours=1), discount_type='percentage',
+            discount_value=Decimal('25'), status='active'
+        )
+        FlashSaleProduct.objects.create(flash_sale=flash_sale, product=self.product)
+        PriceEngine.rebuild()
+
+        row = PriceEngine.prices_for([self.product.id])[self.product.id]
+        self.assertEqual(row.sale_price, Decimal('150.00'))
+        self.assertEqual(row.source, ProductPrice.SOURCE_FLASH_SALE)
+        self.assertEqual(row.valid_until, flash_sale.end_time)
+
+        FlashSale.objects.filter(pk=flash_sale.pk).update(status='ended')
+        PriceEngine.rebuild([self.product.id])
+        row = PriceEngine.prices_for([self.product.id])[self.product.id]
+        self.assertEqual(row.source, ProductPrice.SOURCE_DISCOUNT)
+        self.assertIsNone(row.valid_until)
+
+
+    def test_price_change_and_rate_change_rebuild_rows(self):
+        PriceEngine.rebuild()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.other.price = Decimal('300.00')
+            self.other.save()
+        self.assertEqual(
+            PriceEngine.effective_price(self.other, 'USD'), Decimal('300.00')
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.ngn.exchange_rate = Decimal('1600.00')
+            self.ngn.save()
+        self.assertEqual(
+            PriceEngine.prices_for([self.other.id], 'NGN')[self.other.id].sale_price,
+            Decimal('480000.00')
+        )
+
+
+    def test_missing_rows_are_built_on_read(self):
+        self.assertFalse(ProductPrice.objects.exists())
+        prices = PriceEngine.effective_prices([self.product.id, self.other.id])
+        self.assertEqual(prices, {
+            self.product.id: Decimal('180.00'),
+            self.other.id: Decimal('250.00'),
+        })
+
+
+    def test_list_serializer_reads_prices_in_one_query(self):
+        PriceEngine.rebuild()
+        request = APIRequestFactory().get('/', {'currency': 'NGN'})
+        products = list(Product.objects.select_related('category'))
+
+        with CaptureQueriesContext(connection) as queries:
+            data = ProductListSerializer(products, many=True, context={'request': request}).data
+
+        price_queries = [q for q in queries if 'products_productprice' in q['sql']]
+        self.assertEqual(len(price_queries), 1)
+
+        by_id = {item['id']: item['price_data'] for item in data}
+        self.assertEqual(by_id[self.product.id]['currency'], 'NGN')
+        self.assertEqual(by_id[self.product.id]['discount_amount'], Decimal('270000.00'))
+        self.assertEqual(by_id[self.product.id]['price_source'], 'discount')
+        self.assertFalse(by_id[self.other.id]['is_discounted'])
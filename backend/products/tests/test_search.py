@@ -0,0 +1,91 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from decimal import Decimal
+from ..models import Category, Product
+from ..search import ProductSearch
+
+
+class ProductSearchTest(TestCase):
+    def setUp(self):
+        self.category = Category.objects.create(name='Straight Hairs')
+        self.name_match = Product.objects.create(
+            name='Silky Straight Bundle',
+            category=self.category,
+            description='Raw hair bundle',
+            price=Decimal('120.00'),
+            stock=10
+        )
+        self.description_match = Product.objects.create(
+            name='Body Wave Closure',
+            category=self.category,
+            description='Blends well with silky bundles',
+            price=Decimal('90.00'),
+            stock=10
+        )
+        Product.objects.create(
+            name='Edge Brush',
+            category=self.category,
+            description='Styling tool',
+            price=Decimal('10.00'),
+            stock=10
+        )
+
+
+    def test_search_matches_name_and_description(self):
+        results = ProductSearch.search(Product.objects.all(), 'silky')
+        self.assertEqual(
+            set(results), {self.name_match, self.description_match}
+        )
+
+
+    def test_name_matches_rank_higher(self):
+        results = list(
+            ProductSearch.search(Product.objects.all(), 'silky').order_by('-search_rank')
+        )
+        self.assertEqual(results[0], self.name_match)
+
+
+    def test_all_terms_must_match(self):
+        results = ProductSearch.search(Product.objects.all(), 'silky closure')
+        self.assertEqual(list(results), [self.description_match])
+
+
+    def test_blank_search_returns_queryset(self):
+        self.assertEqual(ProductSearch.search(Product.objects.all(), '  ').count(), 3)
+
+
+class ProductSearchEndpointTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        category = Category.objects.create(name='Curly Hairs')
+        self.older = Product.objects.create(
+            name='Deep Curly Wig',
+            category=category,
+            description='Curly wig',
+            price=Decimal('200.00'),
+            stock=5
+        )
+        self.newer = Product.objects.create(
+            name='Kinky Straight Wig',
+            category=category,
+            description='Pairs with curly bundles',
+            price=Decimal('180.00'),
+            stock=5
+        )
+
+
+    def test_search_results_ordered_by_relevance(self):
+        response = self.client.get(f"{reverse('product-list')}?search=curly")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        names = [product['name'] for product in response.data['results']]
+        self.assertEqual(names, ['Deep Curly Wig', 'Kinky Straight Wig'])
+
+
+    def test_explicit_ordering_overrides_relevance(self):
+        response = self.client.get(
+            f"{reverse('product-list')}?search=curly&ordering=price"
+        )
+        names = [product['name'] for product in response.data['results']]
+        self.assertEqual(names, ['Kinky Straight Wig', 'Deep Curly Wig'])
@@ -97,7 +97,7 @@ class ProductListSerializerTest(TestCase):
         data = serializer.data
         expected_fields = {
             'id', 'name', 'slug', 'category',
-            'price_data', 'is_featured', 'primary_image'
+            'price_data', 'is_featured', 'primary_image', 'rating'
         }
         self.assertEqual(set(data.keys()), expected_fields)
 
@@ -4,7 +4,7 @@ from rest_framework import status
 from rest_framework.test import APIClient, APITestCase
 from decimal import Decimal
 from unittest.mock import patch
-from ..models import Category, Product, ProductImage
+from ..models import Category, Product, ProductImage, get_categories
 from ..serializers import CategorySerializer, ProductListSerializer, ProductDetailsSerializer
 
 # Mock currency data
@@ -18,6 +18,7 @@ MOCK_CURRENCIES = {
 
 class CategoryViewSetTests(APITestCase):
     def setUp(self):
+        get_categories.invalidate()
         self.client = APIClient()
         self.category_data = {
             'name': 'Straight Hairs',
@@ -50,6 +51,18 @@ class CategoryViewSetTests(APITestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
+    def test_reads_are_cached_until_a_category_changes(self):
+        """Test category reads skip the database until a save commits"""
+        self.client.get(self.list_url)
+        with self.assertNumQueries(0):
+            self.client.get(self.list_url)
+            self.client.get(self.detail_url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Category.objects.create(name='Curly Hairs')
+        response = self.client.get(self.list_url)
+        self.assertEqual(response.data['count'], 2)
+
 class ProductViewSetTests(APITestCase):
     def setUp(self):
         self.client = APIClient()
@@ -3,16 +3,21 @@
 from rest_framework import viewsets, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from django.http import Http404
 from django_filters.rest_framework import DjangoFilterBackend
-from .models import Category, Product
+from .models import Category, Product, ProductImage, get_categories
 from .serializers import (CategorySerializer, ProductListSerializer, ProductDetailsSerializer, ProductImageSerializer)
 from .pagination import ProductPagination
+from .search import ProductSearch, ProductSearchFilter, ProductOrderingFilter
+from .autocomplete import ProductAutocomplete
+from .facets import ProductFacets
 from currencies.utils import CurrencyConverter
 from decimal import Decimal
 from django.conf import settings
 from utils.cache import cache_response
 from rest_framework.decorators import action
-from django.db.models import Q
+from django.db.models import Q, F, Value, Prefetch
+from django.db.models.functions import Coalesce
 import decimal
 import logging
 
@@ -25,6 +30,20 @@ class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = CategorySerializer
     lookup_field = 'slug'
 
+
+    def get_queryset(self):
+        # Categories change rarely; saves and deletes invalidate this list
+        return get_categories()
+
+
+    def get_object(self):
+        slug = self.kwargs[self.lookup_field]
+        for category in self.get_queryset():
+            if category.slug == slug:
+                self.check_object_permissions(self.request, category)
+                return category
+        raise Http404
+
     @cache_response(
         timeout=settings.CACHE_TIMEOUTS['CATEGORY'],
         key_prefix='category_list'
@@ -47,8 +66,8 @@ class ProductViewSet(viewsets.ReadOnlyModelViewSet):
     lookup_field = 'slug'
     filter_backends = [
         DjangoFilterBackend,
-        filters.SearchFilter,
-        filters.OrderingFilter
+        ProductSearchFilter,
+        ProductOrderingFilter
     ]
     filterset_fields = {
         'category__slug': ['exact'],
@@ -57,7 +76,7 @@ class ProductViewSet(viewsets.ReadOnlyModelViewSet):
         'is_featured': ['exact']
     }
     search_fields = ['name', 'description']
-    ordering_fields = ['price', 'created_at']
+    ordering_fields = ['price', 'created_at', 'rating']
     ordering = ['-created_at']
 
 
@@ -80,33 +99,34 @@ class ProductViewSet(viewsets.ReadOnlyModelViewSet):
         if len(query) < 3:
             return Response([])
 
-        # Exact matches
-        exact_matches = self.get_queryset().filter(name__icontains=query)[:5]
-
-        # Suggestions (multiple matching strategies)
-        suggestions = self.get_queryset().filter(
-            name__istartswith=query
-        ).exclude(
-            name__icontains=query
-        )[:5]
-
-        # Combine and deduplicate
-        results = list(exact_matches) + list(suggestions)
+        # Served from the per-process prefix index, no database access
+        data = ProductAutocomplete.suggest(query)
+        if data:
+            return Response(data)
+
+        # Nothing starts with the query; fall back to typo-tolerant matching
+        matches = ProductSearch.fuzzy(
+            self.get_queryset(), query
+        ).prefetch_related(
+            Prefetch(
+                'images',
+                queryset=ProductImage.objects.filter(is_primary=True),
+                to_attr='primary_images'
+            )
+        )[:10]
 
-        # Serialize results
         data = [{
             'id': product.id,
             'name': product.name,
             'slug': product.slug,
             'primary_image': (
                 ProductImageSerializer(
-                    product.images.filter(is_primary=True).first(),
+                    product.primary_images[0],
                     context={'request': request}
-                ).data if product.images.filter(is_primary=True).exists()
-                else None
+                ).data if product.primary_images else None
             ),
-            'type': 'exact' if product in exact_matches else 'suggestion'
-        } for product in results[:10]]
+            'type': 'suggestion'
+        } for product in matches]
 
         return Response(data)
 
@@ -118,7 +138,12 @@ class ProductViewSet(viewsets.ReadOnlyModelViewSet):
     
 
     def get_queryset(self):
-        queryset = Product.objects.filter(is_available=True)
+        queryset = Product.objects.filter(is_available=True).select_related(
+            'rating_summary'
+        ).annotate(
+            # Sortable as ?ordering=-rating; unreviewed products count as 0
+            rating=Coalesce(F('rating_summary__average'), Value(0.0))
+        )
         min_price = self.request.query_params.get('min_price')
         max_price = self.request.query_params.get('max_price')
         currency = self.request.query_params.get('currency', 'USD')
@@ -148,6 +173,14 @@ class ProductViewSet(viewsets.ReadOnlyModelViewSet):
         return queryset
     
     
+    @action(detail=False)
+    def facets(self, request):
+        """ Facet counts (category, hair type, length, price band) for the current filters """
+        queryset = self.filter_queryset(self.get_queryset())
+        currency = request.query_params.get('currency', 'USD')
+        return Response(ProductFacets.compute(queryset, currency))
+
+
     @action(detail=False)
     def featured(self, request):
         """ Endpoint for fetching featured products """
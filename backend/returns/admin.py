@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Return, ReturnItem, ReturnImage, ReturnHistory, ReturnPolicy, ProductReturnPolicy
+from .models import Return, ReturnItem, ReturnImage, PendingReturnImage, ReturnHistory, ReturnPolicy, ProductReturnPolicy
 
 
 class ReturnImageInline(admin.TabularInline):
@@ -185,3 +185,11 @@ class ProductReturnPolicyAdmin(admin.ModelAdmin):
     list_display = ['product', 'is_returnable', 'return_window_days']
     list_filter = ['is_returnable']
     search_fields = ['product__name']
+
+
+@admin.register(PendingReturnImage)
+class PendingReturnImageAdmin(admin.ModelAdmin):
+    list_display = ['id', 'return_item', 'name', 'status', 'attempts', 'updated_at']
+    list_filter = ['status']
+    readonly_fields = ['return_item', 'name', 'attempts', 'last_error', 'created_at', 'updated_at']
+    exclude = ['data']
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class ReturnsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'returns'
+
+
+    def ready(self):
+        """ Import signals when app is ready """
+        import returns.signals
@@ -0,0 +1,139 @@
+# returns/eligibility.py
+
+from django.db.models import Prefetch, prefetch_related_objects
+from django.utils import timezone
+from dataclasses import dataclass, field
+from datetime import timedelta
+from decimal import Decimal
+from typing import List
+from orders.models import Order, OrderItem
+from .models import Return
+from .policies import ReturnPolicyResolver
+
+
+@dataclass
+class ReturnableItem:
+    """ An order item that can still be returned, with its effective terms """
+    item: OrderItem
+    return_window_days: int
+    restocking_fee: Decimal
+    returnable_until: object
+
+
+@dataclass
+class OrderEligibility:
+    order: Order
+    errors: List[str] = field(default_factory=list)
+    returnable_items: List[ReturnableItem] = field(default_factory=list)
+
+
+    @property
+    def is_eligible(self):
+        return not self.errors
+
+
+class ReturnEligibilityEngine:
+    """
+        Return eligibility for many orders at once
+
+        A batch costs two queries however many orders it holds: the
+        orders' items (with product names) and the orders that already have
+        a return. Policies come from ReturnPolicyResolver's cached map.
+    """
+
+
+    @classmethod
+    def evaluate(cls, orders, now=None):
+        """
+            Check every order in a batch
+
+            Args:
+                orders: Orders (or a queryset of them)
+                now: Evaluation time (defaults to timezone.now())
+
+            Returns:
+                List of OrderEligibility, in the orders' order
+        """
+        now = now or timezone.now()
+        orders = list(orders)
+        if not orders:
+            return []
+
+        policies = ReturnPolicyResolver.policies()
+        if policies is None:
+            return [OrderEligibility(order, ["Return policy not found"]) for order in orders]
+
+        prefetch_related_objects(orders, Prefetch(
+            'items',
+            queryset=OrderItem.objects.select_related('product').only(
+                'id', 'order_id', 'product_id', 'quantity', 'price', 'product__name'
+            )
+        ))
+        returned = set(Return.objects.filter(
+            order_id__in=[order.id for order in orders]
+        ).values_list('order_id', flat=True))
+
+        return [cls._check(order, policies, returned, now) for order in orders]
+
+
+    @classmethod
+    def _check(cls, order, policies, returned, now):
+        result = OrderEligibility(order)
+
+        if order.order_status != 'delivered':
+            result.errors.append("Order must be delivered before returning")
+        if not order.delivered_at:
+            result.errors.append("Order not delivered yet")
+        if order.id in returned:
+            result.errors.append("A return request already exists for this order")
+        if result.errors:
+            return result
+
+        days_since_delivery = (now - order.delivered_at).days
+        any_returnable = False
+        for item in order.items.all():
+            terms = policies.effective.get(item.product_id, policies.default)
+            if not terms.is_returnable:
+                continue
+            any_returnable = True
+
+            if days_since_delivery > terms.return_window_days:
+                continue
+
+            result.returnable_items.append(ReturnableItem(
+                item=item,
+                return_window_days=terms.return_window_days,
+                restocking_fee=terms.restocking_fee_percentage,
+                returnable_until=order.delivered_at + timedelta(days=terms.return_window_days + 1)
+            ))
+
+        if not any_returnable:
+            result.errors.append("No returnable items in order")
+        elif not result.returnable_items:
+            result.errors.append(
+                f"Return window of {policies.policy.return_window_days} days has expired"
+            )
+        return result
+
+
+    @classmethod
+    def eligible_orders(cls, user, now=None):
+        """
+            The user's orders that can be returned now
+
+            Only orders delivered within the longest return window any
+            product allows are loaded, so the cost follows recent orders
+            rather than the whole order history.
+        """
+        now = now or timezone.now()
+        policies = ReturnPolicyResolver.policies()
+        if policies is None:
+            return []
+
+        candidates = Order.objects.filter(
+            user=user,
+            order_status='delivered',
+            delivered_at__gte=now - timedelta(days=policies.longest_window + 1)
+        ).order_by('-delivered_at')
+
+        return [result for result in cls.evaluate(candidates, now) if result.is_eligible]
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from returns.media import ReturnMediaPipeline
+
+
+class Command(BaseCommand):
+    help = 'Retry return photo uploads that failed or never finished'
+
+    def handle(self, *args, **options):
+        result = ReturnMediaPipeline.retry_failed()
+        self.stdout.write(self.style.SUCCESS(
+            f'Attached {len(result.attached)} return images '
+            f'({len(result.failed)} still failing)'
+        ))
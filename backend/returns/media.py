@@ -0,0 +1,265 @@
+# returns/media.py
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction, connection
+from django.db.models import Q
+from django.utils import timezone
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import List
+from utils.cloudinary_utils import CloudinaryUploader
+from .models import ReturnImage, PendingReturnImage
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class UploadBatchResult:
+    """ Outcome of one upload batch """
+    attached: List[ReturnImage] = field(default_factory=list)
+    failed: List[int] = field(default_factory=list)  # PendingReturnImage ids
+
+
+class ReturnMediaPipeline:
+    """
+        Upload return photos off the request path
+
+        submit() stages each photo as a PendingReturnImage inside the
+        caller's transaction. Once it commits, the batch is claimed, uploaded
+        to Cloudinary on a bounded thread pool and the results are attached
+        as ReturnImage rows in one insert. Failed uploads stay staged and are
+        picked up again by retry_failed(). A claim older than STALE_AFTER is
+        taken over; the run that lost it destroys its uploads.
+    """
+    UPLOAD_OPTIONS = {
+        'transformation': [
+            {'quality': 'auto'},
+            {'fetch_format': 'auto'},
+            {'width': 1200, 'height': 1200, 'crop': 'limit'}
+        ]
+    }
+
+    _uploads = None
+    _batches = None
+    _lock = threading.Lock()
+
+
+    @classmethod
+    def config(cls):
+        return settings.RETURN_MEDIA
+
+
+    @classmethod
+    def _pools(cls):
+        """
+            Thread pools shared by the process
+
+            Uploads and batches get separate pools so a batch waiting on its
+            uploads can never hold the worker an upload needs.
+        """
+        with cls._lock:
+            if cls._uploads is None:
+                workers = cls.config()['UPLOAD_WORKERS']
+                cls._uploads = ThreadPoolExecutor(
+                    max_workers=workers, thread_name_prefix='return-upload'
+                )
+                cls._batches = ThreadPoolExecutor(
+                    max_workers=workers, thread_name_prefix='return-batch'
+                )
+        return cls._uploads, cls._batches
+
+
+    @classmethod
+    def submit(cls, return_item, images):
+        """
+            Stage images and upload them after the current transaction commits
+
+            Args:
+                return_item: ReturnItem the images belong to
+                images: Uploaded files
+
+            Returns:
+                List of staged PendingReturnImage
+        """
+        pending = PendingReturnImage.objects.bulk_create([
+            PendingReturnImage(
+                return_item=return_item,
+                name=getattr(image, 'name', '') or '',
+                data=b''.join(image.chunks()) if hasattr(image, 'chunks') else image.read()
+            )
+            for image in images
+        ])
+
+        pending_ids = [image.id for image in pending]
+        if pending_ids:
+            transaction.on_commit(lambda: cls.dispatch(pending_ids))
+        return pending
+
+
+    @classmethod
+    def dispatch(cls, pending_ids):
+        """ Process a batch in the background, or inline when ASYNC is off """
+        if not cls.config().get('ASYNC', True):
+            return cls.process(pending_ids)
+
+        _, batches = cls._pools()
+        batches.submit(cls._process_in_background, pending_ids)
+
+
+    @classmethod
+    def _process_in_background(cls, pending_ids):
+        try:
+            cls.process(pending_ids)
+        except Exception as e:
+            # Rows stay staged; retry_failed() picks them up once stale
+            logger.error(f"Return image batch {pending_ids} failed: {str(e)}")
+        finally:
+            connection.close()
+
+
+    @classmethod
+    def _upload(cls, pending):
+        """ Upload one staged image; returns the upload result or an error message """
+        try:
+            result = CloudinaryUploader.upload_image(
+                ContentFile(bytes(pending.data), name=pending.name or None),
+                folder=settings.CLOUDINARY_STORAGE_FOLDERS['RETURN_IMAGES'],
+                **cls.UPLOAD_OPTIONS
+            )
+        except Exception as e:
+            return str(e)
+        return result or 'Upload returned no result'
+
+
+    @classmethod
+    def _claim(cls, pending_ids):
+        """
+            Mark staged images as uploading by this run
+
+            Rows another run is uploading are skipped until its claim is
+            STALE_AFTER old, so a crashed run's rows are not stuck.
+
+            Returns:
+                Claimed PendingReturnImage list and the claim timestamp
+        """
+        claimed_at = timezone.now()
+        stale = claimed_at - timedelta(seconds=cls.config()['STALE_AFTER'])
+
+        with transaction.atomic():
+            pending = list(PendingReturnImage.objects.select_for_update(skip_locked=True).filter(
+                id__in=pending_ids,
+                attempts__lt=cls.config()['MAX_ATTEMPTS']
+            ).filter(
+                ~Q(status=PendingReturnImage.STATUS_UPLOADING) | Q(updated_at__lt=stale)
+            ))
+            PendingReturnImage.objects.filter(
+                id__in=[image.id for image in pending]
+            ).update(status=PendingReturnImage.STATUS_UPLOADING, updated_at=claimed_at)
+        return pending, claimed_at
+
+
+    @classmethod
+    def process(cls, pending_ids):
+        """
+            Claim staged images, upload them concurrently and attach the successes
+
+            Args:
+                pending_ids: PendingReturnImage ids
+
+            Returns:
+                UploadBatchResult
+        """
+        pending, claimed_at = cls._claim(pending_ids)
+        if not pending:
+            return UploadBatchResult()
+
+        uploads, _ = cls._pools()
+        results = list(uploads.map(cls._upload, pending))
+
+        with transaction.atomic():
+            # Rows gone or claimed again meanwhile were taken over by another
+            # run or had their return deleted; their uploads are discarded
+            live = set(PendingReturnImage.objects.select_for_update().filter(
+                id__in=[image.id for image in pending],
+                status=PendingReturnImage.STATUS_UPLOADING,
+                updated_at=claimed_at
+            ).values_list('id', flat=True))
+
+            uploaded = []
+            failed = []
+            now = timezone.now()
+            for image, result in zip(pending, results):
+                if image.id not in live:
+                    continue
+                if isinstance(result, dict):
+                    uploaded.append((image, result))
+                else:
+                    image.status = PendingReturnImage.STATUS_FAILED
+                    image.attempts += 1
+                    image.last_error = result
+                    image.updated_at = now
+                    failed.append(image)
+
+            # bulk_create skips ReturnImage.save, so variants are set here
+            attached = ReturnImage.objects.bulk_create([
+                ReturnImage(
+                    return_item_id=image.return_item_id,
+                    image=result['url'],
+                    public_id=result['public_id'],
+                    variants=CloudinaryUploader.build_variants(result['public_id'])
+                )
+                for image, result in uploaded
+            ])
+            PendingReturnImage.objects.filter(
+                id__in=[image.id for image, _ in uploaded]
+            ).delete()
+            PendingReturnImage.objects.bulk_update(
+                failed, ['status', 'attempts', 'last_error', 'updated_at']
+            )
+
+        # Not attached anywhere, so nothing would ever clean them up
+        for image, result in zip(pending, results):
+            if image.id not in live and isinstance(result, dict):
+                CloudinaryUploader.delete_file(result['public_id'])
+
+        for image in failed:
+            logger.error(
+                f"Failed to upload return image {image.id} "
+                f"(attempt {image.attempts}): {image.last_error}"
+            )
+        return UploadBatchResult(
+            attached=attached,
+            failed=[image.id for image in failed]
+        )
+
+
+    @classmethod
+    def retryable(cls):
+        """ Failed uploads, and pending ones whose batch never finished """
+        stale = timezone.now() - timedelta(seconds=cls.config()['STALE_AFTER'])
+        return PendingReturnImage.objects.filter(
+            attempts__lt=cls.config()['MAX_ATTEMPTS']
+        ).filter(
+            Q(status=PendingReturnImage.STATUS_FAILED) | Q(updated_at__lt=stale)
+        )
+
+
+    @classmethod
+    def retry_failed(cls, batch_size=50):
+        """
+            Upload every retryable staged image
+
+            Returns:
+                UploadBatchResult covering all batches
+        """
+        total = UploadBatchResult()
+        pending_ids = list(cls.retryable().values_list('id', flat=True))
+        for start in range(0, len(pending_ids), batch_size):
+            result = cls.process(pending_ids[start:start + batch_size])
+            total.attached.extend(result.attached)
+            total.failed.extend(result.failed)
+        return total
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.2 on 2026-10-19 13:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('returns', '0005_returnimage_public_id_alter_returnimage_image'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='returnimage',
+            name='variants',
+            field=models.JSONField(blank=True, default=dict, help_text='Precomputed delivery URLs keyed by variant name'),
+        ),
+    ]
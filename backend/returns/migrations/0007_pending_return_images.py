@@ -0,0 +1,32 @@
+# Generated by Django 5.1.2 on 2026-10-19 14:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('returns', '0006_returnimage_variants'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingReturnImage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(blank=True, max_length=255)),
+                ('data', models.BinaryField()),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('return_item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='pending_images', to='returns.returnitem')),
+            ],
+            options={
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['status', 'updated_at'], name='pending_image_status_idx')],
+            },
+        ),
+    ]
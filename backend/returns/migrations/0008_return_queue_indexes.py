@@ -0,0 +1,28 @@
+# Generated by Django 5.1.2 on 2026-10-19 14:23
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0007_order_delivered_index'),
+        ('returns', '0007_pending_return_images'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='return',
+            index=models.Index(fields=['-created_at'], name='return_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='return',
+            index=models.Index(fields=['return_status', '-created_at'], name='return_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='return',
+            index=models.Index(fields=['refund_status', '-created_at'], name='return_refund_created_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.2 on 2026-10-19 15:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('returns', '0008_return_queue_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='pendingreturnimage',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('uploading', 'Uploading'), ('failed', 'Failed')], default='pending', max_length=20),
+        ),
+    ]
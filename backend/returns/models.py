@@ -5,6 +5,7 @@ from django.conf import settings
 from django.core.exceptions import ValidationError
 from cloudinary_storage.storage import MediaCloudinaryStorage
 from utils.cloudinary_utils import CloudinaryUploader
+from utils.cache import local_cache
 import logging
 
 logger = logging.getLogger(__name__)
@@ -71,6 +72,12 @@ class Return(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Admin queue: newest first, optionally filtered by status
+            models.Index(fields=['-created_at'], name='return_created_idx'),
+            models.Index(fields=['return_status', '-created_at'], name='return_status_created_idx'),
+            models.Index(fields=['refund_status', '-created_at'], name='return_refund_created_idx'),
+        ]
     
 
     def approve_return(self, approved_by):
@@ -151,28 +158,10 @@ class ReturnItem(models.Model):
         return f"{self.quantity}x {self.product.name} in Return #{self.return_request.id}"
     
     def add_images(self, images):
-        """Add multiple images to return item"""
-        for image in images:
-            try:
-                result = CloudinaryUploader.upload_image(
-                    image,
-                    folder=settings.CLOUDINARY_STORAGE_FOLDERS['RETURN_IMAGES'],
-                    transformation=[
-                        {'quality': 'auto'},
-                        {'fetch_format': 'auto'},
-                        {'width': 1200, 'height': 1200, 'crop': 'limit'}
-                    ]
-                )
-
-                if result:
-                    ReturnImage.objects.create(
-                        return_item=self,
-                        image=result['url'],
-                        public_id=result['public_id']
-                    )
-            except Exception as e:
-                logger.error(f"Failed to upload return image: {str(e)}")
-                continue
+        """Stage images for upload once the current transaction commits"""
+        from .media import ReturnMediaPipeline
+
+        return ReturnMediaPipeline.submit(self, images)
 
 
     def delete_images(self):
@@ -192,43 +181,86 @@ class ReturnImage(models.Model):
         upload_to=settings.CLOUDINARY_STORAGE_FOLDERS['RETURN_IMAGES']
     )
     public_id = models.CharField(max_length=200, blank=True)
+    variants = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Precomputed delivery URLs keyed by variant name"
+    )
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         ordering = ['created_at']
     
 
+    def save(self, *args, **kwargs):
+        if self.public_id and not self.variants:
+            self.variants = CloudinaryUploader.build_variants(self.public_id)
+        super().save(*args, **kwargs)
+
+
     def delete(self, *args, **kwargs):
-        # Delete from Cloudinary
-        if self.public_id:
+        # Delete from Cloudinary unless a deduplicated upload still uses it
+        if self.public_id and not ReturnImage.objects.filter(
+            public_id=self.public_id
+        ).exclude(pk=self.pk).exists():
             CloudinaryUploader.delete_file(self.public_id)
         super().delete(*args, **kwargs)
 
 
     def get_thumbnail_url(self):
         """Get thumbnail URL for return images"""
-        if self.public_id:
-            return CloudinaryUploader.get_image_url(
-                self.public_id,
-                width=200,
-                height=200,
-                crop='fill',
-                quality='auto'
-            )
-        return None
+        return CloudinaryUploader.get_variant_url(self.variants, self.public_id, 'thumbnail')
 
 
     def get_preview_url(self):
         """Get preview URL for return images"""
-        if self.public_id:
-            return CloudinaryUploader.get_image_url(
-                self.public_id,
-                width=800,
-                height=800,
-                crop='limit',
-                quality='auto'
-            )
-        return None
+        return CloudinaryUploader.get_variant_url(self.variants, self.public_id, 'preview')
+
+
+class PendingReturnImage(models.Model):
+    """
+        Customer photo staged for upload
+
+        Rows are written with the return request and removed once the image
+        is on Cloudinary and attached as a ReturnImage. An upload run marks
+        the rows it takes as uploading so overlapping runs skip them.
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_UPLOADING = 'uploading'
+    STATUS_FAILED = 'failed'
+
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_UPLOADING, 'Uploading'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    return_item = models.ForeignKey(
+        ReturnItem,
+        on_delete=models.CASCADE,
+        related_name='pending_images'
+    )
+    name = models.CharField(max_length=255, blank=True)
+    data = models.BinaryField()
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default=STATUS_PENDING
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'updated_at'], name='pending_image_status_idx'),
+        ]
+
+
+    def __str__(self):
+        return f"{self.name or 'Image'} for ReturnItem #{self.return_item_id} ({self.status})"
 
 
 class ReturnHistory(models.Model):
@@ -334,3 +366,9 @@ class ProductReturnPolicy(models.Model):
 
     def __str__(self):
         return f"Return Policy for {self.product.name}"
+
+
+@local_cache('return_policy')
+def get_global_return_policy():
+    """ The global ReturnPolicy (or None), served from the process-local cache """
+    return ReturnPolicy.objects.first()
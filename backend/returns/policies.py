@@ -0,0 +1,154 @@
+# returns/policies.py
+
+from django.db import transaction
+from dataclasses import dataclass, asdict
+from decimal import Decimal
+from typing import Dict, Optional
+from utils.cache import local_cache
+from .models import ReturnPolicy, ProductReturnPolicy, get_global_return_policy
+
+
+@dataclass(frozen=True)
+class EffectivePolicy:
+    """ Return terms for one product: its override merged over the global policy """
+    is_returnable: bool
+    return_window_days: int
+    restocking_fee_percentage: Decimal
+    free_returns: bool
+    shipping_paid_by: str
+    instructions: str
+
+
+    def as_dict(self):
+        return asdict(self)
+
+
+@dataclass
+class CompiledPolicies:
+    """ The global policy and every product override, resolved """
+    policy: ReturnPolicy
+    default: EffectivePolicy
+    overrides: Dict[int, ProductReturnPolicy]
+    effective: Dict[int, EffectivePolicy]
+    longest_window: int
+
+
+@local_cache('return_policies')
+def _compiled_policies():
+    return ReturnPolicyResolver.compile()
+
+
+class ReturnPolicyResolver:
+    """
+        Effective return policy per product, from a cached compiled map
+
+        The global policy and all product overrides are loaded in two
+        queries, merged into EffectivePolicy values and held in the
+        process-local cache. Policy saves and deletes invalidate it on every
+        worker, so steady-state reads never touch the database.
+    """
+
+
+    @classmethod
+    def merge(cls, policy, override=None):
+        """ Effective policy of a product override over the global policy """
+        if override is None:
+            return EffectivePolicy(
+                is_returnable=True,
+                return_window_days=policy.return_window_days,
+                restocking_fee_percentage=policy.restocking_fee_percentage,
+                free_returns=policy.free_returns,
+                shipping_paid_by=policy.shipping_paid_by,
+                instructions=policy.return_instructions
+            )
+
+        return EffectivePolicy(
+            is_returnable=override.is_returnable,
+            return_window_days=(
+                override.return_window_days
+                if override.return_window_days
+                else policy.return_window_days
+            ),
+            restocking_fee_percentage=(
+                override.restocking_fee_percentage
+                if override.restocking_fee_percentage is not None
+                else policy.restocking_fee_percentage
+            ),
+            free_returns=policy.free_returns,
+            shipping_paid_by=policy.shipping_paid_by,
+            instructions=override.special_instructions or policy.return_instructions
+        )
+
+
+    @classmethod
+    def compile(cls):
+        """ Build CompiledPolicies from the database (None without a global policy) """
+        policy = ReturnPolicy.objects.first()
+        if policy is None:
+            return None
+
+        # Product names ride along for ProductReturnPolicySerializer
+        overrides = {
+            override.product_id: override
+            for override in ProductReturnPolicy.objects.select_related('product').only(
+                'id', 'product_id', 'is_returnable', 'return_window_days',
+                'restocking_fee_percentage', 'special_instructions', 'product__name'
+            )
+        }
+        effective = {
+            product_id: cls.merge(policy, override)
+            for product_id, override in overrides.items()
+        }
+        return CompiledPolicies(
+            policy=policy,
+            default=cls.merge(policy),
+            overrides=overrides,
+            effective=effective,
+            longest_window=max(
+                [policy.return_window_days]
+                + [terms.return_window_days for terms in effective.values()]
+            )
+        )
+
+
+    @classmethod
+    def policies(cls) -> Optional[CompiledPolicies]:
+        return _compiled_policies()
+
+
+    @classmethod
+    def invalidate(cls):
+        """ Recompile on every worker once the current transaction commits """
+        transaction.on_commit(_compiled_policies.invalidate)
+        transaction.on_commit(get_global_return_policy.invalidate)
+
+
+    @classmethod
+    def product_override(cls, product_id):
+        """ The product's ProductReturnPolicy, or None """
+        policies = cls.policies()
+        return policies.overrides.get(int(product_id)) if policies else None
+
+
+    @classmethod
+    def effective(cls, product_id):
+        """ EffectivePolicy for one product (None without a global policy) """
+        return cls.effective_many([product_id]).get(int(product_id))
+
+
+    @classmethod
+    def effective_many(cls, product_ids):
+        """
+            EffectivePolicy for many products, for listings and eligibility
+
+            Returns:
+                Dict mapping product id to EffectivePolicy (empty without a
+                global policy)
+        """
+        policies = cls.policies()
+        if policies is None:
+            return {}
+        return {
+            int(product_id): policies.effective.get(int(product_id), policies.default)
+            for product_id in product_ids
+        }
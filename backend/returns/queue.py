@@ -0,0 +1,64 @@
+# returns/queue.py
+
+from django.db.models import Count, Prefetch
+from .models import Return, ReturnItem, ReturnImage, ReturnHistory
+
+
+class ReturnQueue:
+    """
+        Querysets for the admin return queue
+
+        A list page is one query (plus the paginator's count): the customer
+        is joined and the item count annotated. The detail view loads items,
+        images and history through Prefetch objects that join their own
+        relations, so nested serializers never query per row.
+    """
+    LIST_FIELDS = [
+        'id', 'order_id', 'return_status', 'refund_status', 'refund_amount',
+        'created_at', 'updated_at',
+        'user__first_name', 'user__last_name', 'user__email',
+    ]
+
+
+    @classmethod
+    def for_list(cls, queryset=None):
+        """ Returns shaped for ReturnListSerializer """
+        queryset = Return.objects.all() if queryset is None else queryset
+        return queryset.select_related('user').only(
+            *cls.LIST_FIELDS
+        ).annotate(
+            item_count=Count('items')
+        )
+
+
+    @classmethod
+    def for_detail(cls, queryset=None):
+        """ Returns shaped for ReturnSerializer """
+        queryset = Return.objects.all() if queryset is None else queryset
+        return queryset.select_related('user').prefetch_related(
+            Prefetch(
+                'items',
+                queryset=ReturnItem.objects.select_related('product').only(
+                    'id', 'return_request_id', 'quantity', 'reason', 'condition',
+                    'product__id', 'product__name'
+                )
+            ),
+            Prefetch('items__images', queryset=ReturnImage.objects.all()),
+            Prefetch(
+                'history',
+                queryset=ReturnHistory.objects.select_related('created_by')
+            )
+        )
+
+
+    @classmethod
+    def filter_dates(cls, queryset, params):
+        """ Apply ?date_from= and ?date_to= (inclusive) """
+        date_from = params.get('date_from')
+        date_to = params.get('date_to')
+
+        if date_from:
+            queryset = queryset.filter(created_at__gte=date_from)
+        if date_to:
+            queryset = queryset.filter(created_at__lte=date_to)
+        return queryset
@@ -1,7 +1,10 @@
 # returns/serializers.py
 
 from rest_framework import serializers
-from .models import Return, ReturnItem, ReturnImage, ReturnHistory, ReturnPolicy, ProductReturnPolicy
+from .models import (
+    Return, ReturnItem, ReturnImage, ReturnHistory, ReturnPolicy, ProductReturnPolicy
+)
+from .policies import ReturnPolicyResolver
 
 
 class ReturnImageSerializer(serializers.ModelSerializer):
@@ -59,7 +62,7 @@ class ReturnSerializer(serializers.ModelSerializer):
         read_only=True
     )
     order_number = serializers.CharField(
-        source='order.id',
+        source='order_id',
         read_only=True
     )
 
@@ -74,6 +77,32 @@ class ReturnSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at', 'updated_at']
 
 
+class ReturnListSerializer(serializers.ModelSerializer):
+    """ Admin return queue row; expects ReturnQueue.for_list() """
+    customer_name = serializers.CharField(
+        source='user.get_full_name',
+        read_only=True
+    )
+    customer_email = serializers.EmailField(
+        source='user.email',
+        read_only=True
+    )
+    order_number = serializers.CharField(
+        source='order_id',
+        read_only=True
+    )
+    item_count = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Return
+        fields = [
+            'id', 'order_number', 'customer_name', 'customer_email',
+            'return_status', 'refund_status', 'refund_amount',
+            'item_count', 'created_at', 'updated_at'
+        ]
+        read_only_fields = fields
+
+
 class ReturnRequestSerializer(serializers.ModelSerializer):
     items = serializers.ListSerializer(child=serializers.DictField(), write_only=True)
 
@@ -151,22 +180,16 @@ class ProductReturnPolicySerializer(serializers.ModelSerializer):
 
     def get_global_policy(self, obj):
         """Get global policy settings if product-specific settings are not set"""
-        global_policy = ReturnPolicy.objects.first()
-        if not global_policy:
+        policies = ReturnPolicyResolver.policies()
+        if not policies:
             return None
 
+        effective = ReturnPolicyResolver.merge(policies.policy, obj)
         return {
-            'return_window_days': (
-                obj.return_window_days if obj.return_window_days
-                else global_policy.return_window_days
-            ),
-            'restocking_fee_percentage': (
-                obj.restocking_fee_percentage
-                if obj.restocking_fee_percentage is not None
-                else global_policy.restocking_fee_percentage
-            ),
-            'free_returns': global_policy.free_returns,
-            'shipping_paid_by': global_policy.shipping_paid_by,
+            'return_window_days': effective.return_window_days,
+            'restocking_fee_percentage': effective.restocking_fee_percentage,
+            'free_returns': effective.free_returns,
+            'shipping_paid_by': effective.shipping_paid_by,
         }
 
 
@@ -182,39 +205,10 @@ class ReturnPolicyDetailSerializer(serializers.Serializer):
         Calculate the effective policy by combining global and product-specific settings
         Product-specific settings override global settings when present
         """
-        global_policy = obj['global_policy']
-        product_policy = obj['product_policy']
-
-        if not product_policy:
-            return {
-                'is_returnable': True,
-                'return_window_days': global_policy.return_window_days,
-                'restocking_fee_percentage': global_policy.restocking_fee_percentage,
-                'free_returns': global_policy.free_returns,
-                'shipping_paid_by': global_policy.shipping_paid_by,
-                'instructions': global_policy.return_instructions
-            }
-
-        return {
-            'is_returnable': product_policy.is_returnable,
-            'return_window_days': (
-                product_policy.return_window_days
-                if product_policy.return_window_days
-                else global_policy.return_window_days
-            ),
-            'restocking_fee_percentage': (
-                product_policy.restocking_fee_percentage
-                if product_policy.restocking_fee_percentage is not None
-                else global_policy.restocking_fee_percentage
-            ),
-            'free_returns': global_policy.free_returns,
-            'shipping_paid_by': global_policy.shipping_paid_by,
-            'instructions': (
-                product_policy.special_instructions
-                if product_policy.special_instructions
-                else global_policy.return_instructions
-            )
-        }
+        effective = obj.get('effective_policy') or ReturnPolicyResolver.merge(
+            obj['global_policy'], obj['product_policy']
+        )
+        return effective.as_dict()
 
 
 class ReturnPolicyPreviewSerializer(serializers.ModelSerializer):
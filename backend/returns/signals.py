@@ -0,0 +1,13 @@
+# returns/signals.py
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import ReturnPolicy, ProductReturnPolicy
+from .policies import ReturnPolicyResolver
+
+
+@receiver([post_save, post_delete], sender=ReturnPolicy)
+@receiver([post_save, post_delete], sender=ProductReturnPolicy)
+def invalidate_return_policy(sender, instance, **kwargs):
+    """ Drop the cached return policies on every worker """
+    ReturnPolicyResolver.invalidate()
@@ -0,0 +1,106 @@
+from django.test import TestCase
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from datetime import timedelta
+from decimal import Decimal
+from orders.models import Order, OrderItem
+from products.models import Category, Product
+from users.models import User
+from ..eligibility import ReturnEligibilityEngine
+from ..models import Return, ReturnPolicy, ProductReturnPolicy, get_global_return_policy
+from ..policies import ReturnPolicyResolver
+
+
+class ReturnEligibilityEngineTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        get_global_return_policy.invalidate()
+        self.policy = ReturnPolicy.objects.create(
+            return_window_days=7, restocking_fee_percentage=Decimal('5.00')
+        )
+        self.user = User.objects.create_user(
+            email='buyer@example.com', username='buyer', first_name='Ada',
+            last_name='Buyer', password='buyerpass123'
+        )
+        category = Category.objects.create(name='Wigs')
+        self.wig = Product.objects.create(
+            name='Bob Wig', category=category, description='Bob',
+            price=Decimal('120.00'), stock=10
+        )
+        self.custom = Product.objects.create(
+            name='Custom Unit', category=category, description='Custom',
+            price=Decimal('300.00'), stock=10
+        )
+        self.long = Product.objects.create(
+            name='Premium Unit', category=category, description='Premium',
+            price=Decimal('500.00'), stock=10
+        )
+        ProductReturnPolicy.objects.create(product=self.custom, is_returnable=False)
+        ProductReturnPolicy.objects.create(
+            product=self.long, return_window_days=30, restocking_fee_percentage=Decimal('0.00')
+        )
+
+
+    def order(self, days_ago, *products, status='delivered'):
+        order = Order.objects.create(
+            user=self.user, total_amount=Decimal('100.00'), shipping_address='Lagos',
+            order_status=status,
+            delivered_at=timezone.now() - timedelta(days=days_ago) if status == 'delivered' else None
+        )
+        for product in products:
+            OrderItem.objects.create(order=order, product=product, quantity=1, price=product.price)
+        return order
+
+
+    def test_batch_uses_fixed_number_of_queries(self):
+        orders = [self.order(1, self.wig, self.custom, self.long) for _ in range(3)]
+        ReturnPolicyResolver.policies()
+        with self.assertNumQueries(2):
+            results = ReturnEligibilityEngine.evaluate(orders)
+
+        self.assertTrue(all(result.is_eligible for result in results))
+        returnable = results[0].returnable_items
+        self.assertEqual([r.item.product_id for r in returnable], [self.wig.id, self.long.id])
+        self.assertEqual(
+            [(r.return_window_days, r.restocking_fee) for r in returnable],
+            [(7, Decimal('5.00')), (30, Decimal('0.00'))]
+        )
+
+
+    def test_reasons_for_ineligible_orders(self):
+        pending = self.order(0, self.wig, status='pending')
+        only_custom = self.order(1, self.custom)
+        expired = self.order(10, self.wig)
+        returned = self.order(1, self.wig)
+        Return.objects.create(order=returned, user=self.user, reason='Wrong colour')
+        # Past the global window but inside the product override
+        extended = self.order(10, self.wig, self.long)
+
+        results = {
+            result.order.id: result
+            for result in ReturnEligibilityEngine.evaluate([pending, only_custom, expired, returned, extended])
+        }
+        self.assertIn("Order must be delivered before returning", results[pending.id].errors)
+        self.assertEqual(results[only_custom.id].errors, ["No returnable items in order"])
+        self.assertEqual(results[expired.id].errors, ["Return window of 7 days has expired"])
+        self.assertEqual(
+            results[returned.id].errors, ["A return request already exists for this order"]
+        )
+        self.assertTrue(results[extended.id].is_eligible)
+        self.assertEqual(
+            [r.item.product_id for r in results[extended.id].returnable_items], [self.long.id]
+        )
+
+
+    def test_eligible_orders_endpoint(self):
+        recent = self.order(2, self.wig)
+        self.order(60, self.wig)
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+
+        response = client.get(reverse('customer-return-eligible-orders'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([order['id'] for order in response.data['orders']], [recent.id])
+        self.assertEqual(response.data['orders'][0]['items'][0]['product_name'], 'Bob Wig')
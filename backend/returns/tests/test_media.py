@@ -0,0 +1,145 @@
+from django.test import TestCase, override_settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from unittest.mock import patch
+from types import SimpleNamespace
+from datetime import timedelta
+from decimal import Decimal
+from orders.models import Order
+from products.models import Category, Product
+from users.models import User
+from ..media import ReturnMediaPipeline
+from ..models import Return, ReturnItem, ReturnImage, PendingReturnImage
+import threading
+
+
+def upload_result(public_id):
+    return {
+        'public_id': public_id,
+        'url': f'https://res.cloudinary.com/demo/image/upload/{public_id}.jpg',
+    }
+
+
+@override_settings(RETURN_MEDIA={
+    'UPLOAD_WORKERS': 4, 'MAX_ATTEMPTS': 2, 'STALE_AFTER': 900, 'ASYNC': False
+})
+class ReturnMediaPipelineTest(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(
+            email='buyer@example.com', username='buyer', first_name='Ada',
+            last_name='Buyer', password='buyerpass123'
+        )
+        category = Category.objects.create(name='Wigs')
+        product = Product.objects.create(
+            name='Bob Wig', category=category, description='Bob',
+            price=Decimal('120.00'), stock=10
+        )
+        order = Order.objects.create(
+            user=user, total_amount=Decimal('120.00'), shipping_address='Lagos'
+        )
+        return_request = Return.objects.create(order=order, user=user, reason='Wrong colour')
+        self.item = ReturnItem.objects.create(
+            return_request=return_request, product=product, quantity=1,
+            reason='Wrong colour', condition='unopened'
+        )
+
+
+    def photos(self, *names):
+        return [
+            SimpleUploadedFile(name, b'photo-' + name.encode(), content_type='image/jpeg')
+            for name in names
+        ]
+
+
+    @patch('returns.media.CloudinaryUploader.upload_image')
+    def test_uploads_run_after_commit_and_attach_in_bulk(self, mock_upload):
+        mock_upload.side_effect = lambda file, **options: (
+            upload_result(file.name.split('.')[0]) if file.read() != b'photo-bad.jpg' else None
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.item.add_images(self.photos('front.jpg', 'tag.jpg', 'bad.jpg'))
+            mock_upload.assert_not_called()
+            self.assertEqual(self.item.pending_images.count(), 3)
+
+        self.assertEqual(mock_upload.call_count, 3)
+        images = list(self.item.images.order_by('public_id'))
+        self.assertEqual([image.public_id for image in images], ['front', 'tag'])
+        # Variants are set even though bulk_create skips save()
+        self.assertTrue(images[0].variants)
+
+        failed = self.item.pending_images.get()
+        self.assertEqual((failed.status, failed.attempts), (PendingReturnImage.STATUS_FAILED, 1))
+
+
+    @patch('returns.media.CloudinaryUploader.upload_image')
+    def test_failed_uploads_are_retried_until_max_attempts(self, mock_upload):
+        mock_upload.return_value = None
+        with self.captureOnCommitCallbacks(execute=True):
+            self.item.add_images(self.photos('front.jpg', 'tag.jpg'))
+
+        mock_upload.return_value = upload_result('front')
+        result = ReturnMediaPipeline.retry_failed(batch_size=1)
+        self.assertEqual(len(result.attached), 2)
+        self.assertFalse(PendingReturnImage.objects.exists())
+
+        mock_upload.return_value = None
+        with self.captureOnCommitCallbacks(execute=True):
+            self.item.add_images(self.photos('side.jpg'))
+        ReturnMediaPipeline.retry_failed()
+        self.assertEqual(PendingReturnImage.objects.get().attempts, 2)
+
+        # Out of attempts: left for an admin to inspect
+        mock_upload.reset_mock()
+        self.assertEqual(ReturnMediaPipeline.retry_failed().failed, [])
+        mock_upload.assert_not_called()
+        self.assertEqual(ReturnImage.objects.count(), 2)
+
+
+    @patch('returns.media.CloudinaryUploader.upload_image')
+    def test_uploads_are_concurrent(self, mock_upload):
+        # Only passes if three uploads are in flight at the same time
+        barrier = threading.Barrier(3, timeout=5)
+
+        def upload(file, **options):
+            barrier.wait()
+            return upload_result(file.name.split('.')[0])
+        mock_upload.side_effect = upload
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.item.add_images(self.photos('front.jpg', 'tag.jpg', 'side.jpg'))
+
+        self.assertEqual(self.item.images.count(), 3)
+
+
+    @patch('returns.media.CloudinaryUploader.delete_file')
+    @patch('returns.media.CloudinaryUploader.upload_image')
+    def test_overlapping_runs_keep_one_upload(self, mock_upload, mock_delete):
+        pending_ids = [image.id for image in self.item.add_images(self.photos('front.jpg'))]
+        overlaps = []
+
+        def upload(file, **options):
+            if not overlaps:
+                # A second run while this one is still uploading skips the row
+                overlaps.append(ReturnMediaPipeline.process(pending_ids))
+                # Once the claim is stale, a later run takes it over
+                PendingReturnImage.objects.update(
+                    updated_at=PendingReturnImage.objects.get().updated_at - timedelta(hours=1)
+                )
+                overlaps.append(ReturnMediaPipeline.process(pending_ids))
+                return upload_result('first')
+            return upload_result('second')
+        mock_upload.side_effect = upload
+
+        # Upload in this thread so the nested runs see the test transaction
+        inline = (SimpleNamespace(map=map), None)
+        with patch.object(ReturnMediaPipeline, '_pools', return_value=inline):
+            result = ReturnMediaPipeline.process(pending_ids)
+
+        self.assertEqual(overlaps[0].attached, [])
+        self.assertEqual(len(overlaps[1].attached), 1)
+        self.assertEqual(result.attached, [])
+        self.assertEqual(mock_upload.call_count, 2)
+        # The losing run's upload is destroyed, only the winner's is attached
+        mock_delete.assert_called_once_with('first')
+        self.assertEqual(list(self.item.images.values_list('public_id', flat=True)), ['second'])
+        self.assertFalse(PendingReturnImage.objects.exists())
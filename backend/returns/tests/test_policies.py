@@ -0,0 +1,90 @@
+from django.test import TestCase
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APIClient
+from decimal import Decimal
+from products.models import Category, Product
+from ..models import ReturnPolicy, ProductReturnPolicy
+from ..policies import ReturnPolicyResolver
+
+
+class ReturnPolicyResolverTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.policy = ReturnPolicy.objects.create(
+                return_window_days=7, restocking_fee_percentage=Decimal('5.00'),
+                return_instructions='Ship it back'
+            )
+            category = Category.objects.create(name='Wigs')
+            self.wig = Product.objects.create(
+                name='Bob Wig', category=category, description='Bob',
+                price=Decimal('120.00'), stock=10
+            )
+            self.custom = Product.objects.create(
+                name='Custom Unit', category=category, description='Custom',
+                price=Decimal('300.00'), stock=10
+            )
+            self.override = ProductReturnPolicy.objects.create(
+                product=self.custom, return_window_days=14,
+                special_instructions='Unworn only'
+            )
+        self.client = APIClient()
+
+
+    def test_effective_policies_are_served_from_memory(self):
+        ReturnPolicyResolver.policies()
+        with self.assertNumQueries(0):
+            policies = ReturnPolicyResolver.effective_many([self.wig.id, self.custom.id])
+            self.client.get(reverse('return-policy-product-policy'), {'product_id': self.custom.id})
+
+        self.assertEqual(policies[self.wig.id], ReturnPolicyResolver.policies().default)
+        custom = policies[self.custom.id]
+        self.assertEqual(
+            (custom.return_window_days, custom.restocking_fee_percentage, custom.instructions),
+            (14, Decimal('5.00'), 'Unworn only')
+        )
+        self.assertEqual(ReturnPolicyResolver.policies().longest_window, 14)
+
+
+    def test_policy_changes_invalidate_after_commit(self):
+        ReturnPolicyResolver.policies()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.override.is_returnable = False
+            self.override.save()
+        self.assertFalse(ReturnPolicyResolver.effective(self.custom.id).is_returnable)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.policy.return_window_days = 10
+            self.policy.save()
+        self.assertEqual(ReturnPolicyResolver.effective(self.wig.id).return_window_days, 10)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.override.delete()
+        self.assertTrue(ReturnPolicyResolver.effective(self.custom.id).is_returnable)
+
+
+    def test_policy_endpoints(self):
+        response = self.client.get(
+            reverse('return-policy-product-policy'), {'product_id': self.custom.id}
+        )
+        self.assertEqual(response.data['product_policy']['product_name'], 'Custom Unit')
+        self.assertEqual(response.data['effective_policy']['return_window_days'], 14)
+
+        response = self.client.get(
+            reverse('return-policy-product-policies'),
+            {'product_ids': f'{self.wig.id},{self.custom.id}'}
+        )
+        self.assertEqual(response.data[self.wig.id]['return_window_days'], 7)
+        self.assertEqual(response.data[self.custom.id]['instructions'], 'Unworn only')
+
+        # Capped at one listing page's worth of ids
+        response = self.client.get(
+            reverse('return-policy-product-policies'),
+            {'product_ids': ','.join(str(product_id) for product_id in range(1, 151))}
+        )
+        self.assertEqual(len(response.data), 100)
+
+        response = self.client.get(reverse('return-policy-product-policies'), {'product_ids': '1,x'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {'error': 'product_ids must be a comma-separated list of ids'})
@@ -0,0 +1,102 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from unittest.mock import patch
+from decimal import Decimal
+from orders.models import Order
+from products.models import Category, Product
+from users.models import User
+from ..models import Return, ReturnItem, ReturnImage, ReturnHistory
+import cloudinary
+
+
+class AdminReturnQueueTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_user(
+            email='admin@example.com', username='admin', first_name='Ife',
+            last_name='Admin', password='adminpass123', is_staff=True
+        )
+        self.client.force_authenticate(user=self.admin)
+        category = Category.objects.create(name='Wigs')
+        self.products = [
+            Product.objects.create(
+                name=f'Wig {index}', category=category, description='Wig',
+                price=Decimal('100.00'), stock=10
+            )
+            for index in range(2)
+        ]
+
+
+    def create_returns(self, count, return_status='pending'):
+        returns = []
+        for index in range(count):
+            user = User.objects.create_user(
+                email=f'buyer{Return.objects.count()}@example.com',
+                username=f'buyer{Return.objects.count()}',
+                first_name='Ada', last_name='Buyer', password='buyerpass123'
+            )
+            order = Order.objects.create(
+                user=user, total_amount=Decimal('200.00'), shipping_address='Lagos'
+            )
+            return_request = Return.objects.create(
+                order=order, user=user, reason='Wrong colour', return_status=return_status
+            )
+            for product in self.products:
+                item = ReturnItem.objects.create(
+                    return_request=return_request, product=product, quantity=1,
+                    reason='Wrong colour', condition='unopened'
+                )
+                ReturnImage.objects.create(
+                    return_item=item, image='returns/photo.jpg', variants={'original': 'url'}
+                )
+            ReturnHistory.objects.create(
+                return_request=return_request, status='pending', created_by=self.admin
+            )
+            returns.append(return_request)
+        return returns
+
+
+    def test_list_uses_fixed_number_of_queries(self):
+        self.create_returns(2)
+        with self.assertNumQueries(2):
+            small = self.client.get(reverse('admin-returns-list'))
+
+        self.create_returns(6)
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('admin-returns-list'))
+
+        self.assertEqual(small.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 8)
+        row = response.data['results'][0]
+        self.assertEqual(row['customer_name'], 'Ada Buyer')
+        self.assertEqual(row['item_count'], 2)
+        self.assertNotIn('items', row)
+
+
+    def test_status_filter(self):
+        self.create_returns(2)
+        approved = self.create_returns(1, return_status='approved')
+
+        response = self.client.get(reverse('admin-returns-list'), {'return_status': 'approved'})
+        self.assertEqual([row['id'] for row in response.data['results']], [approved[0].id])
+
+
+    @patch.multiple(cloudinary.config(), cloud_name='test-cloud')
+    def test_detail_uses_fixed_number_of_queries(self):
+        return_request = self.create_returns(1)[0]
+
+        # Return and customer, items with products, images, history with authors
+        with self.assertNumQueries(4):
+            response = self.client.get(
+                reverse('admin-returns-detail', args=[return_request.id])
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item['product_name'] for item in response.data['items']], ['Wig 0', 'Wig 1']
+        )
+        self.assertEqual(len(response.data['items'][0]['images']), 1)
+        self.assertEqual(response.data['history'][0]['created_by_name'], 'Ife Admin')
+        self.assertEqual(response.data['order_number'], str(return_request.order_id))
@@ -5,8 +5,7 @@ from django.template.loader import render_to_string
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from admin_api.utils.notifications import create_admin_notification
-from django.utils import timezone
-from .models import ReturnPolicy, ProductReturnPolicy
+from .eligibility import ReturnEligibilityEngine
 
 
 User = get_user_model()
@@ -85,93 +84,32 @@ def send_return_status_email(return_request):
 
 
 class ReturnEligibilityChecker:
+    """ Single-order view of ReturnEligibilityEngine """
     def __init__(self, order):
         self.order = order
-        self.policy = ReturnPolicy.objects.first() # Get global policy
+        self.result = None
         self.errors = []
-    
 
-    def is_eligible_for_return(self):
-        """ Check if order is eligible for return """
-        if not self.policy:
-            self.errors.append("Return policy not found")
-            return False
-        
-        checks = [
-            self._is_within_return_window(),
-            self._is_order_delivered(),
-            self._has_returnable_items(),
-            self._has_no_existing_return()
-        ]
 
-        return all(checks)
+    def _evaluate(self):
+        if self.result is None:
+            self.result = ReturnEligibilityEngine.evaluate([self.order])[0]
+            self.errors = self.result.errors
+        return self.result
     
 
-    def _is_within_return_window(self):
-        if not self.order.delivered_at:
-            self.errors.append("Order not delivered yet")
-            return False
-        
-        days_since_delivery = (timezone.now() - self.order.delivered_at).days
-        if days_since_delivery > self.policy.return_window_days:
-            self.errors.append(
-                f"Return window of {self.policy.return_window_days} days has expired"
-            )
-            return False
-        return True
-    
-    
-    def _is_order_delivered(self):
-        if self.order.order_status != 'delivered':
-            self.errors.append("Order must be delivered before returning")
-            return False
-        return True
-
-
-    def _has_returnable_items(self):
-        has_returnable = False
-        for item in self.order.items.all():
-            product_policy = ProductReturnPolicy.objects.filter(
-                product=item.product
-            ).first()
-            if product_policy and not product_policy.is_returnable:
-                continue
-            has_returnable = True
-            break
-
-        if not has_returnable:
-            self.errors.append("No returnable items in order")
-            return False
-        return True
-
-
-    def _has_no_existing_return(self):
-        if self.order.returns.exists():
-            self.errors.append(
-                "A return request already exists for this order")
-            return False
-        return True
+    def is_eligible_for_return(self):
+        """ Check if order is eligible for return """
+        return self._evaluate().is_eligible
 
 
     def get_returnable_items(self):
         """Get list of returnable items from order"""
-        returnable_items = []
-        for item in self.order.items.all():
-            product_policy = ProductReturnPolicy.objects.filter(
-                product=item.product
-            ).first()
-            if not product_policy or product_policy.is_returnable:
-                returnable_items.append({
-                    'item': item,
-                    'return_window_days': (
-                        product_policy.return_window_days
-                        if product_policy and product_policy.return_window_days
-                        else self.policy.return_window_days
-                    ),
-                    'restocking_fee': (
-                        product_policy.restocking_fee_percentage
-                        if product_policy and product_policy.restocking_fee_percentage is not None
-                        else self.policy.restocking_fee_percentage
-                    )
-                })
-        return returnable_items
+        return [
+            {
+                'item': returnable.item,
+                'return_window_days': returnable.return_window_days,
+                'restocking_fee': returnable.restocking_fee
+            }
+            for returnable in self._evaluate().returnable_items
+        ]
@@ -4,16 +4,24 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAdminUser, IsAuthenticated, AllowAny
+from django.db import transaction
 from django.db.models import Q
 from django.utils import timezone
 from django.shortcuts import get_object_or_404
 from orders.models import Order
-from .models import Return, ReturnHistory, ReturnItem, ReturnImage, ReturnPolicy, ProductReturnPolicy
-from .serializers import ReturnSerializer, ReturnRequestSerializer, ReturnPolicySerializer, ReturnPolicyDetailSerializer
+from .models import (
+    Return, ReturnHistory, ReturnItem, ReturnImage, ReturnPolicy, ProductReturnPolicy,
+    get_global_return_policy
+)
+from .serializers import ReturnSerializer, ReturnListSerializer, ReturnRequestSerializer, ReturnPolicySerializer, ReturnPolicyDetailSerializer
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 from .utils import notify_admins_of_return_request, send_return_status_email, ReturnEligibilityChecker
-from utils.cloudinary_utils import CloudinaryUploader
+from .eligibility import ReturnEligibilityEngine
+from .policies import ReturnPolicyResolver
+from .media import ReturnMediaPipeline
+from .queue import ReturnQueue
+from utils.query_params import product_ids_param
 from django.conf import settings
 import logging
 
@@ -37,18 +45,22 @@ class AdminReturnViewSet(viewsets.ModelViewSet):
 
 
     def get_queryset(self):
-        queryset = Return.objects.all()
+        if self.action == 'list':
+            queryset = ReturnQueue.for_list()
+        elif self.action == 'retrieve':
+            queryset = ReturnQueue.for_detail()
+        else:
+            # Actions that write history re-serialize afterwards, so a
+            # prefetched history would be stale
+            queryset = Return.objects.all()
 
-        # Date filtering
-        date_from = self.request.query_params.get('date_from')
-        date_to = self.request.query_params.get('date_to')
+        return ReturnQueue.filter_dates(queryset, self.request.query_params)
 
-        if date_from:
-            queryset = queryset.filter(created_at__gte=date_from)
-        if date_to:
-            queryset = queryset.filter(created_at__lte=date_to)
 
-        return queryset
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return ReturnListSerializer
+        return ReturnSerializer
 
 
     @action(detail=True, methods=['patch'])
@@ -122,34 +134,16 @@ class CustomerReturnViewset(viewsets.GenericViewSet):
 
     def _handle_return_images(self, return_item, images):
         """
-        Handle uploading images for a return item
-        
+        Stage images for a return item
+
+        The photos are uploaded concurrently once the return is committed,
+        so submission time does not grow with the number of photos.
+
         Args:
             return_item: ReturnItem instance
             images: List of image files
         """
-        for image in images:
-            try:
-                # Upload to Cloudinary
-                result = CloudinaryUploader.upload_image(
-                    image,
-                    folder=settings.CLOUDINARY_STORAGE_FOLDERS['RETURN_IMAGES'],
-                    transformation=[
-                        {'quality': 'auto'},
-                        {'fetch_format': 'auto'},
-                        {'width': 1200, 'height': 1200, 'crop': 'limit'}
-                    ]
-                )
-
-                if result:
-                    ReturnImage.objects.create(
-                        return_item=return_item,
-                        image=result['url'],
-                        public_id=result['public_id']
-                    )
-            except Exception as e:
-                logger.error(f"Failed to upload return image: {str(e)}")
-                continue
+        ReturnMediaPipeline.submit(return_item, images)
     
 
     @action(detail=False, methods=['post'])
@@ -176,7 +170,7 @@ class CustomerReturnViewset(viewsets.GenericViewSet):
         requested_items = request.data.get('items', [])
         for item in requested_items:
             product_id = item.get('product_id')
-            if not any(r['item'].product.id == product_id for r in returnable_items):
+            if not any(r['item'].product_id == product_id for r in returnable_items):
                 return Response({
                     'error': f'Product {product_id} is not eligible for return'
                 }, status=status.HTTP_400_BAD_REQUEST)
@@ -229,31 +223,31 @@ class CustomerReturnViewset(viewsets.GenericViewSet):
             )
 
 
-    @action(detail=True, methods=['get'])
+    @action(detail=False, methods=['get'])
     def eligible_orders(self, request):
-        """ Get orders eligible for return """
-        eligible_orders = Order.objects.filter(
-            user=request.user,
-            order_status = 'delivered',
-        ).exclude(
-            returns__isnull=False
-        )
+        """ Get orders eligible for return, with the items that can still go back """
+        eligible_orders = ReturnEligibilityEngine.eligible_orders(request.user)
 
         return Response({
             'orders': [
                 {
-                    'id': order.id,
-                    'order_date': order.created_at,
-                    'total_amount': order.total_amount,
+                    'id': result.order.id,
+                    'order_date': result.order.created_at,
+                    'delivered_at': result.order.delivered_at,
+                    'total_amount': result.order.total_amount,
                     'items': [
                         {
-                            'id': item.id,
-                            'product_name': item.product.name,
-                            'quantity': item.quantity,
-                            'price': item.price
-                        } for item in order.items.all()
+                            'id': returnable.item.id,
+                            'product_id': returnable.item.product_id,
+                            'product_name': returnable.item.product.name,
+                            'quantity': returnable.item.quantity,
+                            'price': returnable.item.price,
+                            'return_window_days': returnable.return_window_days,
+                            'restocking_fee_percentage': returnable.restocking_fee,
+                            'returnable_until': returnable.returnable_until
+                        } for returnable in result.returnable_items
                     ]
-                } for order in eligible_orders
+                } for result in eligible_orders
             ]
         })
 
@@ -273,7 +267,7 @@ class ReturnPolicyViewSet(viewsets.ReadOnlyModelViewSet):
     @action(detail=False, methods=['get'])
     def current(self, request):
         """Get current global return policy"""
-        policy = ReturnPolicy.objects.first()
+        policy = get_global_return_policy()
         if not policy:
             return Response(
                 {'error': 'No return policy configured'},
@@ -292,21 +286,43 @@ class ReturnPolicyViewSet(viewsets.ReadOnlyModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        global_policy = ReturnPolicy.objects.first()
-        if not global_policy:
+        try:
+            product_id = int(product_id)
+        except ValueError:
+            return Response(
+                {'error': 'Invalid product ID'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # Served from the compiled policy map, not the database
+        policies = ReturnPolicyResolver.policies()
+        if policies is None:
             return Response(
                 {'error': 'No global return policy configured'},
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        product_policy = ProductReturnPolicy.objects.filter(
-            product_id=product_id
-        ).first()
-
         policy_data = {
-            'global_policy': global_policy,
-            'product_policy': product_policy
+            'global_policy': policies.policy,
+            'product_policy': policies.overrides.get(product_id),
+            'effective_policy': policies.effective.get(product_id, policies.default)
         }
 
         serializer = ReturnPolicyDetailSerializer(policy_data)
         return Response(serializer.data)
+
+
+    @action(detail=False, methods=['get'])
+    def product_policies(self, request):
+        """Effective return policy for many products: ?product_ids=1,2,3"""
+        product_ids = product_ids_param(request)
+        if ReturnPolicyResolver.policies() is None:
+            return Response(
+                {'error': 'No global return policy configured'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        effective = ReturnPolicyResolver.effective_many(product_ids)
+        return Response({
+            product_id: policy.as_dict() for product_id, policy in effective.items()
+        })
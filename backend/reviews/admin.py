@@ -1,7 +1,7 @@
 # reviews/admin.py
 
 from django.contrib import admin
-from .models import Review
+from .models import Review, ProductRating
 
 
 @admin.register(Review)
@@ -10,3 +10,13 @@ class ReviewAdmin(admin.ModelAdmin):
     list_filter = ['rating', 'verified_purchase', 'created_at']
     search_fields = ['user__username', 'product__name', 'comment']
     
+
+
+@admin.register(ProductRating)
+class ProductRatingAdmin(admin.ModelAdmin):
+    list_display = ['product', 'average', 'rating_count', 'updated_at']
+    search_fields = ['product__name']
+    readonly_fields = [
+        'product', 'rating_count', 'rating_sum', 'average',
+        'star_1', 'star_2', 'star_3', 'star_4', 'star_5', 'updated_at'
+    ]
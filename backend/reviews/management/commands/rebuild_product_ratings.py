@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from reviews.ratings import ProductRatings
+
+
+class Command(BaseCommand):
+    help = 'Recompute denormalized product rating aggregates from reviews'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--product',
+            action='append',
+            type=int,
+            help='Only rebuild this product id (repeatable)'
+        )
+
+    def handle(self, *args, **options):
+        written = ProductRatings.rebuild(product_ids=options['product'])
+        self.stdout.write(self.style.SUCCESS(f'Wrote {written} rating rows'))
@@ -1,7 +1,8 @@
 # reveiws/models.py
 
-from django.db import models
+from django.db import models, transaction
 from django.core.validators import MinValueValidator, MaxValueValidator
+from orders.purchases import PurchaseLedger
 
 
 
@@ -25,17 +26,77 @@ class Review(models.Model):
     class Meta:
         ordering = ['-created_at']
         unique_together = ['user', 'product']  # one review per user per product
+        indexes = [
+            # Review feed: each filter combination reads rows already in feed order
+            models.Index(fields=['product', '-created_at', '-id'], name='review_product_feed_idx'),
+            models.Index(
+                fields=['product', 'rating', '-created_at', '-id'],
+                name='review_product_rating_idx'
+            ),
+            models.Index(
+                fields=['product', 'verified_purchase', '-created_at', '-id'],
+                name='review_product_verified_idx'
+            ),
+        ]
 
 
     def __str__(self):
         return f"{self.user.username}'s review for {self.product.name}"
 
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember what the product rating aggregates currently count
+        instance._counted = (instance.__dict__.get('product_id'), instance.__dict__.get('rating'))
+        return instance
+
+
     def save(self, *args, **kwargs):
         # Check for verified purchase before saving
         if not self.pk:  # Only check on creation
-            self.verified_purchase = self.user.order_set.filter(
-                items__product=self.product,
-                order_status='delivered'
-            ).exists()
-        super().save(*args, **kwargs)
\ No newline at end of file
+            self.verified_purchase = PurchaseLedger.has_purchased(self.user, self.product_id)
+
+        # The review and the product's rating aggregates change together
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+
+class ProductRating(models.Model):
+    """
+        Review aggregates for one product
+
+        Maintained with F() updates as reviews are created, changed and
+        deleted (see reviews/ratings.py), so stats and rating-sorted
+        listings never scan the Review table.
+    """
+    product = models.OneToOneField(
+        'products.Product',
+        primary_key=True,
+        related_name='rating_summary',
+        on_delete=models.CASCADE
+    )
+    rating_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
+    average = models.FloatField(default=0)
+    star_1 = models.PositiveIntegerField(default=0)
+    star_2 = models.PositiveIntegerField(default=0)
+    star_3 = models.PositiveIntegerField(default=0)
+    star_4 = models.PositiveIntegerField(default=0)
+    star_5 = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-average', '-rating_count'], name='product_rating_avg_idx')
+        ]
+
+
+    def __str__(self):
+        return f"{self.product_id}: {self.average:.1f} ({self.rating_count})"
+
+
+    @property
+    def distribution(self):
+        """ Review count per star, keyed '1' to '5' """
+        return {str(star): getattr(self, f'star_{star}') for star in range(1, 6)}
\ No newline at end of file
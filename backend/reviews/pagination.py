@@ -0,0 +1,60 @@
+# reviews/pagination.py
+
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+from collections import OrderedDict
+
+
+class ReviewCursorPagination(CursorPagination):
+    """
+        Keyset pagination for the review feed
+
+        Each page filters on created_at past the cursor's position instead of
+        an OFFSET into the whole feed, so deep pages cost the same as the
+        first. Rows sharing that created_at are skipped with a small offset
+        kept in the cursor; id only breaks ties in the ORDER BY. The total
+        is only counted on the first page and stops at COUNT_CAP, reported
+        as "1000+" beyond it.
+    """
+    page_size = settings.REVIEW_FEED['PAGE_SIZE']
+    page_size_query_param = 'page_size'
+    max_page_size = settings.REVIEW_FEED['MAX_PAGE_SIZE']
+    ordering = ('-created_at', '-id')
+    count_cap = settings.REVIEW_FEED['COUNT_CAP']
+
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.count = None
+        if not request.query_params.get(self.cursor_query_param):
+            self.count = self.get_count(queryset)
+        return super().paginate_queryset(queryset, request, view)
+
+
+    def get_count(self, queryset):
+        """ Exact count up to the cap, "<cap>+" beyond it """
+        queryset = queryset.order_by()
+        if self.count_cap is None:
+            return queryset.count()
+
+        count = queryset[:self.count_cap + 1].count()
+        return f"{self.count_cap}+" if count > self.count_cap else count
+
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('count', self.count),
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data)
+        ]))
+
+
+    def get_paginated_response_schema(self, schema):
+        schema = super().get_paginated_response_schema(schema)
+        schema['properties']['count'] = {
+            'oneOf': [{'type': 'integer'}, {'type': 'string'}],
+            'nullable': True,
+            'example': 123,
+        }
+        return schema
@@ -0,0 +1,143 @@
+# reviews/ratings.py
+
+from django.db.models import F, Q, Count, Sum, Case, When, Value, FloatField, Exists, OuterRef
+from django.db.models.functions import Cast
+from django.utils import timezone
+from .models import Review, ProductRating
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ProductRatings:
+    """
+        Keep ProductRating rows in step with reviews
+
+        Each review change is applied as a single UPDATE of F() deltas on
+        the product's row, inside the review's own transaction, so
+        concurrent reviews never lose a count. rebuild() recomputes rows
+        from the Review table to repair drift.
+    """
+    STARS = range(1, 6)
+    BATCH_SIZE = 1000
+
+
+    @classmethod
+    def apply(cls, product_id, added=None, removed=None):
+        """
+            Apply one review change to a product's aggregates
+
+            Args:
+                product_id: Reviewed product
+                added: Rating now counted (None if none)
+                removed: Rating no longer counted (None if none)
+        """
+        if added == removed:
+            return
+
+        count_delta = (added is not None) - (removed is not None)
+        sum_delta = (added or 0) - (removed or 0)
+
+        updates = {
+            'rating_count': F('rating_count') + count_delta,
+            'rating_sum': F('rating_sum') + sum_delta,
+            # Right-hand sides read the row's old values
+            'average': Case(
+                When(rating_count=-count_delta, then=Value(0.0)),
+                default=Cast(F('rating_sum') + sum_delta, FloatField()) / (
+                    F('rating_count') + count_delta
+                ),
+                output_field=FloatField()
+            ),
+            'updated_at': timezone.now(),
+        }
+        for rating, delta in ((added, 1), (removed, -1)):
+            if rating is not None:
+                field = f'star_{rating}'
+                updates[field] = updates.get(field, F(field)) + delta
+
+        if added is not None:
+            # Removals never create a row, so cascade deletes leave no orphan
+            ProductRating.objects.bulk_create(
+                [ProductRating(product_id=product_id)], ignore_conflicts=True
+            )
+        ProductRating.objects.filter(product_id=product_id).update(**updates)
+
+
+    @classmethod
+    def review_saved(cls, review, created):
+        """ post_save hook: count the review, or move it if its rating changed """
+        current = (review.product_id, review.rating)
+        counted = None if created else getattr(review, '_counted', None)
+
+        if not created and counted is None:
+            # Built by hand rather than loaded; nothing reliable to diff
+            logger.warning(f"Review {review.pk} saved without a loaded rating")
+        elif counted is None or counted[0] != current[0]:
+            if counted is not None:
+                cls.apply(counted[0], removed=counted[1])
+            cls.apply(current[0], added=current[1])
+        else:
+            cls.apply(current[0], added=current[1], removed=counted[1])
+
+        review._counted = current
+
+
+    @classmethod
+    def review_deleted(cls, review):
+        """ post_delete hook """
+        counted = getattr(review, '_counted', (review.product_id, review.rating))
+        cls.apply(counted[0], removed=counted[1])
+
+
+    @classmethod
+    def rebuild(cls, product_ids=None):
+        """
+            Recompute aggregates from the Review table
+
+            Args:
+                product_ids: Products to rebuild (None for all)
+
+            Returns:
+                int: Number of rows written
+        """
+        reviews = Review.objects.all()
+        stale = ProductRating.objects.all()
+        if product_ids is not None:
+            reviews = reviews.filter(product_id__in=product_ids)
+            stale = stale.filter(product_id__in=product_ids)
+
+        rows = reviews.order_by().values('product_id').annotate(
+            rating_count=Count('id'),
+            rating_sum=Sum('rating'),
+            **{
+                f'star_{star}': Count('id', filter=Q(rating=star))
+                for star in cls.STARS
+            }
+        )
+
+        now = timezone.now()
+        ratings = [
+            ProductRating(
+                average=row['rating_sum'] / row['rating_count'],
+                updated_at=now,
+                **row
+            )
+            for row in rows
+        ]
+
+        # Products whose reviews are all gone keep no row
+        stale.exclude(
+            Exists(Review.objects.filter(product_id=OuterRef('product_id')))
+        ).delete()
+        ProductRating.objects.bulk_create(
+            ratings,
+            batch_size=cls.BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=['product'],
+            update_fields=[
+                'rating_count', 'rating_sum', 'average', 'updated_at',
+                *(f'star_{star}' for star in cls.STARS)
+            ]
+        )
+        return len(ratings)
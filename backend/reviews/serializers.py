@@ -2,7 +2,8 @@
 
 from rest_framework import serializers
 from .models import Review
-from users.serializers import UserProfileSerializer
+from users.serializers import UserProfileSerializer, BaseUserSerializer
+from users.models import User
 from products.serializers import ProductListSerializer
 from products.models import Product
 
@@ -77,6 +78,40 @@ class ReviewSerializer(serializers.ModelSerializer):
            )
     
 
+class ReviewerSerializer(BaseUserSerializer):
+    """ Public reviewer details shown in the review feed """
+    class Meta:
+        model = User
+        fields = ['id', 'first_name', 'last_name', 'full_name', 'avatar_url']
+
+
+class ReviewedProductSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Product
+        fields = ['id', 'name', 'slug']
+
+
+class ReviewFeedSerializer(serializers.ModelSerializer):
+    """ Read-only review for the feed; every field comes from one joined query """
+    user = ReviewerSerializer(read_only=True)
+    product = ReviewedProductSerializer(read_only=True)
+
+    # Columns the serializer reads, for QuerySet.only()
+    QUERY_FIELDS = [
+        'id', 'rating', 'comment', 'verified_purchase', 'created_at',
+        'user__id', 'user__first_name', 'user__last_name', 'user__avatar_public_id',
+        'product__id', 'product__name', 'product__slug',
+    ]
+
+    class Meta:
+        model = Review
+        fields = [
+            'id', 'user', 'product', 'rating',
+            'comment', 'verified_purchase', 'created_at'
+        ]
+        read_only_fields = fields
+
+
 class ProductReviewsSerializer(serializers.Serializer):
     """Serializer for product review statistics"""
     total_reviews = serializers.IntegerField()
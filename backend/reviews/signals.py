@@ -0,0 +1,18 @@
+# reviews/signals.py
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Review
+from .ratings import ProductRatings
+
+
+@receiver(post_save, sender=Review)
+def count_review(sender, instance, created, **kwargs):
+    """ Fold a new or edited review into its product's rating summary """
+    ProductRatings.review_saved(instance, created)
+
+
+@receiver(post_delete, sender=Review)
+def uncount_review(sender, instance, **kwargs):
+    """ Remove a deleted review from its product's rating summary """
+    ProductRatings.review_deleted(instance)
@@ -0,0 +1,72 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from unittest.mock import patch
+from decimal import Decimal
+from reviews.models import Review
+from reviews.pagination import ReviewCursorPagination
+from products.models import Product, Category
+from users.models import User
+
+
+class ReviewFeedTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        category = Category.objects.create(name='Body Wave')
+        self.product = Product.objects.create(
+            name='Body Wave 24', category=category, description='Wavy',
+            price=Decimal('150.00'), stock=10
+        )
+        self.reviews = [
+            Review.objects.create(
+                user=User.objects.create_user(
+                    email=f'reviewer{index}@example.com', username=f'reviewer{index}',
+                    first_name='Review', last_name=str(index), password='reviewpass123'
+                ),
+                product=self.product,
+                rating=5 if index % 2 else 3,
+                comment=f'Review {index}'
+            )
+            for index in range(5)
+        ]
+        self.url = reverse('review-feed')
+
+
+    def test_cursor_pages_walk_the_whole_feed(self):
+        # Count query plus one joined page query
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url, {'product_id': self.product.id, 'page_size': 2})
+        self.assertEqual(response.data['count'], 5)
+        self.assertEqual(set(response.data['results'][0]['product']), {'id', 'name', 'slug'})
+
+        seen = [item['id'] for item in response.data['results']]
+        next_url = response.data['next']
+        while next_url:
+            response = self.client.get(next_url)
+            # Deep pages skip the count
+            self.assertIsNone(response.data['count'])
+            seen += [item['id'] for item in response.data['results']]
+            next_url = response.data['next']
+
+        self.assertEqual(seen, [review.id for review in reversed(self.reviews)])
+
+
+    def test_filters_and_count_cap(self):
+        response = self.client.get(self.url, {'product_id': self.product.id, 'rating': 5})
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual({item['rating'] for item in response.data['results']}, {5})
+
+        with patch.object(ReviewCursorPagination, 'count_cap', 3):
+            response = self.client.get(self.url, {'product_id': self.product.id})
+        self.assertEqual(response.data['count'], '3+')
+        self.assertEqual(len(response.data['results']), 5)
+
+
+    def test_list_keeps_page_number_pagination(self):
+        response = self.client.get(
+            reverse('review-list'), {'product_id': self.product.id, 'page': 1}
+        )
+        self.assertEqual(response.data['count'], 5)
+        self.assertIsNone(response.data['next'])
+        # Full ReviewSerializer rows, not the slim feed shape
+        self.assertIn('price_data', response.data['results'][0]['product'])
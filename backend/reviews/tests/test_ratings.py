@@ -0,0 +1,105 @@
+from django.test import TestCase
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APIClient
+from decimal import Decimal
+from io import StringIO
+from reviews.models import Review, ProductRating
+from products.models import Product, Category
+from users.models import User
+
+
+class ProductRatingsTest(TestCase):
+    def setUp(self):
+        category = Category.objects.create(name='Curly Hairs')
+        self.product = Product.objects.create(
+            name='Kinky Curly 18', category=category, description='Curly',
+            price=Decimal('100.00'), stock=10
+        )
+        self.other = Product.objects.create(
+            name='Kinky Curly 22', category=category, description='Curly',
+            price=Decimal('120.00'), stock=10
+        )
+        self.users = [
+            User.objects.create_user(
+                email=f'reviewer{index}@example.com', username=f'reviewer{index}',
+                first_name='Review', last_name=str(index), password='reviewpass123'
+            )
+            for index in range(3)
+        ]
+
+
+    def review(self, user, rating, product=None):
+        return Review.objects.create(
+            user=user, product=product or self.product, rating=rating, comment='Lovely'
+        )
+
+
+    def summary(self, product=None):
+        return ProductRating.objects.get(product=product or self.product)
+
+
+    def test_create_update_and_delete_keep_aggregates(self):
+        first = self.review(self.users[0], 5)
+        self.review(self.users[1], 2)
+        summary = self.summary()
+        self.assertEqual((summary.rating_count, summary.rating_sum, summary.average), (2, 7, 3.5))
+        self.assertEqual(summary.distribution, {'1': 0, '2': 1, '3': 0, '4': 0, '5': 1})
+
+        first = Review.objects.get(pk=first.pk)
+        first.rating = 4
+        first.save()
+        summary = self.summary()
+        self.assertEqual((summary.rating_count, summary.average), (2, 3.0))
+        self.assertEqual((summary.star_4, summary.star_5), (1, 0))
+
+        # Moving a review to another product moves its rating too
+        first.product = self.other
+        first.save()
+        self.assertEqual((self.summary().rating_count, self.summary().average), (1, 2.0))
+        self.assertEqual(self.summary(self.other).star_4, 1)
+
+        Review.objects.filter(product=self.product).delete()
+        summary = self.summary()
+        self.assertEqual((summary.rating_count, summary.rating_sum, summary.average), (0, 0, 0.0))
+
+
+    def test_rebuild_repairs_drift(self):
+        self.review(self.users[0], 5)
+        self.review(self.users[1], 4)
+        ProductRating.objects.filter(product=self.product).update(rating_count=9, star_5=7)
+        ProductRating.objects.create(product=self.other, rating_count=3, rating_sum=3, average=1.0)
+
+        out = StringIO()
+        call_command('rebuild_product_ratings', stdout=out)
+        self.assertIn('Wrote 1 rating rows', out.getvalue())
+
+        summary = self.summary()
+        self.assertEqual((summary.rating_count, summary.star_5, summary.average), (2, 1, 4.5))
+        self.assertFalse(ProductRating.objects.filter(product=self.other).exists())
+
+
+    def test_product_delete_leaves_no_orphan_rows(self):
+        self.review(self.users[0], 5)
+        self.product.delete()
+        self.assertFalse(ProductRating.objects.exists())
+
+
+    def test_stats_and_listing_read_the_summary(self):
+        for user, rating in zip(self.users, (5, 4, 4)):
+            self.review(user, rating)
+        client = APIClient()
+
+        with self.assertNumQueries(1):
+            response = client.get(
+                reverse('product-review-stats', kwargs={'product_id': self.product.id})
+            )
+        self.assertEqual(response.data['total_reviews'], 3)
+        self.assertEqual(response.data['average_rating'], 4.3)
+        self.assertEqual(response.data['rating_distribution']['4'], 2)
+
+        response = client.get(reverse('product-list'), {'ordering': '-rating'})
+        results = response.data['results'] if 'results' in response.data else response.data
+        self.assertEqual([item['id'] for item in results], [self.product.id, self.other.id])
+        self.assertEqual(results[0]['rating'], {'average': 4.3, 'count': 3})
+        self.assertEqual(results[1]['rating'], {'average': 0, 'count': 0})
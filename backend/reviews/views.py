@@ -1,12 +1,13 @@
 # reviews/views.py
 
 from rest_framework import viewsets, status, generics
+from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
-from django.db.models import Avg
 from django.shortcuts import get_object_or_404
 from .models import Review
-from .serializers import ReviewSerializer, ProductReviewsSerializer
+from .serializers import ReviewSerializer, ReviewFeedSerializer, ProductReviewsSerializer
+from .pagination import ReviewCursorPagination
 from products.models import Product
 
 
@@ -19,6 +20,12 @@ class ReviewViewSet(viewsets.ModelViewSet):
         else:
             permission_classes = [AllowAny]
         return [permission() for permission in permission_classes]
+
+
+    def get_serializer_class(self):
+        if self.action == 'feed':
+            return ReviewFeedSerializer
+        return ReviewSerializer
     
 
     def get_queryset(self):
@@ -39,9 +46,29 @@ class ReviewViewSet(viewsets.ModelViewSet):
         if rating is not None:
             queryset = queryset.filter(rating=rating)
 
-        return queryset.order_by('-created_at')
+        if self.action == 'feed':
+            # One joined query with only the columns the feed renders
+            queryset = queryset.select_related('user', 'product').only(
+                *ReviewFeedSerializer.QUERY_FIELDS
+            )
+
+        return queryset.order_by('-created_at', '-id')
     
 
+    @action(detail=False, methods=['get'], pagination_class=ReviewCursorPagination)
+    def feed(self, request):
+        """
+            Keyset-paginated review feed
+
+            Takes the same filters as the list, pages with ?cursor= instead
+            of ?page= and caps the first page's count.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
@@ -71,23 +98,21 @@ class ProductReviewStatsView(generics.RetrieveAPIView):
 
     def get_object(self):
         product_id = self.kwargs['product_id']
-        product = get_object_or_404(Product, id=product_id)
-
-
-        # Get reveiw statistics
-        reviews = Review.objects.filter(product=product)
-        total_reviews = reviews.count()
-        average_rating = reviews.aggregate(Avg('rating'))['rating__avg'] or 0
-
-
-        # Get rating distribution
-        rating_distribution = {
-            str(i): reviews.filter(rating=i).count()
-            for i in range(1, 6)
-        }
+        product = get_object_or_404(
+            Product.objects.select_related('rating_summary'), id=product_id
+        )
+
+        # Served from the denormalized summary, not the Review table
+        summary = getattr(product, 'rating_summary', None)
+        if summary is None:
+            return {
+                'total_reviews': 0,
+                'average_rating': 0,
+                'rating_distribution': {str(i): 0 for i in range(1, 6)}
+            }
 
         return {
-            'total_reviews': total_reviews,
-            'average_rating': round(average_rating, 1),
-            'rating_distribution': rating_distribution
+            'total_reviews': summary.rating_count,
+            'average_rating': round(summary.average, 1),
+            'rating_distribution': summary.distribution
         }
\ No newline at end of file
@@ -1,12 +1,26 @@
 # shipping/admin.py
 
 from django.contrib import admin
-from .models import ShippingRate
+from .models import ShippingZone, ShippingRate, ShippingRateTier
+
+
+class ShippingRateTierInline(admin.TabularInline):
+    model = ShippingRateTier
+    extra = 0
+
+
+@admin.register(ShippingZone)
+class ShippingZoneAdmin(admin.ModelAdmin):
+    list_display = ['name', 'countries', 'is_active', 'updated_at']
+    list_filter = ['is_active']
+    search_fields = ['name']
+    readonly_fields = ['created_at', 'updated_at']
 
 
 @admin.register(ShippingRate)
 class ShippingRateAdmin(admin.ModelAdmin):
-    list_display = ['currency_code', 'flat_rate', 'is_active', 'created_at', 'updated_at']
-    list_filter = ['currency_code', 'is_active', 'created_at']
-    search_fields = ['currency_code']
-    readonly_fields = ['created_at', 'updated_at']
\ No newline at end of file
+    list_display = ['currency_code', 'zone', 'flat_rate', 'free_shipping_threshold', 'is_active', 'created_at', 'updated_at']
+    list_filter = ['currency_code', 'zone', 'is_active', 'created_at']
+    search_fields = ['currency_code', 'zone__name']
+    readonly_fields = ['created_at', 'updated_at']
+    inlines = [ShippingRateTierInline]
\ No newline at end of file
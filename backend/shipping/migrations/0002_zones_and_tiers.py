@@ -0,0 +1,70 @@
+# Generated by Django 5.1.2 on 2026-10-19 14:04
+
+import django.core.validators
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shipping', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ShippingZone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('countries', models.JSONField(blank=True, default=list, help_text='Country names or ISO codes in this zone (e.g. ["NG", "Nigeria"])')),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AddField(
+            model_name='shippingrate',
+            name='free_shipping_threshold',
+            field=models.DecimalField(blank=True, decimal_places=2, help_text='Order amount (in this currency) from which shipping is free', max_digits=10, null=True, validators=[django.core.validators.MinValueValidator(Decimal('0.00'))]),
+        ),
+        migrations.AlterField(
+            model_name='shippingrate',
+            name='currency_code',
+            field=models.CharField(help_text='Currency code representing the region (e.g. USD, NGN)', max_length=3),
+        ),
+        migrations.CreateModel(
+            name='ShippingRateTier',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('basis', models.CharField(choices=[('weight', 'Total weight (kg)'), ('quantity', 'Item count')], max_length=10)),
+                ('min_value', models.DecimalField(decimal_places=3, help_text='Tier applies from this total weight or item count', max_digits=10, validators=[django.core.validators.MinValueValidator(Decimal('0'))])),
+                ('fee', models.DecimalField(decimal_places=2, help_text="Shipping fee in the rate's currency", max_digits=10, validators=[django.core.validators.MinValueValidator(Decimal('0.00'))])),
+                ('rate', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tiers', to='shipping.shippingrate')),
+            ],
+            options={
+                'ordering': ['rate', 'basis', 'min_value'],
+            },
+        ),
+        migrations.AddField(
+            model_name='shippingrate',
+            name='zone',
+            field=models.ForeignKey(blank=True, help_text="Destination zone; leave empty for the currency's default rate", null=True, on_delete=django.db.models.deletion.CASCADE, related_name='rates', to='shipping.shippingzone'),
+        ),
+        migrations.AddConstraint(
+            model_name='shippingrate',
+            constraint=models.UniqueConstraint(fields=('currency_code', 'zone'), name='unique_zone_shipping_rate'),
+        ),
+        migrations.AddConstraint(
+            model_name='shippingrate',
+            constraint=models.UniqueConstraint(condition=models.Q(('zone__isnull', True)), fields=('currency_code',), name='unique_default_shipping_rate'),
+        ),
+        migrations.AddConstraint(
+            model_name='shippingratetier',
+            constraint=models.UniqueConstraint(fields=('rate', 'basis', 'min_value'), name='unique_shipping_rate_tier'),
+        ),
+    ]
@@ -5,19 +5,60 @@ from django.core.validators import MinValueValidator
 from decimal import Decimal
 
 
+class ShippingZone(models.Model):
+    """Group of destination countries that share shipping rates"""
+    name = models.CharField(max_length=100, unique=True)
+    countries = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="Country names or ISO codes in this zone (e.g. [\"NG\", \"Nigeria\"])"
+    )
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
+    def save(self, *args, **kwargs):
+        # Countries are matched case-insensitively
+        self.countries = sorted({
+            str(country).strip().upper() for country in self.countries if str(country).strip()
+        })
+        super().save(*args, **kwargs)
+
+
 class ShippingRate(models.Model):
     """Store shipping rate for each currency/region"""
     currency_code = models.CharField(
         max_length=3,
-        unique=True,
         help_text="Currency code representing the region (e.g. USD, NGN)"
     )
+    zone = models.ForeignKey(
+        ShippingZone,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='rates',
+        help_text="Destination zone; leave empty for the currency's default rate"
+    )
     flat_rate = models.DecimalField(
         max_digits=10,
         decimal_places=2,
         validators=[MinValueValidator(Decimal('0.00'))],
         help_text="Flat shipping rate in the region's currency"
     )
+    free_shipping_threshold = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(Decimal('0.00'))],
+        help_text="Order amount (in this currency) from which shipping is free"
+    )
     is_active = models.BooleanField(
         default=True,
         help_text="Whether this shipping rate is active"
@@ -29,6 +70,56 @@ class ShippingRate(models.Model):
         ordering = ['currency_code']
         verbose_name = "Shipping Rate"
         verbose_name_plural = "Shipping Rates"
+        constraints = [
+            models.UniqueConstraint(
+                fields=['currency_code', 'zone'],
+                name='unique_zone_shipping_rate'
+            ),
+            models.UniqueConstraint(
+                fields=['currency_code'],
+                condition=models.Q(zone__isnull=True),
+                name='unique_default_shipping_rate'
+            )
+        ]
     
     def __str__(self):
-        return f'Shipping Rate for {self.currency_code}'
\ No newline at end of file
+        if self.zone_id:
+            return f'Shipping Rate for {self.currency_code} ({self.zone})'
+        return f'Shipping Rate for {self.currency_code}'
+
+
+class ShippingRateTier(models.Model):
+    """Fee applying from a total weight or item count upwards"""
+    BASIS_WEIGHT = 'weight'
+    BASIS_QUANTITY = 'quantity'
+    BASIS_CHOICES = [
+        (BASIS_WEIGHT, 'Total weight (kg)'),
+        (BASIS_QUANTITY, 'Item count'),
+    ]
+
+    rate = models.ForeignKey(ShippingRate, on_delete=models.CASCADE, related_name='tiers')
+    basis = models.CharField(max_length=10, choices=BASIS_CHOICES)
+    min_value = models.DecimalField(
+        max_digits=10,
+        decimal_places=3,
+        validators=[MinValueValidator(Decimal('0'))],
+        help_text="Tier applies from this total weight or item count"
+    )
+    fee = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        validators=[MinValueValidator(Decimal('0.00'))],
+        help_text="Shipping fee in the rate's currency"
+    )
+
+    class Meta:
+        ordering = ['rate', 'basis', 'min_value']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['rate', 'basis', 'min_value'],
+                name='unique_shipping_rate_tier'
+            )
+        ]
+
+    def __str__(self):
+        return f'{self.rate} from {self.min_value} ({self.basis}): {self.fee}'
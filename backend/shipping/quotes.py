@@ -0,0 +1,240 @@
+# shipping/quotes.py
+
+from django.db import transaction
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+from bisect import bisect_right
+from currencies.utils import CurrencyConverter
+from utils.cache import local_cache
+from .models import ShippingRate, ShippingRateTier
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ShippingQuote:
+    """ Shipping fee for one destination and basket """
+    currency: str
+    fee: Decimal
+    country: Optional[str] = None
+    zone: Optional[str] = None
+    is_free: bool = False
+    free_shipping_threshold: Optional[Decimal] = None
+
+
+@dataclass
+class CompiledRate:
+    """ One rate with its tiers flattened into sorted lookup lists """
+    flat_rate: Decimal
+    free_shipping_threshold: Optional[Decimal]
+    zone: Optional[str]
+    # basis -> (sorted tier minimums, fees in the same order)
+    tiers: Dict[str, Tuple[List[Decimal], List[Decimal]]]
+
+
+    def fee_for(self, quantity, weight):
+        """ Highest applicable tier fee, or the flat rate when none applies """
+        fees = []
+        for basis, measure in (
+            (ShippingRateTier.BASIS_WEIGHT, weight),
+            (ShippingRateTier.BASIS_QUANTITY, quantity),
+        ):
+            if basis not in self.tiers:
+                continue
+            minimums, tier_fees = self.tiers[basis]
+            index = bisect_right(minimums, Decimal(str(measure))) - 1
+            if index >= 0:
+                fees.append(tier_fees[index])
+        return max(fees) if fees else self.flat_rate
+
+
+class ShippingTable:
+    """
+        Every active shipping rule, compiled for in-memory lookups
+
+        Zone rates are keyed by (currency, country) and default rates by
+        currency, so a quote is two dict lookups and a bisect.
+    """
+    def __init__(self, defaults, zoned):
+        self.defaults = defaults
+        self.zoned = zoned
+
+
+    def lookup(self, currency, country=None):
+        if country:
+            rate = self.zoned.get((currency, country))
+            if rate is not None:
+                return rate
+        return self.defaults.get(currency)
+
+
+@local_cache('shipping_table')
+def _compiled_table():
+    return ShippingQuoteEngine.compile()
+
+
+class ShippingQuoteEngine:
+    """
+        Shipping quotes from a cached, compiled rate table
+
+        The whole rate table (zones, tiers, free shipping thresholds) is
+        loaded in two queries, compiled into a ShippingTable and held in
+        the process-local cache. Admin changes invalidate it on every
+        worker, so quoting never touches the database.
+    """
+
+
+    @classmethod
+    def normalize_country(cls, country):
+        return str(country).strip().upper() if country else None
+
+
+    @classmethod
+    def compile(cls):
+        """ Build a ShippingTable from the database """
+        rates = ShippingRate.objects.filter(
+            is_active=True
+        ).exclude(
+            zone__is_active=False
+        ).select_related('zone').prefetch_related('tiers')
+
+        defaults = {}
+        zoned = {}
+        for rate in rates:
+            tiers = {}
+            for tier in sorted(rate.tiers.all(), key=lambda tier: tier.min_value):
+                minimums, fees = tiers.setdefault(tier.basis, ([], []))
+                minimums.append(tier.min_value)
+                fees.append(tier.fee)
+
+            compiled = CompiledRate(
+                flat_rate=rate.flat_rate,
+                free_shipping_threshold=rate.free_shipping_threshold,
+                zone=rate.zone.name if rate.zone else None,
+                tiers=tiers
+            )
+            if rate.zone is None:
+                defaults[rate.currency_code] = compiled
+            else:
+                for country in rate.zone.countries:
+                    zoned[(rate.currency_code, cls.normalize_country(country))] = compiled
+
+        return ShippingTable(defaults, zoned)
+
+
+    @classmethod
+    def table(cls):
+        return _compiled_table()
+
+
+    @classmethod
+    def invalidate(cls):
+        """ Recompile on every worker once the current transaction commits """
+        transaction.on_commit(_compiled_table.invalidate)
+
+
+    @classmethod
+    def quote(cls, currency, subtotal=Decimal('0'), quantity=0, weight=Decimal('0'),
+              country=None, subtotal_currency=CurrencyConverter.BASE_CURRENCY):
+        """
+            Quote shipping for a basket
+
+            Args:
+                currency: Currency (region) the fee is charged in
+                subtotal: Basket value, compared with the free shipping threshold
+                quantity: Number of items
+                weight: Total weight in kg
+                country: Destination country (name or ISO code)
+                subtotal_currency: Currency the subtotal is expressed in
+
+            Returns:
+                ShippingQuote (fee 0 when no rate applies)
+        """
+        country = cls.normalize_country(country)
+        rate = cls.table().lookup(currency, country)
+        if rate is None:
+            return ShippingQuote(currency=currency, fee=0, country=country)
+
+        threshold = rate.free_shipping_threshold
+        if threshold is not None:
+            try:
+                amount = CurrencyConverter.convert_price(
+                    amount=subtotal,
+                    from_currency=subtotal_currency,
+                    to_currency=currency
+                )
+            except Exception as e:
+                logger.error(f"Shipping threshold conversion failed: {str(e)}")
+                amount = None
+
+            if amount is not None and amount >= threshold:
+                return ShippingQuote(
+                    currency=currency,
+                    fee=Decimal('0.00'),
+                    country=country,
+                    zone=rate.zone,
+                    is_free=True,
+                    free_shipping_threshold=threshold
+                )
+
+        return ShippingQuote(
+            currency=currency,
+            fee=rate.fee_for(quantity, weight),
+            country=country,
+            zone=rate.zone,
+            free_shipping_threshold=threshold
+        )
+
+
+    @classmethod
+    def quote_many(cls, requests):
+        """
+            Quote several baskets against one table snapshot
+
+            Args:
+                requests: Iterable of dicts of quote() keyword arguments
+
+            Returns:
+                List of ShippingQuote in request order
+        """
+        return [cls.quote(**request) for request in requests]
+
+
+    @classmethod
+    def quote_carts(cls, carts, currency, country=None):
+        """
+            Quote shipping for many carts with a single item query
+
+            Returns:
+                Dict mapping cart id to ShippingQuote
+        """
+        from cart.models import CartItem
+
+        totals = {cart.id: [Decimal('0'), 0, Decimal('0')] for cart in carts}
+        items = CartItem.objects.filter(cart_id__in=totals.keys()).values_list(
+            'cart_id', 'quantity', 'price_at_add', 'product__weight'
+        )
+        for cart_id, quantity, price, weight in items:
+            total = totals[cart_id]
+            total[0] += price * quantity
+            total[1] += quantity
+            total[2] += (weight or 0) * quantity
+
+        return {
+            cart_id: cls.quote(
+                currency,
+                subtotal=subtotal,
+                quantity=quantity,
+                weight=weight,
+                country=country
+            )
+            for cart_id, (subtotal, quantity, weight) in totals.items()
+        }
+
+
+    @classmethod
+    def quote_cart(cls, cart, currency, country=None):
+        """ Quote shipping for one cart """
+        return cls.quote_carts([cart], currency, country)[cart.id]
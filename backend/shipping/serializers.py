@@ -1,24 +1,47 @@
 # shipping/serializers.py
 
 from rest_framework import serializers
-from .models import ShippingRate
+from .models import ShippingZone, ShippingRate, ShippingRateTier
 from currencies.utils import CurrencyConverter
 from decimal import Decimal
 
 
+class ShippingZoneSerializer(serializers.ModelSerializer):
+    """Serializer for the ShippingZone model"""
+    class Meta:
+        model = ShippingZone
+        fields = ['id', 'name', 'countries', 'is_active', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'created_at', 'updated_at']
+
+
+class ShippingRateTierSerializer(serializers.ModelSerializer):
+    """Serializer for the ShippingRateTier model"""
+    class Meta:
+        model = ShippingRateTier
+        fields = ['id', 'basis', 'min_value', 'fee']
+        read_only_fields = ['id']
+
+
 class ShippingRateSerializer(serializers.ModelSerializer):
     """Serializer for the ShippingRate model"""
+    tiers = ShippingRateTierSerializer(many=True, read_only=True)
+
     class Meta:
         model = ShippingRate
         fields = [
             'id',
             'currency_code',
+            'zone',
             'flat_rate',
+            'free_shipping_threshold',
+            'tiers',
             'is_active',
             'created_at',
             'updated_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
+        # Zone is optional, so uniqueness is checked in validate()
+        validators = []
     
     def validate_currency_code(self, value):
         """Ensure currency code exists in supported currencies"""
@@ -27,6 +50,20 @@ class ShippingRateSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError(f"Currency {value} is not supported")
         return value.upper()
 
+    def validate(self, attrs):
+        """One rate per currency and zone (and one default per currency)"""
+        currency_code = attrs.get('currency_code', getattr(self.instance, 'currency_code', None))
+        zone = attrs.get('zone', getattr(self.instance, 'zone', None))
+
+        duplicates = ShippingRate.objects.filter(currency_code=currency_code, zone=zone)
+        if self.instance:
+            duplicates = duplicates.exclude(pk=self.instance.pk)
+        if duplicates.exists():
+            raise serializers.ValidationError(
+                "A shipping rate for this currency and zone already exists"
+            )
+        return attrs
+
 
 class ShippingCalculationSerializer(serializers.Serializer):
     """Serializer for shipping calculation endpoint"""
@@ -36,9 +73,35 @@ class ShippingCalculationSerializer(serializers.Serializer):
         decimal_places=2,
         min_value=Decimal('0.00')
     )
+    country = serializers.CharField(max_length=100, required=False, allow_blank=True)
+    quantity = serializers.IntegerField(min_value=0, required=False, default=0)
+    weight = serializers.DecimalField(
+        max_digits=10,
+        decimal_places=3,
+        min_value=Decimal('0'),
+        required=False,
+        default=Decimal('0')
+    )
 
     def validate_currency(self, value):
         currencies = CurrencyConverter.get_active_currencies()
         if value not in currencies:
             raise serializers.ValidationError(f"Currency {value} is not supported")
-        return value.upper()
\ No newline at end of file
+        return value.upper()
+
+
+class ShippingQuoteRequestSerializer(serializers.Serializer):
+    """Serializer for the batched quote endpoint"""
+    quotes = ShippingCalculationSerializer(many=True, allow_empty=False)
+
+
+class ShippingQuoteSerializer(serializers.Serializer):
+    """Serializer for a ShippingQuote"""
+    currency = serializers.CharField()
+    fee = serializers.DecimalField(max_digits=10, decimal_places=2)
+    country = serializers.CharField(allow_null=True)
+    zone = serializers.CharField(allow_null=True)
+    is_free = serializers.BooleanField()
+    free_shipping_threshold = serializers.DecimalField(
+        max_digits=10, decimal_places=2, allow_null=True
+    )
@@ -0,0 +1,14 @@
+# shipping/signals.py
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import ShippingZone, ShippingRate, ShippingRateTier
+from .quotes import ShippingQuoteEngine
+
+
+@receiver([post_save, post_delete], sender=ShippingZone)
+@receiver([post_save, post_delete], sender=ShippingRate)
+@receiver([post_save, post_delete], sender=ShippingRateTier)
+def invalidate_shipping_table(sender, instance, **kwargs):
+    """ Recompile the shipping table on every worker """
+    ShippingQuoteEngine.invalidate()
@@ -0,0 +1,159 @@
+from django.test import TestCase
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from decimal import Decimal
+from currencies.models import Currency
+from currencies.utils import ExchangeRateSnapshots
+from users.models import User
+from cart.models import Cart, CartItem
+from products.models import Category, Product
+from ..models import ShippingZone, ShippingRate, ShippingRateTier
+from ..quotes import ShippingQuoteEngine
+
+
+class ShippingQuoteEngineTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        ExchangeRateSnapshots._local = (None, None)
+        Currency.objects.create(
+            code='USD', name='US Dollar', symbol='$', exchange_rate=Decimal('1.00')
+        )
+        Currency.objects.create(
+            code='NGN', name='Nigerian Naira', symbol='₦', exchange_rate=Decimal('1500.00')
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.lagos = ShippingZone.objects.create(name='Lagos', countries=['ng', ' Nigeria '])
+            self.default = ShippingRate.objects.create(
+                currency_code='NGN', flat_rate=Decimal('10000.00')
+            )
+            self.local = ShippingRate.objects.create(
+                currency_code='NGN', zone=self.lagos, flat_rate=Decimal('3000.00'),
+                free_shipping_threshold=Decimal('300000.00')
+            )
+            ShippingRateTier.objects.create(
+                rate=self.local, basis='quantity', min_value=3, fee=Decimal('4000.00')
+            )
+            ShippingRateTier.objects.create(
+                rate=self.local, basis='weight', min_value=Decimal('2.5'), fee=Decimal('6000.00')
+            )
+
+
+    def test_zone_tiers_and_free_threshold(self):
+        quote = ShippingQuoteEngine.quote('NGN', subtotal=Decimal('50'), quantity=1, country='NIGERIA')
+        self.assertEqual((quote.fee, quote.zone), (Decimal('3000.00'), 'Lagos'))
+
+        quote = ShippingQuoteEngine.quote('NGN', subtotal=Decimal('50'), quantity=3, country='ng')
+        self.assertEqual(quote.fee, Decimal('4000.00'))
+
+        # Both tiers apply: the higher fee wins
+        quote = ShippingQuoteEngine.quote(
+            'NGN', subtotal=Decimal('50'), quantity=3, weight=Decimal('3'), country='NG'
+        )
+        self.assertEqual(quote.fee, Decimal('6000.00'))
+
+        # $200 is 300,000 NGN
+        quote = ShippingQuoteEngine.quote('NGN', subtotal=Decimal('200'), quantity=5, country='NG')
+        self.assertTrue(quote.is_free)
+        self.assertEqual(quote.fee, Decimal('0.00'))
+
+
+    def test_default_rate_and_missing_rate(self):
+        quote = ShippingQuoteEngine.quote('NGN', country='Ghana')
+        self.assertEqual((quote.fee, quote.zone), (Decimal('10000.00'), None))
+        self.assertEqual(ShippingQuoteEngine.quote('GHS').fee, 0)
+
+
+    def test_quotes_are_served_from_memory_until_admin_change(self):
+        ShippingQuoteEngine.quote('NGN', country='NG')
+        with self.assertNumQueries(0):
+            for _ in range(10):
+                ShippingQuoteEngine.quote('NGN', quantity=3, country='NG')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.default.flat_rate = Decimal('12000.00')
+            self.default.save()
+        self.assertEqual(ShippingQuoteEngine.quote('NGN').fee, Decimal('12000.00'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.lagos.is_active = False
+            self.lagos.save()
+        self.assertEqual(ShippingQuoteEngine.quote('NGN', country='NG').fee, Decimal('12000.00'))
+
+
+    def test_quote_carts_uses_one_query(self):
+        category = Category.objects.create(name='Straight Hairs')
+        product = Product.objects.create(
+            name='Raw Straight 20', category=category, description='Straight',
+            price=Decimal('100.00'), stock=10, weight=Decimal('1.0')
+        )
+        carts = [Cart.objects.create(session_id=f'session-{index}') for index in range(3)]
+        for quantity, cart in enumerate(carts, start=1):
+            CartItem.objects.create(
+                cart=cart, product=product, quantity=quantity, price_at_add=Decimal('10.00')
+            )
+
+        ShippingQuoteEngine.quote('NGN', country='NG')
+        with self.assertNumQueries(1):
+            quotes = ShippingQuoteEngine.quote_carts(carts, 'NGN', 'NG')
+
+        self.assertEqual(
+            [quotes[cart.id].fee for cart in carts],
+            [Decimal('3000.00'), Decimal('3000.00'), Decimal('6000.00')]
+        )
+
+
+class ShippingQuoteViewTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        ExchangeRateSnapshots._local = (None, None)
+        self.client = APIClient()
+        Currency.objects.create(
+            code='USD', name='US Dollar', symbol='$', exchange_rate=Decimal('1.00')
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            ShippingRate.objects.create(
+                currency_code='USD', flat_rate=Decimal('15.00'),
+                free_shipping_threshold=Decimal('100.00')
+            )
+
+
+    def test_batched_quotes(self):
+        response = self.client.post(reverse('shipping-rate-quotes'), {
+            'quotes': [
+                {'currency': 'USD', 'order_amount': '40.00'},
+                {'currency': 'USD', 'order_amount': '150.00'},
+            ]
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(item['fee'], item['is_free']) for item in response.data],
+            [('15.00', False), ('0.00', True)]
+        )
+
+
+    def test_order_shipping_is_quoted_from_items(self):
+        user = User.objects.create_user(
+            email='buyer@example.com', first_name='Ada', last_name='Buyer',
+            password='buyerpass123'
+        )
+        Cart.objects.create(user=user)
+        category = Category.objects.create(name='Straight Hairs')
+        product = Product.objects.create(
+            name='Raw Straight 20', category=category, description='Straight',
+            price=Decimal('60.00'), stock=10
+        )
+        self.client.force_authenticate(user=user)
+
+        response = self.client.post(reverse('order-list'), {
+            'shipping_address': 'Lagos',
+            'currency': 'USD',
+            'items': [{'product_id': product.id, 'quantity': 2}]
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Decimal(response.data['shipping_fee']), Decimal('0.00'))
+        self.assertEqual(Decimal(response.data['total_amount']), Decimal('120.00'))
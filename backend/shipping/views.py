@@ -5,7 +5,11 @@ from rest_framework.response import Response
 from rest_framework.decorators import action
 from rest_framework.permissions import AllowAny
 from .models import ShippingRate
-from .serializers import ShippingRateSerializer, ShippingCalculationSerializer
+from .serializers import (
+    ShippingRateSerializer, ShippingCalculationSerializer,
+    ShippingQuoteRequestSerializer, ShippingQuoteSerializer
+)
+from .quotes import ShippingQuoteEngine
 from decimal import Decimal
 from django.conf import settings
 
@@ -29,22 +33,43 @@ class ShippingRateViewSet(viewsets.ReadOnlyModelViewSet):
         currency = serializer.validated_data['currency']
         order_amount = serializer.validated_data['order_amount']
 
-        # Get shipping rate for the currency
-        try:
-            shipping_rate = ShippingRate.objects.get(
-                currency_code=currency,
-                is_active=True
-            )
-            shipping_fee = shipping_rate.flat_rate
-        except ShippingRate.DoesNotExist:
-            # Default shipping fee if rate not found
-            shipping_fee = 0
+        # Quote for the destination and basket (fee 0 if no rate applies)
+        quote = ShippingQuoteEngine.quote(
+            **self._quote_arguments(serializer.validated_data)
+        )
+        shipping_fee = quote.fee
 
         response_data = {
         'currency': currency,
         'order_amount': order_amount,
         'shipping_fee': shipping_fee,
         'total_amount': order_amount + shipping_fee,
+        'is_free_shipping': quote.is_free,
+        'zone': quote.zone,
         }
     
         return Response(response_data)
+
+
+    @action(detail=False, methods=['post'])
+    def quotes(self, request):
+        """Quote several baskets or destinations in one request"""
+        serializer = ShippingQuoteRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        quotes = ShippingQuoteEngine.quote_many([
+            self._quote_arguments(data) for data in serializer.validated_data['quotes']
+        ])
+        return Response(ShippingQuoteSerializer(quotes, many=True).data)
+
+
+    def _quote_arguments(self, data):
+        """ quote() keyword arguments from a ShippingCalculationSerializer """
+        return {
+            'currency': data['currency'],
+            'subtotal': data['order_amount'],
+            'subtotal_currency': data['currency'],
+            'quantity': data.get('quantity', 0),
+            'weight': data.get('weight', Decimal('0')),
+            'country': data.get('country'),
+        }
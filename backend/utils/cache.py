@@ -1,8 +1,17 @@
 from django.core.cache import cache
 from django.conf import settings
+from collections import OrderedDict
 from functools import wraps
 import hashlib
 import json
+import logging
+import math
+import random
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
 
 
 def generate_cache_key(prefix, *args, **kwargs):
@@ -38,33 +47,95 @@ def cache_response(timeout=None, key_prefix=None):
                 request.user.is_authenticated
             )
 
-            # Try to get cached response 
-            cache_response = cache.get(cache_key)
-            if cache_response is not None:
-                return cache_response
-            
-            # Generate response if not cached
-            response = view_func(self, request, *args, **kwargs)
-
-            # Cache the response 
-            cache.set(cache_key, response, timeout or settings.CACHE_TIMEOUTS['PRODUCT'])
-
-            return response
+            # Only one request regenerates an expired response
+            return get_or_compute(
+                cache_key,
+                lambda: view_func(self, request, *args, **kwargs),
+                timeout or settings.CACHE_TIMEOUTS['PRODUCT']
+            )
         return _wrapped_views
     return decorator
 
 
+def get_or_compute(key, compute, timeout, lease=None, beta=None, stale_ttl=None):
+    """
+        Read a cached value, recomputing it at most once across workers
+
+        Entries remember how long they took to compute and when they
+        logically expire. Readers refresh early with a probability that
+        grows as expiry nears (XFetch), so hot keys are usually recomputed
+        before they expire. Only the holder of a short lease lock (SET NX
+        with expiry) recomputes; everyone else keeps serving the stale value
+        while it does, or waits for it when there is nothing to serve.
+
+        Args:
+            key: Cache key
+            compute: Zero-argument callable producing the value
+            timeout: Seconds the value is fresh
+            lease: Seconds the recompute lock is held at most
+            beta: XFetch aggressiveness (1.0 is the usual choice, 0 disables)
+            stale_ttl: Seconds a stale value may be served while refreshing
+
+        Returns:
+            The cached or freshly computed value
+    """
+    options = settings.CACHE_STAMPEDE
+    lease = lease or options['LEASE']
+    beta = options['BETA'] if beta is None else beta
+    stale_ttl = options['STALE_TTL'] if stale_ttl is None else stale_ttl
+
+    entry = cache.get(key)
+    if entry is not None:
+        value, delta, expires_at = entry
+        # -log(U) is exponential(1): early refresh is rare until expiry is close
+        early = delta * beta * -math.log(1.0 - random.random())
+        if time.time() + early < expires_at:
+            return value
+
+    lock_key = f'{key}:lock'
+    token = uuid.uuid4().hex
+    if not cache.add(lock_key, token, lease):
+        if entry is not None:
+            # Stale while revalidate: another worker holds the lease
+            return entry[0]
+
+        # Nothing to serve yet: wait for the lease holder's result
+        deadline = time.monotonic() + lease
+        while time.monotonic() < deadline:
+            time.sleep(options['POLL_INTERVAL'])
+            entry = cache.get(key)
+            if entry is not None:
+                return entry[0]
+        logger.warning(f"Lease on {key} expired without a result; computing")
+
+    try:
+        started = time.monotonic()
+        value = compute()
+        delta = time.monotonic() - started
+        cache.set(key, (value, delta, time.time() + timeout), timeout + stale_ttl)
+        return value
+    finally:
+        # Release only our own lease; an expired one may belong to another worker
+        if cache.get(lock_key) == token:
+            cache.delete(lock_key)
+
+
+def delete_pattern(pattern):
+    """ Delete keys matching a glob pattern on backends that support it (Redis) """
+    if hasattr(cache, 'delete_pattern'):
+        cache.delete_pattern(pattern)
+
+
 def invalidate_product_cache(product_id):
     """ Invalidate all caches related to a product """
     # Clear product list caches
-    for key in cache.keys('product_list_*'):
-        cache.delete(key)
+    delete_pattern('product_list*')
     
     # Clear featured products cache
     cache.delete(settings.CACHE_KEYS['FEATURED_PRODUCTS'])
 
 
-def invalidate_category_cache(category_id=None):
+def invalidate_category_cache(category_id=None, product_lists=True):
     """ Invalidate category-related caches """
     # Clear specific category cache if ID provided
     if category_id:
@@ -74,5 +145,178 @@ def invalidate_category_cache(category_id=None):
     cache.delete(settings.CACHE_KEYS['CATEGORY_LIST'])
 
     # Clear product list caches as they might be filtered by category
-    for key in cache.keys('product_lists_*'):
-        cache.delete(key)
\ No newline at end of file
+    if product_lists:
+        delete_pattern('product_list*')
+
+
+class LocalCache:
+    """
+        Bounded per-process LRU with TTL in front of the Django cache
+
+        Lookups are served from process memory first, then from the shared
+        cache, and only then from the loader. Each namespace has a version
+        key in the shared cache; workers compare it at most once per
+        CHECK_INTERVAL and drop their local entries when it moves, so an
+        invalidate() on one worker reaches all of them within that interval.
+        Shared cache keys embed the version too, so they need no deletes.
+    """
+    VERSION_KEY = 'local_cache_version:{}'
+    REMOTE_KEY = 'local_cache:{}:v{}:{}'
+
+    _registry = {}
+
+
+    def __init__(self, name, max_size=None, ttl=None, timeout=None, check_interval=None):
+        """
+            Args:
+                name: Namespace, shared by every worker
+                max_size: Local entries kept before evicting the least recently used
+                ttl: Seconds a local entry is served without reloading
+                timeout: Shared cache timeout (defaults to the cache default)
+                check_interval: Seconds between version checks
+        """
+        options = settings.LOCAL_CACHE
+        self.name = name
+        self.max_size = max_size or options['MAX_SIZE']
+        self.ttl = ttl if ttl is not None else options['TTL']
+        self.timeout = timeout
+        self.check_interval = (
+            check_interval if check_interval is not None else options['CHECK_INTERVAL']
+        )
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = None
+        self._checked_at = 0.0
+        self.hits = 0
+        self.remote_hits = 0
+        self.misses = 0
+
+        LocalCache._registry[name] = self
+
+
+    def _current_version(self):
+        """ Shared version of the namespace, re-read at most once per interval """
+        now = time.monotonic()
+        if self._version is not None and now - self._checked_at < self.check_interval:
+            return self._version
+
+        key = self.VERSION_KEY.format(self.name)
+        version = cache.get(key)
+        if version is None:
+            # Seed from the clock so versions keep increasing after a flush
+            cache.add(key, int(time.time() * 1000), None)
+            version = cache.get(key)
+
+        with self._lock:
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+            self._checked_at = now
+        return version
+
+
+    def _remote_key(self, version, key):
+        digest = hashlib.md5(repr(key).encode()).hexdigest()
+        return self.REMOTE_KEY.format(self.name, version, digest)
+
+
+    def get(self, key, loader):
+        """
+            Get a value, loading it on a miss in both tiers
+
+            Args:
+                key: Hashable key within the namespace
+                loader: Zero-argument callable computing the value
+
+            Returns:
+                The cached or freshly loaded value (None is cached too)
+        """
+        version = self._current_version()
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+
+        remote_key = self._remote_key(version, key)
+        # Values are wrapped in a tuple so a cached None is still a hit
+        cached = cache.get(remote_key)
+        if cached is not None:
+            value = cached[0]
+            with self._lock:
+                self.remote_hits += 1
+        else:
+            value = loader()
+            cache.set(remote_key, (value,), self.timeout)
+            with self._lock:
+                self.misses += 1
+
+        with self._lock:
+            if self._version == version:
+                self._entries[key] = (now + self.ttl, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+        return value
+
+
+    def invalidate(self):
+        """ Retire every entry of the namespace on all workers """
+        key = self.VERSION_KEY.format(self.name)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, int(time.time() * 1000), None)
+
+        with self._lock:
+            self._entries.clear()
+            self._version = None
+
+
+    def stats(self):
+        """ Hit counters for this process """
+        with self._lock:
+            lookups = self.hits + self.remote_hits + self.misses
+            return {
+                'name': self.name,
+                'size': len(self._entries),
+                'hits': self.hits,
+                'remote_hits': self.remote_hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+            }
+
+
+    @classmethod
+    def all_stats(cls):
+        """ Hit counters for every namespace in this process """
+        return [layer.stats() for layer in cls._registry.values()]
+
+
+def local_cache(name, **options):
+    """
+        Decorator caching a function's result in a LocalCache namespace
+
+        The arguments form the key. The wrapper gains `cache` (the
+        LocalCache) and `invalidate()` for write paths.
+
+        Args:
+            name: Namespace shared by every worker
+            **options: LocalCache options (max_size, ttl, timeout, check_interval)
+    """
+    layer = LocalCache(name, **options)
+
+    def decorator(func):
+        @wraps(func)
+        def _wrapped(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            return layer.get(key, lambda: func(*args, **kwargs))
+
+        _wrapped.cache = layer
+        _wrapped.invalidate = layer.invalidate
+        return _wrapped
+    return decorator
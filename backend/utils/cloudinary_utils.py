@@ -3,20 +3,31 @@ import cloudinary
 import cloudinary.uploader
 import cloudinary.api
 from typing import Optional, Dict, Any
+from utils.image_processing import ImagePreprocessor, ImageFingerprintIndex
 import logging
 
 logger = logging.getLogger(__name__)
 
 
 class CloudinaryUploader:
+    # Named delivery variants, computed once when an image is stored
+    VARIANTS = {
+        'thumbnail': {'width': 200, 'height': 200, 'crop': 'fill', 'quality': 'auto'},
+        'card': {'width': 400, 'height': 400, 'crop': 'fill', 'quality': 'auto', 'fetch_format': 'auto'},
+        'preview': {'width': 800, 'height': 800, 'crop': 'limit', 'quality': 'auto'},
+        'zoom': {'width': 1600, 'height': 1600, 'crop': 'limit', 'quality': 'auto', 'fetch_format': 'auto'},
+    }
+
+
     @staticmethod
-    def upload_image(file, folder: str, **options) -> Optional[Dict[str, Any]]:
+    def upload_image(file, folder: str, preprocess: bool = True, **options) -> Optional[Dict[str, Any]]:
         """
         Upload an image to Cloudinary
         
         Args:
             file: The file to upload
             folder: The folder in Cloudinary to upload to
+            preprocess: Resize, strip and deduplicate images locally first
             **options: Additional upload options
             
         Returns:
@@ -24,6 +35,25 @@ class CloudinaryUploader:
         """
 
         try:
+            processed = ImagePreprocessor.process(file, folder) if preprocess else None
+            deduplicate = processed is not None and ImageFingerprintIndex.is_enabled(folder)
+
+            if deduplicate:
+                existing = ImageFingerprintIndex.find(folder, processed.phash)
+                if existing:
+                    logger.info(
+                        f"Reusing Cloudinary image {existing['public_id']} "
+                        f"for duplicate upload ({processed.original_size} bytes saved)"
+                    )
+                    return {
+                        **existing,
+                        'bytes_saved': processed.original_size,
+                        'deduplicated': True,
+                    }
+
+            if processed:
+                file = processed.as_file(getattr(file, 'name', None))
+
             # Default transformation options
             default_options = {
                 'folder': folder,
@@ -40,7 +70,7 @@ class CloudinaryUploader:
             # Upload file to cloudinary
             result = cloudinary.uploader.upload(file, **upload_options)
 
-            return {
+            upload_result = {
                 'public_id': result['public_id'],
                 'url': result['secure_url'],
                 'resource_type': result['resource_type'],
@@ -48,6 +78,23 @@ class CloudinaryUploader:
                 'width': result.get('width'),
                 'height': result.get('height'),
             }
+
+            if deduplicate:
+                ImageFingerprintIndex.add(folder, processed.phash, upload_result)
+
+            bytes_saved = processed.bytes_saved if processed else 0
+            if processed:
+                logger.info(
+                    f"Uploaded {upload_result['public_id']}: "
+                    f"{processed.original_size} -> {processed.processed_size} bytes "
+                    f"({bytes_saved} bytes saved)"
+                )
+
+            return {
+                **upload_result,
+                'bytes_saved': bytes_saved,
+                'deduplicated': False,
+            }
         
         except Exception as e:
             logger.error(f"Cloudinary upload failed: {str(e)}")
@@ -68,6 +115,7 @@ class CloudinaryUploader:
 
         try:
             result = cloudinary.uploader.destroy(public_id)
+            ImageFingerprintIndex.forget(public_id)
             return result.get('result') == 'ok'
         except Exception as e:
             logger.error(f"Cloudinary deletion failed: {str(e)}")
@@ -95,3 +143,50 @@ class CloudinaryUploader:
         except Exception as e:
             logger.error(f"Failed to generate image URL: {str(e)}")
             return None
+
+
+    @classmethod
+    def build_variants(cls, public_id: str) -> Dict[str, str]:
+        """
+        Build the original and every registered variant URL for an image
+        
+        Args:
+            public_id: The public ID of the image
+            
+        Returns:
+            Dict mapping variant name to URL ('original' is untransformed)
+        """
+
+        if not public_id:
+            return {}
+
+        variants = {
+            'original': f"https://res.cloudinary.com/{settings.CLOUDINARY_STORAGE['CLOUD_NAME']}/image/upload/{public_id}"
+        }
+        for name, transformations in cls.VARIANTS.items():
+            url = cls.get_image_url(public_id, **transformations)
+            if url:
+                variants[name] = url
+
+        return variants
+
+
+    @classmethod
+    def get_variant_url(cls, variants: Optional[Dict[str, str]], public_id: str, name: str) -> Optional[str]:
+        """
+        Read a precomputed variant URL, building it only for rows not yet backfilled
+        
+        Args:
+            variants: Stored variant mapping of the image
+            public_id: The public ID of the image
+            name: Variant name, one of VARIANTS or 'original'
+            
+        Returns:
+            str: The variant URL or None if there is no image
+        """
+
+        if variants and name in variants:
+            return variants[name]
+        if not public_id:
+            return None
+        return cls.build_variants(public_id).get(name)
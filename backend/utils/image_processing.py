@@ -0,0 +1,247 @@
+from django.conf import settings
+from django.core.cache import cache
+from dataclasses import dataclass
+from typing import Optional, Dict, Any
+from io import BytesIO
+from PIL import Image, ImageOps, UnidentifiedImageError, features
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ProcessedImage:
+    content: bytes
+    format: str
+    width: int
+    height: int
+    phash: str
+    original_size: int
+
+    @property
+    def processed_size(self) -> int:
+        return len(self.content)
+
+    @property
+    def bytes_saved(self) -> int:
+        return max(self.original_size - self.processed_size, 0)
+
+    def as_file(self, name: str) -> BytesIO:
+        """ Wrap processed bytes in a named file object for upload """
+        stem = os.path.splitext(os.path.basename(name or 'upload'))[0]
+        extension = 'jpg' if self.format == 'JPEG' else self.format.lower()
+        buffer = BytesIO(self.content)
+        buffer.name = f"{stem}.{extension}"
+        return buffer
+
+
+class ImagePreprocessor:
+    """ Shrink, strip and fingerprint images locally before upload """
+    HASH_SIZE = 8  # 8x8 difference hash -> 64 bits
+
+
+    @classmethod
+    def get_config(cls) -> Dict[str, Any]:
+        return getattr(settings, 'IMAGE_PREPROCESSING', {})
+
+
+    @classmethod
+    def get_output_format(cls) -> str:
+        output_format = cls.get_config().get('FORMAT', 'WEBP').upper()
+        if output_format == 'WEBP' and not features.check('webp'):
+            return 'JPEG'
+        return output_format
+
+
+    @classmethod
+    def process(cls, file, folder: str) -> Optional[ProcessedImage]:
+        """
+            Strip metadata, cap dimensions and re-encode an uploaded image
+
+            Args:
+                file: Uploaded file or file-like object
+                folder: Target Cloudinary folder (selects the size cap)
+
+            Returns:
+                ProcessedImage, or None if the file is not a processable image
+                (the caller should then upload the original untouched)
+        """
+        config = cls.get_config()
+        if not config.get('ENABLED', True) or not hasattr(file, 'read'):
+            return None
+
+        try:
+            file.seek(0)
+            original = file.read()
+            file.seek(0)
+
+            image = Image.open(BytesIO(original))
+            if getattr(image, 'is_animated', False):
+                return None
+
+            had_metadata = bool(image.info.get('exif') or image.getexif())
+
+            # Apply EXIF orientation before the metadata is dropped
+            image = ImageOps.exif_transpose(image)
+
+            max_dimension = config.get('MAX_DIMENSIONS', {}).get(folder)
+            resized = False
+            if max_dimension and max(image.size) > max_dimension:
+                image.thumbnail(
+                    (max_dimension, max_dimension),
+                    Image.Resampling.LANCZOS
+                )
+                resized = True
+
+            output_format = cls.get_output_format()
+            if output_format == 'JPEG' and image.mode not in ('RGB', 'L'):
+                image = image.convert('RGB')
+            elif image.mode not in ('RGB', 'RGBA', 'L'):
+                image = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+
+            buffer = BytesIO()
+            # Saving a fresh image without passing exif drops all metadata
+            image.save(
+                buffer,
+                format=output_format,
+                quality=config.get('QUALITY', 82),
+                optimize=True
+            )
+            content = buffer.getvalue()
+
+            # Nothing to gain from re-encoding an already small, clean image
+            if len(content) >= len(original) and not (had_metadata or resized):
+                content = original
+                output_format = Image.open(BytesIO(original)).format
+
+            return ProcessedImage(
+                content=content,
+                format=output_format,
+                width=image.width,
+                height=image.height,
+                phash=cls.perceptual_hash(image),
+                original_size=len(original)
+            )
+
+        except (UnidentifiedImageError, OSError, ValueError) as e:
+            logger.info(f"Skipping preprocessing for non-image upload: {str(e)}")
+            file.seek(0)
+            return None
+
+
+    @classmethod
+    def perceptual_hash(cls, image: Image.Image) -> str:
+        """
+            Compute a 64-bit difference hash (dHash)
+
+            Visually similar images produce hashes with a small hamming
+            distance, regardless of size or encoding.
+
+            Returns:
+                str: 16 character hex digest
+        """
+        size = cls.HASH_SIZE
+        grayscale = image.convert('L').resize(
+            (size + 1, size),
+            Image.Resampling.LANCZOS
+        )
+        pixels = list(grayscale.getdata())
+
+        bits = 0
+        for row in range(size):
+            offset = row * (size + 1)
+            for col in range(size):
+                bits = (bits << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+
+        return f"{bits:016x}"
+
+
+    @staticmethod
+    def hamming_distance(hash_a: str, hash_b: str) -> int:
+        return bin(int(hash_a, 16) ^ int(hash_b, 16)).count('1')
+
+
+class ImageFingerprintIndex:
+    """
+        Cache-backed index of uploaded image hashes per folder
+
+        Hashes are split into four 16-bit bands; any hash within a hamming
+        distance of 3 shares at least one band, so a lookup only scans the
+        four matching buckets instead of every uploaded image.
+    """
+    BAND_COUNT = 4
+    BAND_KEY = 'image_phash_{}_{}_{}'
+    OWNER_KEY = 'image_phash_owner_{}'
+
+
+    @classmethod
+    def _bands(cls, phash: str):
+        width = len(phash) // cls.BAND_COUNT
+        return [phash[i * width:(i + 1) * width] for i in range(cls.BAND_COUNT)]
+
+
+    @classmethod
+    def _timeout(cls) -> int:
+        return ImagePreprocessor.get_config().get('INDEX_TIMEOUT', 60 * 60 * 24 * 30)
+
+
+    @classmethod
+    def is_enabled(cls, folder: str) -> bool:
+        return folder in ImagePreprocessor.get_config().get('DEDUPLICATE_FOLDERS', [])
+
+
+    @classmethod
+    def find(cls, folder: str, phash: str) -> Optional[Dict[str, Any]]:
+        """
+            Find a previously uploaded image that matches the hash
+
+            Returns:
+                Stored upload result of the closest match, or None
+        """
+        max_distance = ImagePreprocessor.get_config().get('NEAR_DUPLICATE_DISTANCE', 3)
+        keys = [
+            cls.BAND_KEY.format(folder, index, band)
+            for index, band in enumerate(cls._bands(phash))
+        ]
+
+        best_match, best_distance = None, None
+        for bucket in cache.get_many(keys).values():
+            for candidate_hash, result in bucket.items():
+                distance = ImagePreprocessor.hamming_distance(phash, candidate_hash)
+                if distance <= max_distance and (best_distance is None or distance < best_distance):
+                    best_match, best_distance = result, distance
+
+        return best_match
+
+
+    @classmethod
+    def add(cls, folder: str, phash: str, result: Dict[str, Any]) -> None:
+        """ Register an upload result under its hash """
+        timeout = cls._timeout()
+        for index, band in enumerate(cls._bands(phash)):
+            key = cls.BAND_KEY.format(folder, index, band)
+            bucket = cache.get(key) or {}
+            bucket[phash] = result
+            cache.set(key, bucket, timeout)
+
+        cache.set(cls.OWNER_KEY.format(result['public_id']), (folder, phash), timeout)
+
+
+    @classmethod
+    def forget(cls, public_id: str) -> None:
+        """ Remove a deleted upload so it is no longer offered for reuse """
+        owner_key = cls.OWNER_KEY.format(public_id)
+        owner = cache.get(owner_key)
+        if not owner:
+            return
+
+        folder, phash = owner
+        for index, band in enumerate(cls._bands(phash)):
+            key = cls.BAND_KEY.format(folder, index, band)
+            bucket = cache.get(key)
+            if bucket and phash in bucket:
+                del bucket[phash]
+                cache.set(key, bucket, cls._timeout())
+
+        cache.delete(owner_key)
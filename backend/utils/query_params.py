@@ -0,0 +1,29 @@
+# utils/query_params.py
+
+from rest_framework.exceptions import ValidationError
+
+
+# One listing page's worth of ids
+MAX_PRODUCT_IDS = 100
+
+
+def product_ids_param(request, limit=MAX_PRODUCT_IDS):
+    """
+        Parse ?product_ids=1,2,3 for the batch lookups behind listing pages
+
+        Args:
+            request: DRF request
+            limit: Ids kept, later ones are ignored
+
+        Returns:
+            List of at most `limit` ids
+
+        Raises:
+            ValidationError: 400 when a value is not an integer
+    """
+    raw = request.query_params.get('product_ids', '')
+    try:
+        product_ids = [int(value) for value in raw.split(',') if value.strip()]
+    except ValueError:
+        raise ValidationError({'error': 'product_ids must be a comma-separated list of ids'})
+    return product_ids[:limit]
@@ -0,0 +1,134 @@
+from django.test import TestCase
+from django.core.cache import cache
+from unittest.mock import patch, Mock
+from concurrent.futures import ThreadPoolExecutor
+from utils.cache import LocalCache, local_cache, get_or_compute
+import threading
+import time
+
+
+class LocalCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+
+    def test_hits_are_served_from_memory(self):
+        layer = LocalCache('test_memory', check_interval=60)
+        loader = Mock(return_value='value')
+
+        self.assertEqual(layer.get('key', loader), 'value')
+        with patch('utils.cache.cache.get') as mock_get:
+            self.assertEqual(layer.get('key', loader), 'value')
+            mock_get.assert_not_called()
+
+        loader.assert_called_once()
+        stats = layer.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+        self.assertEqual(stats['hit_ratio'], 0.5)
+
+
+    def test_none_is_cached_and_size_is_bounded(self):
+        layer = LocalCache('test_bounded', max_size=2, check_interval=60)
+        loader = Mock(return_value=None)
+
+        for key in ('a', 'b', 'c'):
+            layer.get(key, loader)
+        self.assertEqual(layer.stats()['size'], 2)
+
+        # 'a' was evicted locally but is still in the shared cache
+        layer.get('a', loader)
+        self.assertEqual(loader.call_count, 3)
+        self.assertEqual(layer.stats()['remote_hits'], 1)
+
+
+    def test_entries_expire_after_ttl(self):
+        layer = LocalCache('test_ttl', ttl=10, check_interval=60)
+        layer.get('key', lambda: 1)
+
+        with patch('utils.cache.time.monotonic', return_value=10 ** 9):
+            layer.get('key', lambda: 2)
+        self.assertEqual(layer.stats()['remote_hits'], 1)
+
+
+    def test_invalidate_reaches_other_workers(self):
+        # Two instances with one name stand in for two processes
+        worker_a = LocalCache('test_shared', check_interval=0)
+        worker_b = LocalCache('test_shared', check_interval=0)
+        worker_a.get('key', lambda: 'old')
+        self.assertEqual(worker_b.get('key', lambda: 'unused'), 'old')
+
+        worker_a.invalidate()
+        self.assertEqual(worker_b.get('key', lambda: 'new'), 'new')
+        self.assertEqual(worker_a.get('key', lambda: 'unused'), 'new')
+
+
+    def test_decorator_keys_on_arguments(self):
+        calls = []
+
+        @local_cache('test_decorator', check_interval=60)
+        def double(value):
+            calls.append(value)
+            return value * 2
+
+        self.assertEqual([double(2), double(2), double(3)], [4, 4, 6])
+        self.assertEqual(calls, [2, 3])
+
+        double.invalidate()
+        double(2)
+        self.assertEqual(calls, [2, 3, 2])
+
+
+class GetOrComputeTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.calls = 0
+        self.calls_lock = threading.Lock()
+
+
+    def slow_compute(self, value='fresh'):
+        def compute():
+            with self.calls_lock:
+                self.calls += 1
+            time.sleep(0.2)
+            return value
+        return compute
+
+
+    def test_concurrent_misses_compute_once(self):
+        compute = self.slow_compute()
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            results = list(executor.map(
+                lambda _: get_or_compute('hot_key', compute, 60), range(32)
+            ))
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(set(results), {'fresh'})
+
+
+    def test_stale_value_served_while_one_worker_refreshes(self):
+        # Logically expired entry, still inside its stale window
+        cache.set('hot_key', ('stale', 0.2, time.time() - 1), 60)
+        compute = self.slow_compute()
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(
+                lambda _: get_or_compute('hot_key', compute, 60), range(8)
+            ))
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(results.count('fresh'), 1)
+        self.assertEqual(results.count('stale'), 7)
+        self.assertEqual(get_or_compute('hot_key', compute, 60), 'fresh')
+
+
+    def test_early_refresh_near_expiry(self):
+        compute = Mock(return_value='fresh')
+
+        cache.set('hot_key', ('cached', 1.0, time.time() + 3600), 3600)
+        self.assertEqual(get_or_compute('hot_key', compute, 60), 'cached')
+
+        # Expiry within the compute time: the random draw must be tiny to skip
+        cache.set('hot_key', ('cached', 1.0, time.time() + 0.001), 60)
+        with patch('utils.cache.random.random', return_value=0.5):
+            self.assertEqual(get_or_compute('hot_key', compute, 60), 'fresh')
+        compute.assert_called_once()
@@ -0,0 +1,117 @@
+from django.test import TestCase
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from unittest.mock import patch
+from io import BytesIO
+from PIL import Image
+from utils.image_processing import ImagePreprocessor, ImageFingerprintIndex
+from utils.cloudinary_utils import CloudinaryUploader
+
+
+def make_upload(size=(2400, 1600), name='photo.jpg'):
+    # Horizontal gradient with a dark band so the perceptual hash has structure
+    image = Image.linear_gradient('L').rotate(90).resize(size).convert('RGB')
+    image.paste((20, 20, 20), (size[0] // 3, 0, size[0] // 2, size[1]))
+
+    exif = Image.Exif()
+    exif[0x010F] = 'PhoneMaker'  # Camera make
+    buffer = BytesIO()
+    image.save(buffer, format='JPEG', quality=95, exif=exif.tobytes())
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/jpeg')
+
+
+class ImagePreprocessorTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+
+    def test_caps_dimensions_per_folder(self):
+        processed = ImagePreprocessor.process(make_upload(), 'products')
+        self.assertEqual(max(processed.width, processed.height), 800)
+
+        processed = ImagePreprocessor.process(make_upload(), 'editor_images')
+        self.assertEqual(max(processed.width, processed.height), 1200)
+
+
+    def test_strips_exif_and_reports_savings(self):
+        processed = ImagePreprocessor.process(make_upload(), 'products')
+        image = Image.open(BytesIO(processed.content))
+
+        self.assertFalse(image.getexif())
+        self.assertLess(processed.processed_size, processed.original_size)
+        self.assertEqual(
+            processed.bytes_saved,
+            processed.original_size - processed.processed_size
+        )
+
+
+    def test_non_image_is_skipped(self):
+        upload = SimpleUploadedFile('doc.pdf', b'%PDF-1.4 test', content_type='application/pdf')
+        self.assertIsNone(ImagePreprocessor.process(upload, 'email_attachments'))
+        self.assertEqual(upload.read(), b'%PDF-1.4 test')
+
+
+    def test_resized_copy_has_similar_hash(self):
+        large = ImagePreprocessor.process(make_upload(size=(2400, 1600)), 'returns')
+        small = ImagePreprocessor.process(make_upload(size=(1200, 800)), 'returns')
+        self.assertLessEqual(
+            ImagePreprocessor.hamming_distance(large.phash, small.phash), 3
+        )
+
+
+class ImageFingerprintIndexTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.result = {'public_id': 'products/abc', 'url': 'https://example.com/abc'}
+
+
+    def test_finds_near_duplicate(self):
+        ImageFingerprintIndex.add('products', 'ffffffffffffffff', self.result)
+
+        self.assertEqual(ImageFingerprintIndex.find('products', 'fffffffffffffff8'), self.result)
+        self.assertIsNone(ImageFingerprintIndex.find('products', '0000000000000000'))
+        self.assertIsNone(ImageFingerprintIndex.find('returns', 'ffffffffffffffff'))
+
+
+    def test_forget_removes_entry(self):
+        ImageFingerprintIndex.add('products', 'ffffffffffffffff', self.result)
+        ImageFingerprintIndex.forget('products/abc')
+        self.assertIsNone(ImageFingerprintIndex.find('products', 'ffffffffffffffff'))
+
+
+    @patch('utils.cloudinary_utils.cloudinary.uploader.upload')
+    def test_duplicate_upload_reuses_public_id(self, mock_upload):
+        mock_upload.return_value = {
+            'public_id': 'products/abc',
+            'secure_url': 'https://example.com/abc',
+            'resource_type': 'image',
+            'format': 'webp',
+            'width': 800,
+            'height': 533,
+        }
+
+        first = CloudinaryUploader.upload_image(make_upload(), folder='products')
+        second = CloudinaryUploader.upload_image(make_upload(), folder='products')
+
+        self.assertEqual(mock_upload.call_count, 1)
+        self.assertFalse(first['deduplicated'])
+        self.assertGreater(first['bytes_saved'], 0)
+        self.assertTrue(second['deduplicated'])
+        self.assertEqual(second['public_id'], 'products/abc')
+
+
+    @patch('utils.cloudinary_utils.cloudinary.uploader.upload')
+    def test_customer_uploads_are_never_deduplicated(self, mock_upload):
+        mock_upload.side_effect = lambda file, **options: {
+            'public_id': f'returns/{mock_upload.call_count}',
+            'secure_url': 'https://example.com/return',
+            'resource_type': 'image',
+            'format': 'webp',
+        }
+
+        # The same photo from two customers stays two private images
+        first = CloudinaryUploader.upload_image(make_upload(), folder='returns')
+        second = CloudinaryUploader.upload_image(make_upload(), folder='returns')
+
+        self.assertEqual(mock_upload.call_count, 2)
+        self.assertNotEqual(first['public_id'], second['public_id'])
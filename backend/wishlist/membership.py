@@ -0,0 +1,47 @@
+# wishlist/membership.py
+
+from django.db.models import Value, CharField
+from cart.models import CartItem
+from .models import WishlistItem
+
+
+class ProductMembership:
+    """
+        Which products are in a user's wishlist and cart
+
+        Both lookups use the (wishlist, product) and (cart, product) unique
+        indexes and run as one UNION query, so a whole product grid costs a
+        single round-trip.
+    """
+    WISHLIST = 'wishlist'
+    CART = 'cart'
+
+
+    @classmethod
+    def lookup(cls, user, product_ids):
+        """
+            Args:
+                user: Authenticated user
+                product_ids: Product ids to check
+
+            Returns:
+                Dict mapping 'wishlist' and 'cart' to sets of product ids
+        """
+        membership = {cls.WISHLIST: set(), cls.CART: set()}
+        if not product_ids:
+            return membership
+
+        wishlist = WishlistItem.objects.filter(
+            wishlist__user=user, product_id__in=product_ids
+        ).order_by().values_list(
+            'product_id', Value(cls.WISHLIST, output_field=CharField())
+        )
+        cart = CartItem.objects.filter(
+            cart__user=user, product_id__in=product_ids
+        ).order_by().values_list(
+            'product_id', Value(cls.CART, output_field=CharField())
+        )
+
+        for product_id, source in wishlist.union(cart, all=True):
+            membership[source].add(product_id)
+        return membership
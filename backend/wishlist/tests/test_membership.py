@@ -0,0 +1,72 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from decimal import Decimal
+from cart.models import Cart, CartItem
+from products.models import Category, Product
+from users.models import User
+from wishlist.membership import ProductMembership
+from wishlist.models import Wishlist, WishlistItem
+
+
+class ProductMembershipTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='shopper@example.com', username='shopper', first_name='Ada',
+            last_name='Shopper', password='shopperpass123'
+        )
+        category = Category.objects.create(name='Frontals')
+        self.products = [
+            Product.objects.create(
+                name=f'Frontal {index}', category=category, description='Frontal',
+                price=Decimal('100.00'), stock=5
+            )
+            for index in range(4)
+        ]
+        wishlist = Wishlist.objects.create(user=self.user)
+        WishlistItem.objects.create(wishlist=wishlist, product=self.products[0])
+        WishlistItem.objects.create(wishlist=wishlist, product=self.products[1])
+        cart = Cart.objects.create(user=self.user)
+        CartItem.objects.create(
+            cart=cart, product=self.products[1], quantity=1, price_at_add=Decimal('100.00')
+        )
+
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+
+    def test_lookup_is_one_query(self):
+        ids = [product.id for product in self.products]
+        with self.assertNumQueries(1):
+            membership = ProductMembership.lookup(self.user, ids)
+
+        self.assertEqual(membership['wishlist'], {ids[0], ids[1]})
+        self.assertEqual(membership['cart'], {ids[1]})
+
+
+    def test_membership_endpoint(self):
+        ids = [product.id for product in self.products]
+        response = self.client.get(
+            reverse('wishlist-membership'), {'product_ids': ','.join(map(str, ids))}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {'wishlist': ids[:2], 'cart': [ids[1]]})
+
+        response = self.client.get(reverse('wishlist-membership'), {'product_ids': '1,x'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+    def test_mutations_return_deltas(self):
+        product = self.products[2]
+        response = self.client.post(reverse('wishlist-add-item'), {'product_id': product.id})
+        self.assertEqual(response.data, {'product_id': product.id, 'in_wishlist': True, 'total_items': 3})
+
+        response = self.client.post(reverse('wishlist-add-item'), {'product_id': product.id})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.post(reverse('wishlist-remove-item'), {'product_id': product.id})
+        self.assertEqual(response.data, {'product_id': product.id, 'in_wishlist': False, 'total_items': 2})
+
+        response = self.client.post(reverse('wishlist-remove-item'), {'product_id': product.id})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -4,11 +4,13 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from django.db import IntegrityError, transaction
 from .models import Wishlist, WishlistItem
 from .serializers import WishlistSerializer
+from .membership import ProductMembership
 from products.models import Product
-from cart.models import CartItem, Cart
-from cart.serializers import CartSerializer
+from cart.transfers import CartTransfer
+from utils.query_params import product_ids_param
 
 
 class WishlistViewSet(viewsets.GenericViewSet):
@@ -29,6 +31,15 @@ class WishlistViewSet(viewsets.GenericViewSet):
         serializer = self.get_serializer(wishlist)
         return Response(serializer.data)
 
+
+    def delta(self, wishlist, product_id, in_wishlist):
+        """ Mutation response: what changed, not the whole wishlist """
+        return {
+            'product_id': product_id,
+            'in_wishlist': in_wishlist,
+            'total_items': wishlist.items.count()
+        }
+
     @action(detail=False, methods=['post'])
     def add_item(self, request):
         """Add a product to wishlist"""
@@ -37,25 +48,21 @@ class WishlistViewSet(viewsets.GenericViewSet):
 
         try:
             product = Product.objects.get(id=product_id)
-            
-            # Check if product already in wishlist
-            if WishlistItem.objects.filter(
-                wishlist=wishlist,
-                product=product
-            ).exists():
+
+            # The (wishlist, product) constraint rejects duplicates
+            try:
+                with transaction.atomic():
+                    WishlistItem.objects.create(
+                        wishlist=wishlist,
+                        product=product
+                    )
+            except IntegrityError:
                 return Response(
                     {"error": "Product already in wishlist"},
                     status=status.HTTP_400_BAD_REQUEST
                 )
-            
-            # Add product to wishlist
-            WishlistItem.objects.create(
-                wishlist=wishlist,
-                product=product
-            )
-            
-            serializer = self.get_serializer(wishlist)
-            return Response(serializer.data)
+
+            return Response(self.delta(wishlist, product.id, True))
         
         except Product.DoesNotExist:
             return Response(
@@ -69,22 +76,18 @@ class WishlistViewSet(viewsets.GenericViewSet):
         wishlist = self.get_object()
         product_id = request.data.get('product_id')
 
-        try:
-            wishlist_item = WishlistItem.objects.get(
-                wishlist=wishlist,
-                product_id=product_id
-            )
-            wishlist_item.delete()
-            
-            serializer = self.get_serializer(wishlist)
-            return Response(serializer.data)
-        
-        except WishlistItem.DoesNotExist:
+        deleted, _ = WishlistItem.objects.filter(
+            wishlist=wishlist,
+            product_id=product_id
+        ).delete()
+        if not deleted:
             return Response(
                 {'error': 'Product not found in wishlist'},
                 status=status.HTTP_404_NOT_FOUND
             )
 
+        return Response(self.delta(wishlist, int(product_id), False))
+
     @action(detail=False, methods=['post'])
     def clear(self, request):
         """Clear all items from wishlist"""
@@ -94,6 +97,18 @@ class WishlistViewSet(viewsets.GenericViewSet):
         serializer = self.get_serializer(wishlist)
         return Response(serializer.data)
 
+    @action(detail=False, methods=['get'])
+    def membership(self, request):
+        """
+            Wishlist and cart membership for a page of products:
+            ?product_ids=1,2,3
+        """
+        membership = ProductMembership.lookup(request.user, product_ids_param(request))
+        return Response({
+            source: sorted(ids) for source, ids in membership.items()
+        })
+
+
     @action(detail=False, methods=['get'])
     def check_product(self, request):
         """Check if product is in wishlist"""
@@ -116,63 +131,42 @@ class WishlistViewSet(viewsets.GenericViewSet):
 
     @action(detail=False, methods=['post'])
     def move_to_cart(self, request):
-        """Move item from wishlist to cart"""
-        product_id = request.data.get('product_id')
-
+        """Move items from wishlist to cart (product_id, or product_ids)"""
+        product_ids = request.data.get('product_ids') or (
+            [request.data['product_id']] if request.data.get('product_id') else []
+        )
         try:
-            # Find the item in wishlist
-            wishlist = self.get_object()
-            wishlist_item = WishlistItem.objects.get(
-                wishlist=wishlist,
-                product_id=product_id
-            )
-
-            # Check product stock
-            product = wishlist_item.product
-            if not product.is_available or product.stock <= 0:
-                return Response(
-                    {'error': 'Product is no longer available'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-            
-            # Get or create cart
-            cart, _ = Cart.objects.get_or_create(user=request.user)
-
-            # Add to cart
-            cart_item, created = CartItem.objects.get_or_create(
-                cart=cart,
-                product=product,
-                defaults={
-                    'quantity': 1,
-                    'price_at_add': product.discount_price or product.price
-                }
-            )
-
-            if not created:
-                cart_item.quantity += 1
-                cart_item.save()
-            
-            # Remove from wishlist
-            wishlist_item.delete()
-
-            return Response({
-                'message': f'{product.name} added to cart',
-                'wishlist': WishlistSerializer(wishlist).data,
-                'cart': CartSerializer(cart).data
-            })
-        
-        except WishlistItem.DoesNotExist:
+            product_ids = [int(product_id) for product_id in product_ids]
+        except (TypeError, ValueError):
             return Response(
-                {"error": "Item not found in wishlist"},
-                status=status.HTTP_404_NOT_FOUND
+                {"error": "Invalid product id"},
+                status=status.HTTP_400_BAD_REQUEST
             )
-        except Product.DoesNotExist:
+        if not product_ids:
             return Response(
-                {"error": "Product not found"},
-                status=status.HTTP_404_NOT_FOUND
+                {"error": "Product ID is required"},
+                status=status.HTTP_400_BAD_REQUEST
             )
-        except Exception as e:
+
+        result = CartTransfer.wishlist_to_cart(request.user, product_ids)
+        if not result.moved:
+            not_found = set(result.skipped.values()) == {CartTransfer.NOT_FOUND}
             return Response(
-                {"error": str(e)},
-                status=status.HTTP_400_BAD_REQUEST
+                {
+                    "error": "Item not found in wishlist" if not_found
+                    else "Product is no longer available",
+                    "skipped": result.skipped
+                },
+                status=status.HTTP_404_NOT_FOUND if not_found else status.HTTP_400_BAD_REQUEST
             )
+
+        if len(result.moved) == 1:
+            name = Product.objects.values_list('name', flat=True).get(id=result.moved[0])
+            message = f'{name} added to cart'
+        else:
+            message = f'{len(result.moved)} items added to cart'
+        return Response({
+            'message': message,
+            'moved': result.moved,
+            'skipped': result.skipped
+        })
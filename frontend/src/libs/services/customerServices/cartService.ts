@@ -8,6 +8,7 @@ import {
   CartItem,
   ValidatedCartItem,
   CartValidationResponse,
+  MoveToWishlistResponse,
   ApiError
 } from "@/src/types";
 import { store } from "../../_redux/store";
@@ -328,9 +329,9 @@ class CartService {
     }
   }
 
-  async moveItemToWishlist(itemId: number): Promise<CartResponse> {
+  async moveItemToWishlist(itemId: number): Promise<MoveToWishlistResponse> {
     try {
-      const response = await axiosInstance.post<CartResponse>(
+      const response = await axiosInstance.post<MoveToWishlistResponse>(
         `${this.baseUrl}/move_to_wishlist/`,
         { item_id: itemId }
       );
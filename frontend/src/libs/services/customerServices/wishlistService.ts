@@ -58,9 +58,9 @@ class WishlistService {
   }
 
   // Clear entire wishlist
-  async clearWishlist(): Promise<WishlistResponse> {
+  async clearWishlist(): Promise<Wishlist> {
     try {
-      const response = await axiosInstance.post<WishlistResponse>(
+      const response = await axiosInstance.post<Wishlist>(
         `${this.baseUrl}clear/`
       );
       return response.data;
@@ -1316,15 +1316,22 @@ export interface WishlistState {
     lastUpdated: string | null;
 }
 
+// add_item / remove_item: what changed, not the whole wishlist
 export interface WishlistResponse {
-    message: string;
-    wishlist: Wishlist;
+    product_id: number;
+    in_wishlist: boolean;
+    total_items: number;
 }
 
 export interface MoveToCartResponse {
-    wishlist: Wishlist;
     message: string;
-    cart?: CartResponse; // Optional cart response if needed
+    moved: number[];
+    skipped: Record<number, string>; // product id -> reason
+}
+
+export interface MoveToWishlistResponse {
+    moved: number[]; // product ids
+    skipped: Record<number, string>; // product id -> reason
 }
 
 // Review types